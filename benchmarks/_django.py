@@ -0,0 +1,46 @@
+"""
+Shared bootstrap for benchmark scripts.
+
+Configures Django against a throwaway test database (in-memory for SQLite),
+a temporary cache directory and a temporary MEDIA_ROOT, so benchmarks never
+touch real data.
+"""
+import os
+import statistics
+import sys
+import tempfile
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+
+
+def setup():
+    """Initialise Django and create the test database. Returns a teardown callable."""
+    sys.path.insert(0, str(ROOT))
+    os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'portfolio_project.settings')
+    os.environ.setdefault('CACHE_LOCATION', tempfile.mkdtemp(prefix='bench-cache-'))
+    import django
+    django.setup()
+
+    from django.conf import settings
+    from django.db import connection
+    from django.test.utils import setup_test_environment, teardown_test_environment
+
+    settings.MEDIA_ROOT = tempfile.mkdtemp(prefix='bench-media-')
+    setup_test_environment()
+    old_name = connection.creation.create_test_db(verbosity=0, autoclobber=True)
+    # The test environment only allows 'testserver'; benchmarks may use others
+    settings.ALLOWED_HOSTS = ['*']
+
+    def teardown():
+        connection.creation.destroy_test_db(old_name, verbosity=0)
+        teardown_test_environment()
+
+    return teardown
+
+
+def percentiles(samples):
+    """p50/p95/p99 in milliseconds for a list of durations in seconds."""
+    ms = sorted(s * 1000 for s in samples)
+    q = statistics.quantiles(ms, n=100) if len(ms) > 1 else ms * 99
+    return {'p50': round(q[49], 3), 'p95': round(q[94], 3), 'p99': round(q[98], 3)}
@@ -0,0 +1,130 @@
+"""
+Admin changelist latency and query count with seeded data, before and after
+the changelist tuning (indexes, list_select_related, show_full_result_count,
+bulk actions).
+Usage: python benchmarks/admin_changelist.py [--rows 2000] [--images 3] [--requests 30]
+"""
+import argparse
+import time
+
+from _django import percentiles, setup
+
+PAGES = [
+    '/admin/portfolio/casestudy/',
+    '/admin/portfolio/casestudy/?p=10',
+    '/admin/portfolio/casestudy/?is_published__exact=1',
+    '/admin/portfolio/casestudyimage/',
+]
+
+
+class QueryCounter:
+    def __init__(self):
+        self.count = 0
+
+    def __call__(self, execute, sql, params, many, context):
+        self.count += 1
+        return execute(sql, params, many, context)
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--rows', type=int, default=2000)
+    parser.add_argument('--images', type=int, default=3, help='images per case study')
+    parser.add_argument('--requests', type=int, default=30)
+    args = parser.parse_args()
+
+    teardown = setup()
+    from django.contrib import admin
+    from django.contrib.auth.models import User
+    from django.core.paginator import Paginator
+    from django.db import connection
+    from django.test import Client
+
+    from portfolio.models import CaseStudy, CaseStudyImage
+
+    CaseStudy.objects.bulk_create(
+        [
+            CaseStudy(
+                title=f'Project {i}', slug=f'project-{i}', summary='Summary', problem='Problem',
+                solution='Solution', tech_stack='Django, PostgreSQL', key_results='Results',
+                order=i % 50, is_published=i % 3 != 0,
+            )
+            for i in range(args.rows)
+        ],
+        batch_size=1000,
+    )
+    CaseStudyImage.objects.bulk_create(
+        [
+            CaseStudyImage(case_study_id=pk, image=f'case_studies/bench/{pk}-{n}.png', order=n)
+            for pk in CaseStudy.objects.values_list('pk', flat=True)
+            for n in range(args.images)
+        ],
+        batch_size=1000,
+    )
+    print(f'{connection.vendor}: {args.rows} case studies, {args.rows * args.images} images')
+
+    user = User.objects.create_superuser('bench', 'bench@example.com', 'bench')
+    client = Client()
+    client.force_login(user)
+    case_study_admin = admin.site._registry[CaseStudy]
+    image_admin = admin.site._registry[CaseStudyImage]
+    tuned = {
+        case_study_admin: {'show_full_result_count': False, 'paginator': case_study_admin.paginator},
+        image_admin: {
+            'show_full_result_count': False, 'paginator': image_admin.paginator,
+            'list_select_related': ('case_study',),
+        },
+    }
+    baseline = {
+        case_study_admin: {'show_full_result_count': True, 'paginator': Paginator},
+        image_admin: {'show_full_result_count': True, 'paginator': Paginator, 'list_select_related': False},
+    }
+    indexes = [
+        (model, index)
+        for model in (CaseStudy, CaseStudyImage)
+        for index in model._meta.indexes
+    ]
+
+    def configure(attrs, with_indexes):
+        for model_admin, values in attrs.items():
+            for name, value in values.items():
+                setattr(model_admin, name, value)
+        with connection.schema_editor() as editor:
+            for model, index in indexes:
+                if with_indexes:
+                    editor.add_index(model, index)
+                else:
+                    editor.remove_index(model, index)
+
+    for label, attrs, with_indexes in (('baseline', baseline, False), ('tuned', tuned, True)):
+        configure(attrs, with_indexes)
+        print(label)
+        for url in PAGES:
+            client.get(url)
+            samples = []
+            counter = QueryCounter()
+            with connection.execute_wrapper(counter):
+                for _ in range(args.requests):
+                    t = time.perf_counter()
+                    response = client.get(url)
+                    samples.append(time.perf_counter() - t)
+            assert response.status_code == 200, (url, response.status_code)
+            print(f'  {url:<50} {counter.count / args.requests:>5.1f} queries  {percentiles(samples)} ms')
+
+    # Bulk actions vs saving each row
+    pks = list(CaseStudy.objects.values_list('pk', flat=True)[:500])
+    start = time.perf_counter()
+    for cs in CaseStudy.objects.filter(pk__in=pks):
+        cs.order += 1
+        cs.save()
+    per_row = time.perf_counter() - start
+    start = time.perf_counter()
+    client.post('/admin/portfolio/casestudy/', {'action': 'renumber', '_selected_action': pks})
+    bulk = time.perf_counter() - start
+    print(f'reorder {len(pks)} rows: save() loop {per_row * 1000:.0f} ms, renumber action {bulk * 1000:.0f} ms')
+
+    teardown()
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,66 @@
+"""
+Front-end bytes before and after the asset pipeline: source files vs the
+minified bundles and critical CSS collectstatic writes, and what each page has
+to download before its first render.
+Usage: python benchmarks/asset_sizes.py
+"""
+import gzip
+import os
+import tempfile
+
+import brotli
+
+from _django import setup
+
+
+def sizes(data):
+    return len(data), len(gzip.compress(data, 9)), len(brotli.compress(data))
+
+
+def main():
+    os.environ['STATIC_ROOT'] = tempfile.mkdtemp(prefix='bench-static-')
+    teardown = setup()
+    from django.contrib.staticfiles import finders
+    from django.contrib.staticfiles.storage import staticfiles_storage
+    from django.core.management import call_command
+    from django.test import Client, override_settings
+
+    from portfolio import assets
+    from portfolio.models import CaseStudy
+
+    call_command('collectstatic', interactive=False, verbosity=0)
+
+    def read(name, built=True):
+        path = staticfiles_storage.path(name) if built else finders.find(name)
+        with open(path, 'rb') as f:
+            return f.read()
+
+    print(f'{"file":<44} {"bytes":>8} {"gzip":>8} {"brotli":>8}')
+    files = [(assets.CSS_SOURCE, False), (assets.CSS_BUNDLE, True), (assets.JS_SOURCE, False), (assets.JS_BUNDLE, True)]
+    files += [(assets.critical_name(page), True) for page in assets.CRITICAL_PAGES]
+    for name, built in files:
+        print(f'{name:<44} {"{:>8} {:>8} {:>8}".format(*sizes(read(name, built)))}')
+    blocking = sizes(read(assets.CSS_SOURCE, False))[2]
+
+    CaseStudy.objects.create(
+        title='Project', slug='project', summary='Summary', problem='Problem', solution='Solution',
+        tech_stack='Django', key_results='Results',
+    )
+    urls = {'home': '/', 'casestudy_list': '/projects/', 'casestudy_detail': '/projects/project/'}
+    client = Client()
+    # Before, main.css (which @imported the font CSS) blocked the first
+    # render; after, the inline critical CSS is all that is needed
+    print()
+    print(f'{"page":<28} {"blocking requests":>18} {"blocking bytes (br)":>20} {"<head> bytes (br)":>18}')
+    for page, url in urls.items():
+        for label, debug in (('before', True), ('after', False)):
+            with override_settings(DEBUG=debug, PAGE_CACHE_ENABLED=False):
+                head = client.get(url).content.split(b'</head>')[0]
+            requests, blocked = ('2 (chained)', blocking) if debug else ('0', 0)
+            print(f'{f"{page} ({label})":<28} {requests:>18} {blocked:>20} {sizes(head)[2]:>18}')
+
+    teardown()
+
+
+if __name__ == '__main__':
+    main()
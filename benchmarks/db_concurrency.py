@@ -0,0 +1,108 @@
+"""
+SQLite throughput under concurrent readers plus one writer, per DB_PROFILE.
+
+Each profile runs in its own subprocess against a fresh on-disk database
+(migrated from scratch), so the connection hook and settings apply as in
+production.
+Usage: python benchmarks/db_concurrency.py [--readers 8] [--seconds 5]
+"""
+import argparse
+import json
+import os
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+
+
+def run_load(readers, seconds):
+    sys.path.insert(0, str(ROOT))
+    os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'portfolio_project.settings')
+    import django
+    django.setup()
+    from django.core.management import call_command
+    from django.db import DatabaseError, connection
+    from portfolio.models import CaseStudy, OutboxMessage
+
+    call_command('migrate', verbosity=0)
+    for i in range(50):
+        CaseStudy.objects.create(
+            title=f'Project {i}', summary='s', problem='p' * 500, solution='s' * 500,
+            tech_stack='Django, PostgreSQL', key_results='k' * 200,
+        )
+    connection.close()
+
+    stop = time.monotonic() + seconds
+    counts = {'reads': 0, 'writes': 0, 'errors': 0}
+    lock = threading.Lock()
+
+    def reader():
+        from django.db import connection
+        n = e = 0
+        while time.monotonic() < stop:
+            try:
+                list(CaseStudy.objects.published()[:6])
+                n += 1
+            except DatabaseError:
+                e += 1
+        connection.close()
+        with lock:
+            counts['reads'] += n
+            counts['errors'] += e
+
+    def writer():
+        from django.db import connection
+        n = e = 0
+        while time.monotonic() < stop:
+            try:
+                OutboxMessage.objects.create(subject='x', body='y' * 1000, from_email='a@b.c', to='d@e.f')
+                n += 1
+            except DatabaseError:
+                e += 1
+        connection.close()
+        with lock:
+            counts['writes'] += n
+            counts['errors'] += e
+
+    threads = [threading.Thread(target=reader) for _ in range(readers)] + [threading.Thread(target=writer)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    print(json.dumps({k: round(v / seconds, 1) if k != 'errors' else v for k, v in counts.items()}))
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--readers', type=int, default=8)
+    parser.add_argument('--seconds', type=float, default=5)
+    parser.add_argument('--child', action='store_true', help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.child:
+        run_load(args.readers, args.seconds)
+        return
+
+    for profile in ('default', 'tuned'):
+        with tempfile.TemporaryDirectory() as tmp:
+            env = {
+                **os.environ,
+                'DATABASE_TYPE': 'sqlite',
+                'DB_PROFILE': profile,
+                'SQLITE_PATH': os.path.join(tmp, 'bench.sqlite3'),
+                'CACHE_LOCATION': os.path.join(tmp, 'cache'),
+            }
+            out = subprocess.run(
+                [sys.executable, __file__, '--child', '--readers', str(args.readers), '--seconds', str(args.seconds)],
+                env=env, capture_output=True, text=True, check=True,
+            ).stdout.strip().splitlines()[-1]
+            result = json.loads(out)
+            print(f'{profile:>8}: {result["reads"]} reads/s, {result["writes"]} writes/s, {result["errors"]} errors')
+
+
+if __name__ == '__main__':
+    main()
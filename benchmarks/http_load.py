@@ -0,0 +1,180 @@
+"""
+Local HTTP load test against a real gunicorn, per worker mode.
+
+Boots gunicorn with gunicorn.conf.py on a throwaway SQLite database, drives
+each public endpoint with concurrent keep-alive clients and records
+p50/p99 latency and requests per second.
+Usage: python benchmarks/http_load.py [--modes sync gthread uvicorn] [--concurrency 16] [--seconds 5]
+"""
+import argparse
+import http.client
+import importlib.util
+import json
+import os
+import socket
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+from contextlib import contextmanager
+from pathlib import Path
+
+from _django import percentiles
+
+ROOT = Path(__file__).resolve().parent.parent
+ENDPOINTS = ['/', '/projects/', '/projects/project-0/', '/projects/search/?q=django', '/cv/']
+SEED = """
+from portfolio.models import CaseStudy
+for i in range({n}):
+    CaseStudy.objects.create(
+        title=f'Project {{i}}', summary='Backend service built with Django', problem='Problem ' * 200,
+        solution='Solution ' * 200, tech_stack='Django, PostgreSQL, Celery', key_results='Result ' * 50,
+    )
+"""
+
+
+def free_port():
+    with socket.socket() as s:
+        s.bind(('127.0.0.1', 0))
+        return s.getsockname()[1]
+
+
+def manage(env, *args):
+    subprocess.run([sys.executable, 'manage.py', *args], cwd=ROOT, env=env, check=True, capture_output=True)
+
+
+def wait_for(port, timeout=30):
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        try:
+            conn = http.client.HTTPConnection('127.0.0.1', port, timeout=2)
+            conn.request('GET', '/projects/')
+            conn.getresponse().read()
+            return
+        except OSError:
+            time.sleep(0.2)
+    raise RuntimeError('gunicorn did not start')
+
+
+def prepare_env(tmp, rows, workers):
+    """Environment for a throwaway site in `tmp`: migrated, collected and seeded."""
+    env = {
+        **os.environ,
+        'DEBUG': 'False',
+        'ALLOWED_HOSTS': '127.0.0.1,localhost',
+        'DATABASE_TYPE': 'sqlite',
+        'SQLITE_PATH': os.path.join(tmp, 'db.sqlite3'),
+        'CACHE_LOCATION': os.path.join(tmp, 'cache'),
+        'STATIC_ROOT': os.path.join(tmp, 'static'),
+        'GUNICORN_ACCESS_LOG': '',
+        'GUNICORN_LOG_LEVEL': 'warning',
+        'GUNICORN_WORKERS': str(workers),
+    }
+    manage(env, 'migrate', '--noinput')
+    manage(env, 'collectstatic', '--noinput')
+    manage(env, 'shell', '-c', SEED.format(n=rows))
+    return env
+
+
+def mode_available(mode):
+    if mode == 'uvicorn' and importlib.util.find_spec('uvicorn_worker') is None:
+        print('uvicorn: skipped (pip install uvicorn-worker)')
+        return False
+    return True
+
+
+@contextmanager
+def gunicorn_server(env, mode):
+    """Run gunicorn.conf.py in `mode` on a free port; yields (port, master process)."""
+    port = free_port()
+    server = subprocess.Popen(
+        [sys.executable, '-m', 'gunicorn', '-c', 'gunicorn.conf.py'],
+        cwd=ROOT, env={**env, 'GUNICORN_WORKER_MODE': mode, 'GUNICORN_BIND': f'127.0.0.1:{port}'},
+    )
+    try:
+        wait_for(port)
+        yield port, server
+    finally:
+        server.terminate()
+        server.wait(timeout=30)
+
+
+@contextmanager
+def gunicorn(env, mode):
+    """Run gunicorn.conf.py in `mode` on a free port; yields the port."""
+    with gunicorn_server(env, mode) as (port, _):
+        yield port
+
+
+def drive(port, path, concurrency, seconds):
+    samples, errors, reconnects = [], [0], [0]
+    lock = threading.Lock()
+    stop = time.monotonic() + seconds
+
+    def client():
+        conn = http.client.HTTPConnection('127.0.0.1', port, timeout=30)
+        local = []
+        while time.monotonic() < stop:
+            t = time.perf_counter()
+            try:
+                conn.request('GET', path)
+                response = conn.getresponse()
+                response.read()
+                if response.status >= 400:
+                    errors[0] += 1
+            except http.client.RemoteDisconnected:
+                # Keep-alive connection closed by a recycled worker (max_requests)
+                reconnects[0] += 1
+                conn.close()
+                conn = http.client.HTTPConnection('127.0.0.1', port, timeout=30)
+                continue
+            except (OSError, http.client.HTTPException):
+                errors[0] += 1
+                conn.close()
+                conn = http.client.HTTPConnection('127.0.0.1', port, timeout=30)
+                continue
+            local.append(time.perf_counter() - t)
+        conn.close()
+        with lock:
+            samples.extend(local)
+
+    threads = [threading.Thread(target=client) for _ in range(concurrency)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    result = percentiles(samples) if samples else {}
+    result.update(rps=round(len(samples) / seconds, 1), errors=errors[0], reconnects=reconnects[0])
+    return result
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--modes', nargs='+', default=['sync', 'gthread', 'uvicorn'])
+    parser.add_argument('--workers', type=int, default=2)
+    parser.add_argument('--concurrency', type=int, default=16)
+    parser.add_argument('--seconds', type=float, default=5)
+    parser.add_argument('--rows', type=int, default=30)
+    parser.add_argument('--json', help='Write results to this file')
+    args = parser.parse_args()
+
+    results = {}
+    with tempfile.TemporaryDirectory() as tmp:
+        env = prepare_env(tmp, args.rows, args.workers)
+        for mode in args.modes:
+            if not mode_available(mode):
+                continue
+            with gunicorn(env, mode) as port:
+                results[mode] = {}
+                for path in ENDPOINTS:
+                    stats = drive(port, path, args.concurrency, args.seconds)
+                    results[mode][path] = stats
+                    print(f'{mode:>8} {path:<28} {stats}')
+
+    if args.json:
+        Path(args.json).write_text(json.dumps(results, indent=2))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,81 @@
+"""
+Memory and time to first byte for a page listing every case study: the whole
+list rendered at once from model instances (published(), all fields) against
+the streamed /projects/all/ (card fields via .values().iterator(), rendered in
+chunks). Peak memory is measured with tracemalloc.
+Usage: python benchmarks/list_memory.py [--rows 1000 5000 20000] [--text-kb 4]
+"""
+import argparse
+import time
+import tracemalloc
+
+from _django import setup
+
+
+def measure(fn):
+    """(time to first chunk ms, total ms, peak MB, bytes) for fn, a generator of body chunks."""
+    tracemalloc.start()
+    start = time.perf_counter()
+    first = None
+    size = 0
+    for chunk in fn():
+        if first is None:
+            first = time.perf_counter() - start
+        size += len(chunk)
+    total = time.perf_counter() - start
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return first * 1000, total * 1000, peak / 2**20, size
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--rows', type=int, nargs='+', default=[1000, 5000, 20000])
+    parser.add_argument('--text-kb', type=int, default=4, help='size of each long text field')
+    args = parser.parse_args()
+
+    teardown = setup()
+    from django.db import connection
+    from django.template.loader import render_to_string
+    from django.test import RequestFactory, override_settings
+
+    from portfolio.models import CaseStudy
+    from portfolio.views import casestudy_list_all
+
+    text = 'x' * (args.text_kb * 1024)
+    factory = RequestFactory()
+
+    def buffered():
+        request = factory.get('/projects/all/')
+        yield render_to_string(
+            'portfolio/casestudy_list.html', {'case_studies': list(CaseStudy.objects.published())}, request,
+        ).encode()
+
+    def streamed():
+        yield from casestudy_list_all(factory.get('/projects/all/')).streaming_content
+
+    print(f'{connection.vendor}: long text fields of {args.text_kb} KB')
+    print(f'{"rows":>7} {"mode":>9} {"TTFB ms":>9} {"total ms":>9} {"peak MB":>8} {"body KB":>8}')
+    created = 0
+    for rows in sorted(args.rows):
+        CaseStudy.objects.bulk_create(
+            [
+                CaseStudy(
+                    title=f'Project {i}', slug=f'project-{i}', summary=f'Summary of project {i}', problem=text,
+                    solution=text, tech_stack='Django, PostgreSQL', key_results=text, order=i,
+                )
+                for i in range(created, rows)
+            ],
+            batch_size=1000,
+        )
+        created = rows
+        with override_settings(PAGE_CACHE_ENABLED=False):
+            for mode, fn in (('buffered', buffered), ('streamed', streamed)):
+                first, total, peak, size = measure(fn)
+                print(f'{rows:>7} {mode:>9} {first:>9.1f} {total:>9.1f} {peak:>8.1f} {size / 1024:>8.0f}')
+
+    teardown()
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,52 @@
+"""
+Overhead of PerformanceMiddleware: request latency with the middleware off,
+on with sampling, and on for every request.
+Usage: python benchmarks/metrics_overhead.py [--requests 500] [--path /projects/]
+"""
+import argparse
+import time
+
+from _django import percentiles, setup
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--requests', type=int, default=500)
+    parser.add_argument('--path', default='/projects/')
+    parser.add_argument('--sample-rate', type=float, default=0.1)
+    args = parser.parse_args()
+
+    teardown = setup()
+    from django.test import Client, override_settings
+    from portfolio.models import CaseStudy
+
+    for i in range(20):
+        CaseStudy.objects.create(
+            title=f'Project {i}', summary='Summary', problem='Problem', solution='Solution',
+            tech_stack='Django, PostgreSQL, Redis', key_results='Results', order=i,
+        )
+
+    from django.conf import settings
+    without = [m for m in settings.MIDDLEWARE if m != 'portfolio.metrics.PerformanceMiddleware']
+    variants = (
+        ('off', {'MIDDLEWARE': without}),
+        (f'sampled {args.sample_rate}', {'METRICS_SAMPLE_RATE': args.sample_rate}),
+        ('every request', {'METRICS_SAMPLE_RATE': 1.0}),
+    )
+    # Measure the view itself, not the page cache
+    for label, overrides in variants:
+        with override_settings(PAGE_CACHE_ENABLED=False, **overrides):
+            client = Client()
+            client.get(args.path)
+            samples = []
+            for _ in range(args.requests):
+                t = time.perf_counter()
+                client.get(args.path)
+                samples.append(time.perf_counter() - t)
+        print(f'{label:>14}: {percentiles(samples)} ms')
+
+    teardown()
+
+
+if __name__ == '__main__':
+    main()
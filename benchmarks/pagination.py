@@ -0,0 +1,73 @@
+"""
+Deep pagination cost: OFFSET pages (?page=N) against keyset cursors
+(?cursor=) for the case study list, plus /api/projects/ end to end.
+Usage: python benchmarks/pagination.py [--rows 50000] [--per-page 20] [--requests 30]
+"""
+import argparse
+import time
+
+from _django import percentiles, setup
+
+
+def timed(fn, n):
+    samples = []
+    for _ in range(n):
+        start = time.perf_counter()
+        fn()
+        samples.append(time.perf_counter() - start)
+    return percentiles(samples)
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--rows', type=int, default=50000)
+    parser.add_argument('--per-page', type=int, default=20)
+    parser.add_argument('--requests', type=int, default=30)
+    args = parser.parse_args()
+
+    teardown = setup()
+    from django.core.paginator import Paginator
+    from django.db import connection
+    from django.test import Client, override_settings
+
+    from portfolio.models import CASE_STUDY_ORDERING, CaseStudy
+    from portfolio.pagination import KeysetPaginator
+
+    CaseStudy.objects.bulk_create(
+        [
+            CaseStudy(
+                title=f'Project {i}', slug=f'project-{i}', summary='Summary', problem='Problem',
+                solution='Solution', tech_stack='Django, PostgreSQL', key_results='Results', order=i // 10000,
+            )
+            for i in range(args.rows)
+        ],
+        batch_size=1000,
+    )
+    print(f'{connection.vendor}: {args.rows} published case studies, {args.per_page} per page')
+
+    columns = ('id', 'slug', 'title', 'summary', 'order', 'created_at')
+    rows = CaseStudy.objects.filter(is_published=True).values(*columns)
+    keyset = KeysetPaginator(rows, args.per_page, CASE_STUDY_ORDERING)
+    offset = Paginator(rows.order_by(*CASE_STUDY_ORDERING), args.per_page)
+    last_page = args.rows // args.per_page
+    client = Client()
+
+    print(f'{"page":>6} {"offset p50 ms":>14} {"keyset p50 ms":>14} {"API p50 ms":>11}')
+    for number in (1, 10, 100, last_page // 2, last_page):
+        # The cursor for page N points at the last row of page N - 1
+        cursor = None
+        if number > 1:
+            boundary = rows.order_by(*CASE_STUDY_ORDERING)[(number - 1) * args.per_page - 1]
+            cursor = keyset.encode_cursor(keyset._key(boundary), backwards=False)
+        offset_stats = timed(lambda: list(offset.page(number).object_list), args.requests)
+        keyset_stats = timed(lambda: keyset.page(cursor), args.requests)
+        url = f'/api/projects/?limit={args.per_page}' + (f'&cursor={cursor}' if cursor else '')
+        with override_settings(PAGE_CACHE_ENABLED=False):
+            api_stats = timed(lambda: client.get(url), args.requests)
+        print(f'{number:>6} {offset_stats["p50"]:>14.2f} {keyset_stats["p50"]:>14.2f} {api_stats["p50"]:>11.2f}')
+
+    teardown()
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,68 @@
+"""
+Search latency with N synthetic case studies: full-text index vs icontains scan.
+Usage: python benchmarks/search_latency.py [--rows 10000] [--queries 200]
+"""
+import argparse
+import random
+import time
+
+from _django import percentiles, setup
+
+WORDS = (
+    'django api async celery redis postgres kafka docker kubernetes llm rag '
+    'pipeline scraper payments billing analytics dashboard auth microservice '
+    'webhook graphql cache queue search telegram bot automation etl report'
+).split()
+QUERIES = ['django', 'payments api', 'rag pipeline', 'telegram bot', 'kubernetes', 'graphql cache', 'etl report']
+
+
+FILLER = [f'w{i:04d}' for i in range(5000)]
+
+
+def sentence(rng, n):
+    # Mostly filler vocabulary with the occasional real keyword, like prose
+    words = [rng.choice(WORDS) if rng.random() < 0.02 else rng.choice(FILLER) for _ in range(n)]
+    return ' '.join(words).capitalize() + '.'
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--rows', type=int, default=10000)
+    parser.add_argument('--queries', type=int, default=200)
+    args = parser.parse_args()
+
+    teardown = setup()
+    from django.db import connection
+    from portfolio import search
+    from portfolio.models import CaseStudy
+
+    rng = random.Random(42)
+    CaseStudy.objects.bulk_create(
+        [
+            CaseStudy(
+                title=sentence(rng, 4), slug=f'bench-{i}', summary=sentence(rng, 10),
+                problem=sentence(rng, 80), solution=sentence(rng, 80),
+                tech_stack=', '.join(rng.sample(WORDS, 2)), key_results=sentence(rng, 40),
+            )
+            for i in range(args.rows)
+        ],
+        batch_size=1000,
+    )
+    start = time.perf_counter()
+    search.rebuild_index()
+    print(f'{connection.vendor}: indexed {args.rows} rows in {time.perf_counter() - start:.2f}s')
+
+    for label, func in (('index', search.search_ids), ('icontains', search._fallback_ids)):
+        samples = []
+        for i in range(args.queries):
+            q = QUERIES[i % len(QUERIES)]
+            t = time.perf_counter()
+            func(q, 50)
+            samples.append(time.perf_counter() - t)
+        print(f'{label:>10}: {percentiles(samples)} ms')
+
+    teardown()
+
+
+if __name__ == '__main__':
+    main()
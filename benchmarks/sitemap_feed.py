@@ -0,0 +1,115 @@
+"""
+Sitemap and feed cost with many case studies: first generation (streamed),
+cached responses and crawler revalidation (304).
+Usage: python benchmarks/sitemap_feed.py [--rows 60000] [--images 1] [--requests 20] [--memory]
+"""
+import argparse
+import time
+import tracemalloc
+import xml.dom.pulldom
+
+from _django import percentiles, setup
+
+
+class QueryCounter:
+    def __init__(self):
+        self.count = 0
+
+    def __call__(self, execute, sql, params, many, context):
+        self.count += 1
+        return execute(sql, params, many, context)
+
+
+def body(response):
+    return b''.join(response.streaming_content) if response.streaming else response.content
+
+
+def count_tags(content, tag):
+    events = xml.dom.pulldom.parseString(content.decode())
+    return sum(1 for event, node in events if event == xml.dom.pulldom.START_ELEMENT and node.tagName == tag)
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--rows', type=int, default=60000)
+    parser.add_argument('--images', type=int, default=1, help='images per case study')
+    parser.add_argument('--requests', type=int, default=20)
+    parser.add_argument('--memory', action='store_true', help='Trace peak memory of generation (much slower)')
+    args = parser.parse_args()
+
+    teardown = setup()
+    from django.db import connection
+    from django.test import Client
+
+    from portfolio.models import CaseStudy, CaseStudyImage
+
+    CaseStudy.objects.bulk_create(
+        [
+            CaseStudy(
+                title=f'Project {i}', slug=f'project-{i}', summary='Summary', problem='Problem',
+                solution='Solution', tech_stack='Django, PostgreSQL', key_results='Results',
+            )
+            for i in range(args.rows)
+        ],
+        batch_size=1000,
+    )
+    CaseStudyImage.objects.bulk_create(
+        [
+            CaseStudyImage(case_study_id=pk, image=f'case_studies/bench/{pk}-{n}.png', order=n)
+            for pk in CaseStudy.objects.values_list('pk', flat=True)
+            for n in range(args.images)
+        ],
+        batch_size=1000,
+    )
+    print(f'{connection.vendor}: {args.rows} case studies, {args.rows * args.images} images')
+
+    client = Client()
+    index = client.get('/sitemap.xml')
+    index_body = body(index)
+    sections = count_tags(index_body, 'sitemap')
+    urls = [f'/sitemap-{n}.xml' for n in range(1, sections + 1)] if sections else ['/sitemap.xml']
+
+    total = 0
+    for url in urls:
+        counter = QueryCounter()
+        if args.memory:
+            tracemalloc.start()
+        start = time.perf_counter()
+        with connection.execute_wrapper(counter):
+            response = client.get(url)
+            first_chunk = next(iter(response.streaming_content))
+            ttfb = time.perf_counter() - start
+            content = first_chunk + body(response)
+        elapsed = time.perf_counter() - start
+        memory = ''
+        if args.memory:
+            memory = f', peak {tracemalloc.get_traced_memory()[1] / 1e6:.1f} MB'
+            tracemalloc.stop()
+        entries = count_tags(content, 'url')
+        total += entries
+        print(f'{url:<18} generated: {entries} URLs, {len(content) / 1e6:.1f} MB, first byte {ttfb * 1000:.1f} ms, '
+              f'total {elapsed * 1000:.0f} ms, {counter.count} queries{memory}')
+    print(f'sitemap index: {sections} section(s), {total} URLs (expected {args.rows + 2})')
+
+    for url in ['/sitemap.xml', urls[0], '/feed.xml']:
+        client.get(url)  # warm
+        response = client.get(url)
+        body(response)
+        for label, headers in (('cached', {}), ('304', {'HTTP_IF_NONE_MATCH': response['ETag']}),
+                               ('304 (IMS)', {'HTTP_IF_MODIFIED_SINCE': response['Last-Modified']})):
+            counter = QueryCounter()
+            samples = []
+            with connection.execute_wrapper(counter):
+                for _ in range(args.requests):
+                    start = time.perf_counter()
+                    r = client.get(url, **headers)
+                    body(r)
+                    samples.append(time.perf_counter() - start)
+            print(f'{url:<18} {label:<10} status {r.status_code}  {percentiles(samples)}  '
+                  f'{counter.count / args.requests:.1f} queries/request')
+
+    teardown()
+
+
+if __name__ == '__main__':
+    main()
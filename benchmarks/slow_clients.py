@@ -0,0 +1,77 @@
+"""
+WSGI vs ASGI under slow-client (slowloris-style) concurrency.
+
+For each worker mode, holds N connections open that trickle request headers
+one byte at a time, while a normal client measures latency on the home page.
+Usage: python benchmarks/slow_clients.py [--slow 50] [--seconds 10] [--workers 1]
+"""
+import argparse
+import http.client
+import socket
+import tempfile
+import threading
+import time
+
+from _django import percentiles
+from http_load import gunicorn, mode_available, prepare_env
+
+
+def slow_client(port, stop):
+    """Open a connection and dribble out an endless request header."""
+    try:
+        sock = socket.create_connection(('127.0.0.1', port), timeout=5)
+        sock.sendall(b'GET / HTTP/1.1\r\nHost: 127.0.0.1\r\n')
+        while not stop.is_set():
+            sock.sendall(b'X')
+            stop.wait(0.5)
+        sock.close()
+    except OSError:
+        pass
+
+
+def measure(port, seconds, timeout=5):
+    samples, failures = [], 0
+    deadline = time.monotonic() + seconds
+    while time.monotonic() < deadline:
+        t = time.perf_counter()
+        try:
+            conn = http.client.HTTPConnection('127.0.0.1', port, timeout=timeout)
+            conn.request('GET', '/')
+            conn.getresponse().read()
+            conn.close()
+            samples.append(time.perf_counter() - t)
+        except OSError:
+            failures += 1
+    result = percentiles(samples) if len(samples) > 1 else {}
+    result.update(ok=len(samples), timeouts=failures)
+    return result
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--modes', nargs='+', default=['sync', 'gthread', 'uvicorn'])
+    parser.add_argument('--workers', type=int, default=1)
+    parser.add_argument('--slow', type=int, default=50, help='Number of slow clients')
+    parser.add_argument('--seconds', type=float, default=10)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        env = prepare_env(tmp, rows=10, workers=args.workers)
+        for mode in args.modes:
+            if not mode_available(mode):
+                continue
+            with gunicorn(env, mode) as port:
+                stop = threading.Event()
+                threads = [threading.Thread(target=slow_client, args=(port, stop)) for _ in range(args.slow)]
+                for t in threads:
+                    t.start()
+                time.sleep(1)
+                result = measure(port, args.seconds)
+                stop.set()
+                for t in threads:
+                    t.join()
+                print(f'{mode:>8} with {args.slow} slow clients: {result}')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,183 @@
+"""
+Start-up profile and cold start to first 200.
+
+Profile mode (default) runs the Django start-up phases in a fresh interpreter
+under `-X importtime` and reports the time per phase (settings, apps, URLconf,
+WSGI handler, first request) and the slowest imports.
+`--cold-start` boots gunicorn behind the old entrypoint sequence
+(collectstatic, migrate, a separate create_superuser script) and behind
+`manage.py bootstrap`, on a first boot and on a restart, and reports the time
+until /projects/ first answers 200.
+Usage: python benchmarks/startup.py [--top 15] [--cold-start] [--runs 3]
+"""
+import argparse
+import http.client
+import json
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+
+from http_load import ROOT, free_port
+
+PHASES = r"""
+import json, os, sys, time
+t = time.perf_counter
+timings, start = {}, t()
+os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'portfolio_project.settings')
+from django.conf import settings
+settings.INSTALLED_APPS
+timings['settings'] = t() - start
+import django
+mark = t(); django.setup(set_prefix=False); timings['django.setup'] = t() - mark
+from django.urls import get_resolver
+mark = t(); get_resolver().url_patterns; timings['URLconf'] = t() - mark
+from django.core.handlers.wsgi import WSGIHandler
+mark = t(); handler = WSGIHandler(); timings['WSGI handler'] = t() - mark
+from django.test import RequestFactory
+request = RequestFactory().get('/projects/', HTTP_HOST='localhost')
+mark = t(); status = handler.get_response(request).status_code; timings['first request'] = t() - mark
+timings['total'] = t() - start
+print(json.dumps({'status': status, 'timings': timings, 'modules': sorted(sys.modules)}))
+"""
+
+# The old entrypoint's create_superuser.py: a second interpreter and django.setup()
+LEGACY_SUPERUSER = """
+import os, django
+os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'portfolio_project.settings')
+django.setup()
+from django.contrib.auth import get_user_model
+User = get_user_model()
+username = os.environ['DJANGO_SUPERUSER_USERNAME']
+if not User.objects.filter(username=username).exists():
+    User.objects.create_superuser(username=username, email=os.environ['DJANGO_SUPERUSER_EMAIL'],
+                                  password=os.environ['DJANGO_SUPERUSER_PASSWORD'])
+"""
+
+ENTRYPOINTS = {
+    'legacy': [
+        ['manage.py', 'collectstatic', '--noinput'],
+        ['manage.py', 'migrate', '--noinput'],
+        ['-c', LEGACY_SUPERUSER],
+    ],
+    'bootstrap': [
+        ['manage.py', 'bootstrap'],
+    ],
+}
+
+
+def site_env(tmp):
+    return {
+        **os.environ,
+        'DEBUG': 'False',
+        'ALLOWED_HOSTS': '127.0.0.1,localhost',
+        'DATABASE_TYPE': 'sqlite',
+        'SQLITE_PATH': os.path.join(tmp, 'db.sqlite3'),
+        'CACHE_LOCATION': os.path.join(tmp, 'cache'),
+        'STATIC_ROOT': os.path.join(tmp, 'static'),
+        'DJANGO_SUPERUSER_USERNAME': 'admin',
+        'DJANGO_SUPERUSER_EMAIL': 'admin@example.com',
+        'DJANGO_SUPERUSER_PASSWORD': 'correct horse battery staple',
+        'GUNICORN_ACCESS_LOG': '',
+        'GUNICORN_LOG_LEVEL': 'warning',
+        'GUNICORN_WORKERS': '2',
+    }
+
+
+def profile(top):
+    with tempfile.TemporaryDirectory() as tmp:
+        env = site_env(tmp)
+        subprocess.run([sys.executable, 'manage.py', 'bootstrap'], cwd=ROOT, env=env, check=True,
+                       capture_output=True)
+        proc = subprocess.run([sys.executable, '-X', 'importtime', '-c', PHASES], cwd=ROOT, env=env,
+                              check=True, capture_output=True, text=True)
+    result = json.loads(proc.stdout.strip().splitlines()[-1])
+
+    print(f'first request status: {result["status"]}')
+    for name, seconds in result['timings'].items():
+        print(f'{name:<16} {seconds * 1000:8.1f} ms')
+    heavy = [m for m in ('PIL', 'qrcode') if m in result['modules']]
+    print(f'heavy optional modules loaded: {", ".join(heavy) or "none"}')
+
+    # "import time: self [us] | cumulative | imported package" (nesting shown by indentation)
+    imports = []
+    for line in proc.stderr.splitlines():
+        if not line.startswith('import time:') or 'self [us]' in line:
+            continue
+        self_us, cumulative, name = line[len('import time:'):].split('|')
+        imports.append((int(cumulative), int(self_us), name.strip()))
+    by_package = {}
+    for _, self_us, name in imports:
+        package = name.split('.')[0]
+        by_package[package] = by_package.get(package, 0) + self_us
+    print('\nslowest imports (cumulative):')
+    for cumulative, _, name in sorted(imports, reverse=True)[:top]:
+        print(f'  {cumulative / 1000:8.1f} ms  {name}')
+    print('\nimport time by top-level package (self):')
+    for package, self_us in sorted(by_package.items(), key=lambda item: -item[1])[:top]:
+        print(f'  {self_us / 1000:8.1f} ms  {package}')
+
+
+def first_200(port, server, timeout=60):
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        if server.poll() is not None:
+            raise RuntimeError('gunicorn exited')
+        try:
+            conn = http.client.HTTPConnection('127.0.0.1', port, timeout=5)
+            conn.request('GET', '/projects/')
+            if conn.getresponse().status == 200:
+                return
+        except OSError:
+            pass
+        time.sleep(0.01)
+    raise RuntimeError('gunicorn did not start')
+
+
+def cold_start(env, entrypoint):
+    """Seconds from container start (entrypoint steps, then gunicorn) to the first 200."""
+    port = free_port()
+    start = time.perf_counter()
+    for args in ENTRYPOINTS[entrypoint]:
+        subprocess.run([sys.executable, *args], cwd=ROOT, env=env, check=True, capture_output=True)
+    server = subprocess.Popen(
+        [sys.executable, '-m', 'gunicorn', '-c', 'gunicorn.conf.py'],
+        cwd=ROOT, env={**env, 'GUNICORN_BIND': f'127.0.0.1:{port}'},
+    )
+    try:
+        first_200(port, server)
+        return time.perf_counter() - start
+    finally:
+        server.terminate()
+        server.wait(timeout=30)
+
+
+def cold_starts(runs):
+    print(f'{"entrypoint":<10} {"first boot":>12} {"restart":>12}')
+    for entrypoint in ENTRYPOINTS:
+        first, restart = [], []
+        for _ in range(runs):
+            with tempfile.TemporaryDirectory() as tmp:
+                env = site_env(tmp)
+                first.append(cold_start(env, entrypoint))
+                restart.append(cold_start(env, entrypoint))
+        print(f'{entrypoint:<10} {statistics.median(first) * 1000:9.0f} ms {statistics.median(restart) * 1000:9.0f} ms')
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--top', type=int, default=15, help='Imports to list')
+    parser.add_argument('--cold-start', action='store_true', help='Also measure cold start to first 200 under gunicorn')
+    parser.add_argument('--runs', type=int, default=3, help='Cold starts per entrypoint (median reported)')
+    args = parser.parse_args()
+
+    profile(args.top)
+    if args.cold_start:
+        print()
+        cold_starts(args.runs)
+
+
+if __name__ == '__main__':
+    main()
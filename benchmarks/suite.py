@@ -0,0 +1,350 @@
+"""
+End-to-end performance suite with a JSON baseline and regression gating.
+
+Seeds case studies and images, then drives every route in portfolio/urls.py,
+a media file, the contact form and the admin login (+ 2FA with
+ADMIN_2FA_ENABLED=True) through Django's test client, and the public routes through a
+real local gunicorn. Records latency percentiles, query counts (first and
+repeat request), requests per second and peak RSS.
+
+    python benchmarks/suite.py --update      # write the baseline
+    python benchmarks/suite.py --check       # exit 1 on a regression
+
+A run regresses when query counts, errors or status codes get worse at all,
+or p50 latency or peak RSS grows (RPS drops) by more than --threshold and
+by more than a small absolute floor. Baselines hold machine-specific timings, so
+compare runs from the same machine with the same --rows / --images. The default
+baseline.json is not committed (.gitignore): run --update once on the machine
+that will run --check.
+Usage: python benchmarks/suite.py [--rows 200] [--images 2] [--requests 30] [--seconds 3]
+       [--modes gthread] [--no-gunicorn] [--baseline benchmarks/baseline.json] [--update | --check]
+       [--threshold 0.5]
+"""
+import argparse
+import json
+import logging
+import os
+import platform
+import resource
+import sys
+import tempfile
+import time
+from datetime import datetime, timezone
+from pathlib import Path
+
+from _django import ROOT, percentiles, setup
+
+DEFAULT_BASELINE = ROOT / 'benchmarks' / 'baseline.json'
+ADMIN_PASSWORD = 'correct horse battery staple'
+METRICS_TOKEN = 'suite-token'
+SAMPLE_KWARGS = {'slug': 'project-0', 'section': 1}
+SAMPLE_QUERY = {'casestudy_search': '?q=django'}
+# Must not get worse at all
+EXACT_METRICS = ('status', 'queries_first', 'queries_repeat', 'errors')
+# Compared with --threshold; p95, p99 and first_ms are recorded but too noisy to gate
+RELATIVE_METRICS = ('p50', 'rps', 'peak_mb', 'master_peak_mb', 'worker_peak_mb')
+# Absolute slack below which a relative change is treated as noise
+FLOORS = {'ms': 2.0, 'mb': 5.0, 'rps': 20.0}
+
+
+class QueryCounter:
+    def __init__(self):
+        self.count = 0
+
+    def __call__(self, execute, sql, params, many, context):
+        self.count += 1
+        return execute(sql, params, many, context)
+
+
+def consume(response):
+    if response.streaming:
+        for _ in response.streaming_content:
+            pass
+    return response
+
+
+def public_routes():
+    """(label, path) for every route in portfolio/urls.py, with sample arguments."""
+    from django.urls import reverse
+
+    from portfolio import urls
+
+    routes = []
+    for pattern in urls.urlpatterns:
+        kwargs = {name: SAMPLE_KWARGS[name] for name in pattern.pattern.converters}
+        path = reverse(f'portfolio:{pattern.name}', kwargs=kwargs) + SAMPLE_QUERY.get(pattern.name, '')
+        routes.append((pattern.name, path))
+    return routes
+
+
+def seed(rows, images):
+    """Case studies project-0… with `images` images each; returns a media URL that exists."""
+    from django.core.files.base import ContentFile
+    from django.core.files.storage import default_storage
+
+    from portfolio.models import CaseStudy, CaseStudyImage, sync_tech_links
+
+    CaseStudy.objects.bulk_create(
+        [
+            CaseStudy(
+                title=f'Project {i}', slug=f'project-{i}', summary='Backend service built with Django',
+                problem='Problem ' * 200, solution='Solution ' * 200, tech_stack='Django, PostgreSQL, Celery',
+                key_results='Result ' * 50, order=i,
+            )
+            for i in range(rows)
+        ],
+        batch_size=1000,
+    )
+    case_studies = list(CaseStudy.objects.all())
+    sync_tech_links(case_studies)
+    # One real file shared by every row; bulk_create skips the derivative signals
+    name = default_storage.save('case_studies/suite/screenshot.svg', ContentFile(
+        b'<svg xmlns="http://www.w3.org/2000/svg" width="1200" height="800">' + b'<rect/>' * 500 + b'</svg>'
+    ))
+    CaseStudyImage.objects.bulk_create(
+        [
+            CaseStudyImage(case_study=cs, image=name, alt_text='Screenshot', order=n, width=1200, height=800)
+            for cs in case_studies
+            for n in range(images)
+        ],
+        batch_size=1000,
+    )
+    return default_storage.url(name)
+
+
+def summarize(status, samples, queries):
+    """The first (cold) request apart, percentiles over the repeats."""
+    return {
+        'status': status, 'first_ms': round(samples[0] * 1000, 3), **percentiles(samples[1:] or samples),
+        'queries_first': queries[0], 'queries_repeat': queries[-1],
+    }
+
+
+def measure(client, method, path, n, **extra):
+    from django.db import connection
+
+    samples, queries = [], []
+    status = None
+    for _ in range(n):
+        counter = QueryCounter()
+        start = time.perf_counter()
+        with connection.execute_wrapper(counter):
+            response = consume(getattr(client, method)(path, **extra))
+        samples.append(time.perf_counter() - start)
+        queries.append(counter.count)
+        status = response.status_code
+    return summarize(status, samples, queries)
+
+
+def otp_token(device):
+    from django_otp.oath import TOTP
+
+    totp = TOTP(device.bin_key, device.step, device.t0, device.digits, device.drift)
+    return f'{totp.token():0{device.digits}d}'
+
+
+def admin_flow(n):
+    """Each step of a fresh admin sign-in, timed over `n` sign-ins."""
+    from django.contrib.auth.models import User
+    from django.db import connection
+    from django.test import Client
+    from django.urls import NoReverseMatch, reverse
+
+    user = User.objects.create_superuser('suite', 'suite@example.com', ADMIN_PASSWORD)
+    steps = [
+        ('get', '/admin/login/', None),
+        ('post', '/admin/login/', {'username': 'suite', 'password': ADMIN_PASSWORD}),
+    ]
+    device = None
+    try:
+        verify_url = reverse('admin:verify_otp')
+    except NoReverseMatch:
+        print('admin 2FA: skipped (the OTP admin site is not mounted in ROOT_URLCONF)')
+    else:
+        from portfolio.two_factor import device_state
+
+        state = device_state(user)
+        device = state.setup_device()
+        state.confirm(device)
+        steps += [('get', verify_url, None), ('post', verify_url, 'otp')]
+    steps += [('get', '/admin/', None), ('get', '/admin/portfolio/casestudy/', None)]
+
+    runs = {f'admin {method.upper()} {path}': ([], []) for method, path, _ in steps}
+    statuses = {}
+    for _ in range(n):
+        client = Client()
+        for method, path, data in steps:
+            if data == 'otp':
+                # TOTP refuses a code twice in one time step; forget the last one
+                device.last_t = -1
+                device.save(update_fields=['last_t'])
+                data = {'token': otp_token(device)}
+            label = f'admin {method.upper()} {path}'
+            counter = QueryCounter()
+            start = time.perf_counter()
+            with connection.execute_wrapper(counter):
+                response = getattr(client, method)(path, data)
+            runs[label][0].append(time.perf_counter() - start)
+            runs[label][1].append(counter.count)
+            statuses[label] = response.status_code
+    return {label: summarize(statuses[label], samples, queries) for label, (samples, queries) in runs.items()}
+
+
+def run_client(args):
+    """In-process phase: DEBUG=False settings on a throwaway database."""
+    os.environ.setdefault('DEBUG', 'False')
+    os.environ.setdefault('STATIC_ROOT', tempfile.mkdtemp(prefix='suite-static-'))
+    teardown = setup()
+    # Admin sign-ins hash passwords and are logged as slow requests
+    logging.getLogger('portfolio.performance').setLevel(logging.ERROR)
+    from django.core.management import call_command
+    from django.test import Client, override_settings
+
+    call_command('collectstatic', interactive=False, verbosity=0)
+    media_url = seed(args.rows, args.images)
+    results = {}
+    with override_settings(THROTTLE_ENABLED=False, METRICS_TOKEN=METRICS_TOKEN):
+        client = Client()
+        for name, path in public_routes():
+            extra = {'HTTP_AUTHORIZATION': f'Bearer {METRICS_TOKEN}'} if name == 'metrics' else {}
+            results[f'client GET {path}'] = measure(client, 'get', path, args.requests, **extra)
+        results[f'client GET {media_url}'] = measure(client, 'get', media_url, args.requests)
+        contact = {'name': 'Suite', 'email': 'suite@example.com', 'message': 'Performance suite message ' * 5}
+        results['client POST / (contact)'] = measure(client, 'post', '/', args.requests, data=contact)
+        results.update(admin_flow(max(3, args.requests // 5)))
+    results['rss client'] = {'peak_mb': round(resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024, 1)}
+    teardown()
+    return results
+
+
+def peak_rss_mb(pid):
+    """Peak RSS (VmHWM) of a process, from /proc; None where unavailable."""
+    try:
+        with open(f'/proc/{pid}/status') as f:
+            for line in f:
+                if line.startswith('VmHWM:'):
+                    return round(int(line.split()[1]) / 1024, 1)
+    except OSError:
+        pass
+    return None
+
+
+def child_pids(pid):
+    children = []
+    for entry in Path('/proc').iterdir():
+        if entry.name.isdigit():
+            try:
+                stat = (entry / 'stat').read_text()
+            except OSError:
+                continue
+            # The command name may hold spaces; the ppid follows the closing paren
+            if int(stat.rsplit(')', 1)[1].split()[1]) == pid:
+                children.append(int(entry.name))
+    return children
+
+
+def run_gunicorn(args):
+    """HTTP phase: gunicorn.conf.py per worker mode, concurrent keep-alive clients."""
+    from http_load import drive, gunicorn_server, mode_available, prepare_env
+
+    results = {}
+    with tempfile.TemporaryDirectory() as tmp:
+        env = prepare_env(tmp, args.rows, args.workers)
+        routes = [(name, path) for name, path in public_routes() if name not in ('metrics',)]
+        for mode in args.modes:
+            if not mode_available(mode):
+                continue
+            with gunicorn_server(env, mode) as (port, server):
+                for _, path in routes:
+                    stats = drive(port, path, args.concurrency, args.seconds)
+                    results[f'gunicorn {mode} GET {path}'] = {
+                        key: stats[key] for key in ('p50', 'p95', 'p99', 'rps', 'errors') if key in stats
+                    }
+                workers = [peak_rss_mb(pid) for pid in child_pids(server.pid)]
+                workers = [mb for mb in workers if mb is not None]
+                if workers:
+                    results[f'rss gunicorn {mode}'] = {
+                        'master_peak_mb': peak_rss_mb(server.pid), 'worker_peak_mb': max(workers),
+                    }
+    return results
+
+
+def regressions(baseline, current, threshold):
+    """Human-readable regressions of current against baseline."""
+    found = []
+    for key, metrics in current.items():
+        old_metrics = baseline.get(key)
+        if old_metrics is None:
+            continue
+        for metric, new in metrics.items():
+            old = old_metrics.get(metric)
+            if old is None or new is None or metric not in EXACT_METRICS + RELATIVE_METRICS:
+                continue
+            if metric == 'status':
+                worse = new != old
+            elif metric in EXACT_METRICS:
+                worse = new > old
+            elif metric == 'rps':
+                worse = new < old * (1 - threshold) and old - new > FLOORS['rps']
+            else:
+                floor = FLOORS['mb'] if metric.endswith('_mb') else FLOORS['ms']
+                worse = new > old * (1 + threshold) and new - old > floor
+            if worse:
+                found.append(f'{key}: {metric} {old} -> {new}')
+    return found
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--rows', type=int, default=200)
+    parser.add_argument('--images', type=int, default=2, help='images per case study')
+    parser.add_argument('--requests', type=int, default=30, help='test client requests per route')
+    parser.add_argument('--modes', nargs='+', default=['gthread'])
+    parser.add_argument('--workers', type=int, default=2)
+    parser.add_argument('--concurrency', type=int, default=8)
+    parser.add_argument('--seconds', type=float, default=3)
+    parser.add_argument('--no-gunicorn', action='store_true', help='Skip the HTTP phase')
+    parser.add_argument('--baseline', type=Path, default=DEFAULT_BASELINE)
+    # Timings of separate runs on one machine commonly differ by a third
+    parser.add_argument('--threshold', type=float, default=0.5, help='Allowed relative slowdown')
+    action = parser.add_mutually_exclusive_group()
+    action.add_argument('--update', action='store_true', help='Write the results as the new baseline')
+    action.add_argument('--check', action='store_true', help='Exit 1 when a metric regressed')
+    args = parser.parse_args()
+
+    meta = {'rows': args.rows, 'images': args.images, 'requests': args.requests, 'modes': args.modes}
+    if args.no_gunicorn:
+        meta['modes'] = []
+    results = run_client(args)
+    if not args.no_gunicorn:
+        results.update(run_gunicorn(args))
+
+    for key, metrics in results.items():
+        print(f'{key:<60} {metrics}')
+
+    if args.update or (not args.check and not args.baseline.exists()):
+        args.baseline.write_text(json.dumps({
+            'meta': {**meta, 'python': platform.python_version(), 'machine': platform.node(),
+                     'recorded_at': datetime.now(timezone.utc).isoformat(timespec='seconds')},
+            'results': results,
+        }, indent=2) + '\n')
+        print(f'Baseline written to {args.baseline}')
+        return
+    if not args.baseline.exists():
+        sys.exit(f'No baseline at {args.baseline}; run with --update first')
+    baseline = json.loads(args.baseline.read_text())
+    if any(baseline['meta'].get(k) != v for k, v in meta.items()):
+        sys.exit(f'Baseline was recorded with {baseline["meta"]}; rerun with the same options or --update')
+    found = regressions(baseline['results'], results, args.threshold)
+    if found:
+        print(f'{len(found)} regression(s) against {args.baseline}:')
+        for line in found:
+            print(f'  {line}')
+        if args.check:
+            sys.exit(1)
+    else:
+        print(f'No regressions against {args.baseline} (threshold {args.threshold:.0%})')
+
+
+if __name__ == '__main__':
+    main()
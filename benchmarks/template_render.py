@@ -0,0 +1,92 @@
+"""
+Template render cost per configuration: plain loaders, cached loader, and
+cached loader plus {% cache %} fragments.
+Usage: python benchmarks/template_render.py [--renders 10000]
+"""
+import argparse
+import copy
+import time
+
+from _django import setup
+
+LOADERS = [
+    'django.template.loaders.filesystem.Loader',
+    'django.template.loaders.app_directories.Loader',
+]
+LOCMEM = 'django.core.cache.backends.locmem.LocMemCache'
+DUMMY = 'django.core.cache.backends.dummy.DummyCache'
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--renders', type=int, default=10000)
+    args = parser.parse_args()
+
+    teardown = setup()
+    from django.conf import settings
+    from django.template.loader import render_to_string
+    from django.test import RequestFactory, override_settings
+    from django.urls import resolve
+
+    from portfolio.cache import CSRF_PLACEHOLDER
+    from portfolio.forms import ContactForm
+    from portfolio.models import CaseStudy
+
+    for i in range(6):
+        CaseStudy.objects.create(
+            title=f'Project {i}', summary='Summary', problem='Problem', solution='Solution',
+            tech_stack='Django, PostgreSQL, Redis', key_results='Results', order=i,
+        )
+    detail = CaseStudy.objects.published().first()
+
+    def request(path):
+        req = RequestFactory().get(path)
+        req.resolver_match = resolve(path)
+        return req
+
+    # Each page re-queries lazily, as the views do, so fragment hits also skip the DB
+    pages = {
+        'home.html': (request('/'), lambda: {
+            'case_studies': CaseStudy.objects.published()[:6],
+            'contact_form': ContactForm(),
+            'csrf_token': CSRF_PLACEHOLDER,
+        }),
+        'casestudy_list.html': (request('/projects/'), lambda: {
+            'case_studies': CaseStudy.objects.published(),
+        }),
+        'casestudy_detail.html': (request(f'/projects/{detail.slug}/'), lambda: {
+            'case_study': detail,
+        }),
+    }
+
+    def templates(loaders):
+        conf = copy.deepcopy(settings.TEMPLATES)
+        conf[0]['OPTIONS']['loaders'] = loaders
+        return conf
+
+    def caches(backend):
+        conf = copy.deepcopy(settings.CACHES)
+        conf['fragments'] = {'BACKEND': backend, 'TIMEOUT': None}
+        return conf
+
+    variants = (
+        ('plain loaders', templates(LOADERS), caches(DUMMY)),
+        ('cached loader', templates([('django.template.loaders.cached.Loader', LOADERS)]), caches(DUMMY)),
+        ('+ fragments', templates([('django.template.loaders.cached.Loader', LOADERS)]), caches(LOCMEM)),
+    )
+    for name, (req, context) in pages.items():
+        print(name)
+        for label, template_conf, cache_conf in variants:
+            with override_settings(TEMPLATES=template_conf, CACHES=cache_conf):
+                render_to_string(f'portfolio/{name}', context(), req)
+                start = time.perf_counter()
+                for _ in range(args.renders):
+                    render_to_string(f'portfolio/{name}', context(), req)
+                per_render = (time.perf_counter() - start) / args.renders
+            print(f'  {label:>14}: {per_render * 1e6:.1f} µs/render')
+
+    teardown()
+
+
+if __name__ == '__main__':
+    main()
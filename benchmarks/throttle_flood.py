@@ -0,0 +1,56 @@
+"""
+CPU spent under a flood of admin login and contact form POSTs from one IP,
+with throttling off and on.
+Usage: python benchmarks/throttle_flood.py [--requests 50]
+"""
+import argparse
+import logging
+import time
+
+from _django import setup
+
+
+def flood(client, url, data, n):
+    """POST `n` times; returns (CPU seconds, wall seconds, status code counts)."""
+    statuses = {}
+    cpu, wall = time.process_time(), time.perf_counter()
+    for _ in range(n):
+        code = client.post(url, data, REMOTE_ADDR='203.0.113.7').status_code
+        statuses[code] = statuses.get(code, 0) + 1
+    return time.process_time() - cpu, time.perf_counter() - wall, statuses
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--requests', type=int, default=50)
+    args = parser.parse_args()
+
+    teardown = setup()
+    # Each 429 is logged as a warning by django.request
+    logging.getLogger('django.request').setLevel(logging.ERROR)
+    from django.contrib.auth.models import User
+    from django.test import Client, override_settings
+
+    from portfolio.models import OutboxMessage, ThrottleBucket
+
+    User.objects.create_superuser('admin', 'admin@example.com', 'correct horse battery staple')
+    targets = (
+        ('admin login', '/admin/login/', {'username': 'admin', 'password': 'wrong'}),
+        ('contact form', '/', {'name': 'Bot', 'email': 'bot@example.com', 'message': 'spam ' * 20}),
+    )
+    for enabled in (False, True):
+        print(f'throttling {"on" if enabled else "off"}')
+        with override_settings(THROTTLE_ENABLED=enabled):
+            for label, url, data in targets:
+                ThrottleBucket.objects.all().delete()
+                outbox_before = OutboxMessage.objects.count()
+                cpu, wall, statuses = flood(Client(), url, data, args.requests)
+                queued = OutboxMessage.objects.count() - outbox_before
+                print(f'  {label:<13} {args.requests} POSTs: CPU {cpu:.2f}s, wall {wall:.2f}s, '
+                      f'statuses {statuses}, emails queued {queued}')
+
+    teardown()
+
+
+if __name__ == '__main__':
+    main()
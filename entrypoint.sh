@@ -1,8 +1,16 @@
 #!/bin/sh
 
-python manage.py collectstatic --noinput
-python manage.py migrate --noinput
+# Upgrade from the old single-file mount (./db.sqlite3:/app/db.sqlite3): copy
+# it to SQLITE_PATH once instead of starting on an empty database
+LEGACY_DB=/app/db.sqlite3
+if [ -n "$SQLITE_PATH" ] && [ "$SQLITE_PATH" != "$LEGACY_DB" ] && [ ! -e "$SQLITE_PATH" ] && [ -s "$LEGACY_DB" ]; then
+    echo "Copying $LEGACY_DB to $SQLITE_PATH" >&2
+    mkdir -p "$(dirname "$SQLITE_PATH")"
+    cp -p "$LEGACY_DB" "$SQLITE_PATH"
+fi
 
-python create_superuser.py
+# collectstatic, migrate and the superuser in one Django process; each step
+# is skipped when there is nothing to do
+python manage.py bootstrap
 
 exec "$@"
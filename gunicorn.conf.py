@@ -0,0 +1,59 @@
+"""
+Gunicorn configuration for bbotir.xyz.
+
+Usage: gunicorn -c gunicorn.conf.py
+Worker model is chosen with GUNICORN_WORKER_MODE:
+  gthread (default) - threaded workers; slow clients/SMTP don't block the process
+  sync              - classic one-request-per-worker
+  uvicorn           - ASGI via portfolio_project.asgi (pip install uvicorn-worker)
+"""
+import multiprocessing
+import os
+
+
+def _env_int(name, default):
+    value = os.environ.get(name)
+    return int(value) if value else default
+
+
+worker_mode = os.environ.get('GUNICORN_WORKER_MODE', 'gthread').lower()
+cpu_count = multiprocessing.cpu_count()
+
+bind = os.environ.get('GUNICORN_BIND', '0.0.0.0:8000')
+
+if worker_mode == 'uvicorn':
+    wsgi_app = 'portfolio_project.asgi:application'
+    worker_class = 'uvicorn_worker.UvicornWorker'
+    workers = _env_int('GUNICORN_WORKERS', cpu_count + 1)
+elif worker_mode == 'sync':
+    wsgi_app = 'portfolio_project.wsgi:application'
+    worker_class = 'sync'
+    workers = _env_int('GUNICORN_WORKERS', cpu_count * 2 + 1)
+else:
+    wsgi_app = 'portfolio_project.wsgi:application'
+    worker_class = 'gthread'
+    workers = _env_int('GUNICORN_WORKERS', cpu_count + 1)
+    threads = _env_int('GUNICORN_THREADS', 4)
+
+# Never exceed the cap (containers often report the host's CPU count)
+workers = min(workers, _env_int('GUNICORN_MAX_WORKERS', 8))
+
+# Load Django once in the master and fork workers from it
+preload_app = True
+
+# Recycle workers periodically; jitter avoids all restarting at once
+max_requests = _env_int('GUNICORN_MAX_REQUESTS', 1000)
+max_requests_jitter = _env_int('GUNICORN_MAX_REQUESTS_JITTER', 100)
+
+timeout = _env_int('GUNICORN_TIMEOUT', 30)
+graceful_timeout = _env_int('GUNICORN_GRACEFUL_TIMEOUT', 30)
+# Idle keep-alive seconds; short is fine behind a reverse proxy
+keepalive = _env_int('GUNICORN_KEEPALIVE', 5)
+
+# Heartbeat files on tmpfs so a slow disk can't make workers look hung
+if os.path.isdir('/dev/shm'):
+    worker_tmp_dir = '/dev/shm'
+
+accesslog = os.environ.get('GUNICORN_ACCESS_LOG', '-') or None
+errorlog = '-'
+loglevel = os.environ.get('GUNICORN_LOG_LEVEL', 'info')
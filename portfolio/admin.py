@@ -2,8 +2,15 @@
 Admin configuration for portfolio models.
 """
 from django.contrib import admin
+from django.utils import timezone
 from django.utils.html import format_html
-from .models import CaseStudy, CaseStudyImage
+from .cache import bump_content_version
+from .models import CaseStudy, CaseStudyImage, OutboxMessage, SlugHistory, Tech
+from .pagination import EstimatedCountPaginator
+
+
+def _case_studies(n):
+    return f'{n} case study' if n == 1 else f'{n} case studies'
 
 
 class CaseStudyImageInline(admin.TabularInline):
@@ -12,6 +19,17 @@ class CaseStudyImageInline(admin.TabularInline):
     fields = ('image', 'alt_text', 'order')
 
 
+class SlugHistoryInline(admin.TabularInline):
+    """Retired slugs that redirect here; delete one to let it 404 (or be reused)."""
+    model = SlugHistory
+    extra = 0
+    fields = ('slug', 'created_at')
+    readonly_fields = ('slug', 'created_at')
+
+    def has_add_permission(self, request, obj=None):
+        return False
+
+
 @admin.register(CaseStudy)
 class CaseStudyAdmin(admin.ModelAdmin):
     list_display = ('title', 'slug', 'is_published', 'order', 'updated_at')
@@ -20,7 +38,11 @@ class CaseStudyAdmin(admin.ModelAdmin):
     search_fields = ('title', 'summary', 'tech_stack')
     prepopulated_fields = {'slug': ('title',)}
     readonly_fields = ('created_at', 'updated_at')
-    inlines = [CaseStudyImageInline]
+    inlines = [CaseStudyImageInline, SlugHistoryInline]
+    # Skip the unfiltered COUNT(*) on every changelist page
+    show_full_result_count = False
+    paginator = EstimatedCountPaginator
+    actions = ['publish', 'unpublish', 'renumber']
     fieldsets = (
         (None, {
             'fields': ('title', 'slug', 'summary', 'is_published', 'order')
@@ -36,7 +58,67 @@ class CaseStudyAdmin(admin.ModelAdmin):
         }),
     )
 
+    # Bulk actions write in one statement and skip save() signals, so they
+    # bump the content version and updated_at themselves.
+
+    def _set_published(self, queryset, published):
+        updated = queryset.exclude(is_published=published).update(
+            is_published=published, updated_at=timezone.now()
+        )
+        if updated:
+            bump_content_version()
+        return updated
+
+    @admin.action(description='Publish selected case studies')
+    def publish(self, request, queryset):
+        updated = self._set_published(queryset, True)
+        self.message_user(request, f'{_case_studies(updated)} published.')
+
+    @admin.action(description='Unpublish selected case studies')
+    def unpublish(self, request, queryset):
+        updated = self._set_published(queryset, False)
+        self.message_user(request, f'{_case_studies(updated)} unpublished.')
+
+    @admin.action(description='Renumber order of selected (10, 20, 30…)')
+    def renumber(self, request, queryset):
+        now = timezone.now()
+        case_studies = list(queryset.order_by('order', '-created_at').only('pk', 'order'))
+        for i, cs in enumerate(case_studies, start=1):
+            cs.order = i * 10
+            cs.updated_at = now
+        CaseStudy.objects.bulk_update(case_studies, ['order', 'updated_at'], batch_size=500)
+        if case_studies:
+            bump_content_version()
+        self.message_user(request, f'{_case_studies(len(case_studies))} renumbered.')
+
 
 @admin.register(CaseStudyImage)
 class CaseStudyImageAdmin(admin.ModelAdmin):
     list_display = ('case_study', 'alt_text', 'order')
+    list_select_related = ('case_study',)
+    autocomplete_fields = ('case_study',)
+    show_full_result_count = False
+    paginator = EstimatedCountPaginator
+
+
+@admin.register(Tech)
+class TechAdmin(admin.ModelAdmin):
+    list_display = ('name',)
+    search_fields = ('name',)
+
+
+@admin.register(OutboxMessage)
+class OutboxMessageAdmin(admin.ModelAdmin):
+    list_display = ('subject', 'status', 'attempts', 'next_attempt_at', 'created_at', 'sent_at')
+    list_filter = ('status',)
+    search_fields = ('subject', 'to')
+    readonly_fields = ('created_at', 'sent_at', 'last_error')
+    actions = ['requeue']
+
+    @admin.action(description='Requeue selected messages')
+    def requeue(self, request, queryset):
+        # A message being sent is left to its worker (or retried when its claim expires)
+        updated = queryset.exclude(status__in=[OutboxMessage.STATUS_SENT, OutboxMessage.STATUS_SENDING]).update(
+            status=OutboxMessage.STATUS_PENDING, attempts=0, next_attempt_at=timezone.now()
+        )
+        self.message_user(request, f'{updated} message(s) requeued.')
@@ -3,26 +3,68 @@ Custom admin site with improved 2FA flow:
 1. Username/password login
 2. If first time: show QR code for setup
 3. If not first time: ask for 6-digit OTP code
+
+PortfolioAdminSite adds the metrics page. One of the two is admin.site,
+depending on ADMIN_2FA_ENABLED (see portfolio.apps).
 """
+import os
+
+from django.conf import settings
+from django.contrib.admin import AdminSite
+from django.contrib.admin.forms import AdminAuthenticationForm
 from django.contrib.admin.views.decorators import staff_member_required
 from django.shortcuts import redirect, render
 from django.utils.decorators import method_decorator
 from django.views.decorators.cache import never_cache
+from django_otp import login as otp_login
 from django_otp.admin import OTPAdminSite
-from django_otp.plugins.otp_totp.models import TOTPDevice
-from django_otp.util import random_hex
-import qrcode
-from io import BytesIO
-import base64
+from .metrics import registry
+from .throttle import client_ip, throttle, user_id
+from .two_factor import device_state, qr_svg
+
+
+class PortfolioAdminSite(AdminSite):
+    """Django's admin plus the performance metrics page."""
 
+    def get_urls(self):
+        from django.urls import path
+        return [
+            path('metrics/', self.admin_view(self.metrics_view), name='portfolio_metrics'),
+        ] + super().get_urls()
 
-class CustomOTPAdminSite(OTPAdminSite):
+    def metrics_view(self, request):
+        """Per-view request metrics recorded by PerformanceMiddleware (this worker)."""
+        if request.method == 'POST' and 'reset' in request.POST:
+            registry.reset()
+            return redirect('admin:portfolio_metrics')
+        context = {
+            **self.each_context(request),
+            'title': 'Performance metrics',
+            'rows': registry.summary(),
+            'worker_pid': os.getpid(),
+            'settings': {
+                'sample_rate': settings.METRICS_SAMPLE_RATE,
+                'slow_request_ms': settings.METRICS_SLOW_REQUEST_MS,
+                'slow_query_ms': settings.METRICS_SLOW_QUERY_MS,
+            },
+        }
+        return render(request, 'admin/portfolio_metrics.html', context)
+
+
+class CustomOTPAdminSite(PortfolioAdminSite, OTPAdminSite):
     """Custom admin site with improved 2FA flow."""
     
     login_template = 'admin/custom_login.html'
+    # Password only. OTPAdminSite's form wants the token on the same page,
+    # before a first-time user could ever reach setup-2fa/ to get one.
+    login_form = AdminAuthenticationForm
+
+    def __init__(self, name='admin'):
+        # OTPAdminSite defaults to 'otpadmin'; the views reverse 'admin:...'
+        super().__init__(name)
     
     def get_urls(self):
-        """Add custom URLs for 2FA setup and verification."""
+        """Add custom URLs for 2FA setup/verification."""
         from django.urls import path
         urls = super().get_urls()
         
@@ -32,6 +74,7 @@ class CustomOTPAdminSite(OTPAdminSite):
         ]
         return custom_urls + urls
     
+    # Throttled where it is mounted (portfolio_project.urls)
     @method_decorator(never_cache)
     def login(self, request, extra_context=None):
         """
@@ -44,7 +87,10 @@ class CustomOTPAdminSite(OTPAdminSite):
         if request.method == 'GET':
             # If already logged in and verified, redirect to admin
             if request.user.is_authenticated and request.user.is_verified():
-                return redirect(self.index(request))
+                return redirect('admin:index')
+            # Password already checked: go straight to the code step
+            if request.user.is_authenticated and request.user.is_staff:
+                return self._otp_step(request)
             # Show login form
             return super().login(request, extra_context)
         
@@ -55,71 +101,40 @@ class CustomOTPAdminSite(OTPAdminSite):
         # After successful login, check for 2FA
         # The user should be authenticated at this point if login succeeded
         if request.user.is_authenticated:
-            # Check if user has confirmed TOTP device
-            has_confirmed_device = TOTPDevice.objects.filter(
-                user=request.user,
-                confirmed=True
-            ).exists()
-            
-            if not has_confirmed_device:
-                # First time: redirect to QR code setup
-                return redirect('admin:setup_2fa')
-            else:
-                # Not first time: redirect to OTP verification
-                return redirect('admin:verify_otp')
+            return self._otp_step(request)
         
         # If login failed, return the response (which will show errors)
         return response
-    
-    def get_urls(self):
-        """Add custom URLs for 2FA setup and verification."""
-        urls = super().get_urls()
-        from django.urls import path
-        
-        custom_urls = [
-            path('setup-2fa/', self.setup_2fa_view, name='setup_2fa'),
-            path('verify-otp/', self.verify_otp_view, name='verify_otp'),
-        ]
-        return custom_urls + urls
+
+    def _otp_step(self, request):
+        # Check if user has confirmed TOTP device
+        if device_state(request.user, request).confirmed is None:
+            # First time: redirect to QR code setup
+            return redirect('admin:setup_2fa')
+        # Not first time: redirect to OTP verification
+        return redirect('admin:verify_otp')
     
     @method_decorator(staff_member_required)
     @method_decorator(never_cache)
+    @method_decorator(throttle(('otp_ip', client_ip), ('otp_user', user_id)))
     def setup_2fa_view(self, request):
         """Show QR code for first-time 2FA setup."""
-        # Check if already has confirmed device
-        has_confirmed = TOTPDevice.objects.filter(
-            user=request.user,
-            confirmed=True
-        ).exists()
-        
-        if has_confirmed:
+        # One query for all of the user's devices
+        state = device_state(request.user, request)
+        if state.confirmed is not None:
             return redirect('admin:verify_otp')
         
-        # Get or create TOTP device
-        device, created = TOTPDevice.objects.get_or_create(
-            user=request.user,
-            name='default',
-            defaults={'key': random_hex(20), 'confirmed': False}
-        )
-        
-        # Generate QR code
+        device = state.setup_device()
         config_url = device.config_url
-        qr = qrcode.QRCode(version=1, box_size=10, border=5)
-        qr.add_data(config_url)
-        qr.make(fit=True)
-        
-        img = qr.make_image(fill_color="black", back_color="white")
-        buffer = BytesIO()
-        img.save(buffer, format='PNG')
-        qr_data = base64.b64encode(buffer.getvalue()).decode()
         
         if request.method == 'POST':
             # Verify the code
             token = request.POST.get('token', '')
             if device.verify_token(token):
-                device.confirmed = True
-                device.save()
-                return redirect(self.index(request))
+                state.confirm(device)
+                # Mark the session as verified for OTPMiddleware
+                otp_login(request, device)
+                return redirect('admin:index')
             else:
                 error = 'Invalid code. Please try again.'
         else:
@@ -129,7 +144,8 @@ class CustomOTPAdminSite(OTPAdminSite):
             **self.each_context(request),
             'title': 'Set up Two-Factor Authentication',
             'device': device,
-            'qr_data': qr_data,
+            # Inline SVG markup (not base64 PNG), rendered once per provisioning URL
+            'qr_svg': qr_svg(config_url),
             'config_url': config_url,
             'error': error,
         }
@@ -137,27 +153,27 @@ class CustomOTPAdminSite(OTPAdminSite):
     
     @method_decorator(staff_member_required)
     @method_decorator(never_cache)
+    @method_decorator(throttle(('otp_ip', client_ip), ('otp_user', user_id)))
     def verify_otp_view(self, request):
         """Verify OTP code for existing users."""
         # Check if user has confirmed device
-        device = TOTPDevice.objects.filter(
-            user=request.user,
-            confirmed=True
-        ).first()
+        device = device_state(request.user, request).confirmed
         
         if not device:
             return redirect('admin:setup_2fa')
         
         # If already verified, redirect to admin
         if request.user.is_verified():
-            return redirect(self.index(request))
+            return redirect('admin:index')
         
         error = None
         if request.method == 'POST':
             token = request.POST.get('token', '')
             if device.verify_token(token):
-                # Device verification handled by middleware
-                return redirect(self.index(request))
+                # OTPMiddleware only reads the verified device from the
+                # session; without this the user is sent back here
+                otp_login(request, device)
+                return redirect('admin:index')
             else:
                 error = 'Invalid code. Please try again.'
         
@@ -168,9 +184,3 @@ class CustomOTPAdminSite(OTPAdminSite):
             'error': error,
         }
         return render(request, 'admin/verify_otp.html', context)
-
-
-# Create custom admin site instance
-admin_site = CustomOTPAdminSite(name='admin')
-admin_site.site_header = 'bbotir.xyz Admin'
-admin_site.site_title = 'Portfolio Admin'
@@ -0,0 +1,173 @@
+"""
+Read-only JSON API for published case studies.
+
+  GET /api/projects/?fields=slug,title&limit=20&cursor=...
+  GET /api/projects/<slug>/?fields=...
+
+Rows are read with `.values()` (no model instances) and the list is
+keyset-paginated on (order, created_at, id), so every page costs one indexed
+query. Responses carry ETag / Last-Modified and are cached per content
+version like the HTML pages. `url` fields are canonical https://SITE_DOMAIN
+links; `next` / `previous` are relative.
+"""
+from functools import wraps
+from urllib.parse import urlencode
+
+from django.core.serializers.json import DjangoJSONEncoder
+from django.http import JsonResponse
+from django.urls import reverse
+
+from .cache import cache_public_page
+from .conditional import cached_published_validators, case_study_validators, conditional_page
+from .models import CASE_STUDY_ORDERING, CaseStudy, CaseStudyImage, split_tech_stack
+from .pagination import InvalidCursor, KeysetPaginator
+from .seo import site_url
+from .slugs import resolve_slug, slug_redirect
+
+MODEL_FIELDS = (
+    'slug', 'title', 'summary', 'problem', 'solution', 'tech_stack', 'key_results',
+    'github_link', 'demo_link', 'order', 'created_at', 'updated_at',
+)
+# Computed fields and the model fields they are built from
+DERIVED_FIELDS = {'url': ('slug',), 'tech': ('tech_stack',), 'images': ('id',)}
+FIELDS = MODEL_FIELDS + tuple(DERIVED_FIELDS)
+DEFAULT_FIELDS = ('slug', 'title', 'summary', 'tech', 'url', 'updated_at')
+DEFAULT_LIMIT = 20
+MAX_LIMIT = 100
+# Query parameters the list reads (and is page-cached by)
+LIST_QUERY = ('fields', 'limit', 'cursor')
+
+
+class APIError(Exception):
+    def __init__(self, message, status=400):
+        super().__init__(message)
+        self.status = status
+
+
+def _json(data, status=200):
+    return JsonResponse(data, status=status, encoder=DjangoJSONEncoder, json_dumps_params={'ensure_ascii': False})
+
+
+def api_view(view_func):
+    """Turn APIError into a JSON error response."""
+    @wraps(view_func)
+    def wrapper(request, *args, **kwargs):
+        try:
+            return view_func(request, *args, **kwargs)
+        except APIError as exc:
+            return _json({'error': str(exc)}, status=exc.status)
+    return wrapper
+
+
+def requested_fields(request):
+    raw = request.GET.get('fields')
+    if not raw:
+        return DEFAULT_FIELDS
+    fields = tuple(dict.fromkeys(f.strip() for f in raw.split(',') if f.strip()))
+    unknown = [f for f in fields if f not in FIELDS]
+    if unknown or not fields:
+        raise APIError(f'Unknown field(s): {", ".join(unknown) or raw}. Available: {", ".join(FIELDS)}')
+    return fields
+
+
+def _columns(fields, extra=()):
+    """Model columns to select for the requested fields (plus any needed for paging)."""
+    columns = []
+    for field in fields:
+        columns.extend(DERIVED_FIELDS.get(field, (field,)))
+    return tuple(dict.fromkeys((*columns, *extra)))
+
+
+def _image_map(pks):
+    """{case study pk: [image dicts]} with one query for the whole page."""
+    images = {}
+    rows = (
+        CaseStudyImage.objects.filter(case_study_id__in=pks)
+        .exclude(image='')
+        .order_by('case_study_id', 'order')
+        .values('case_study_id', 'image', 'alt_text', 'width', 'height')
+    )
+    storage = CaseStudyImage._meta.get_field('image').storage
+    for row in rows:
+        images.setdefault(row['case_study_id'], []).append({
+            'url': site_url(storage.url(row['image'])),
+            'alt': row['alt_text'],
+            'width': row['width'],
+            'height': row['height'],
+        })
+    return images
+
+
+def serialize(rows, fields):
+    """Shape `.values()` rows into the requested fields."""
+    images = _image_map([row['id'] for row in rows]) if 'images' in fields else {}
+    # Reverse once; slugs never contain the '/' that follows them
+    prefix, suffix = reverse('portfolio:casestudy_detail', args=['slug']).rsplit('slug', 1)
+    items = []
+    for row in rows:
+        item = {}
+        for field in fields:
+            if field == 'url':
+                item[field] = site_url(f'{prefix}{row["slug"]}{suffix}')
+            elif field == 'tech':
+                item[field] = split_tech_stack(row['tech_stack'])
+            elif field == 'images':
+                item[field] = images.get(row['id'], [])
+            else:
+                item[field] = row[field]
+        items.append(item)
+    return items
+
+
+def _page_url(request, cursor):
+    """Relative URL of a neighbouring page (cached responses must not depend on the Host)."""
+    if cursor is None:
+        return None
+    # Only the parameters the page is cached by (LIST_QUERY)
+    params = {name: request.GET[name] for name in LIST_QUERY if name in request.GET}
+    params['cursor'] = cursor
+    return f'{request.path}?{urlencode(params)}'
+
+
+def _limit(request):
+    try:
+        limit = int(request.GET.get('limit', DEFAULT_LIMIT))
+    except ValueError:
+        raise APIError('limit must be an integer')
+    return max(1, min(limit, MAX_LIMIT))
+
+
+@conditional_page(cached_published_validators)
+@cache_public_page(query=LIST_QUERY)
+@api_view
+def project_list(request):
+    """Published case studies, keyset-paginated: {"results": [...], "next": url, "previous": url}."""
+    fields = requested_fields(request)
+    rows = CaseStudy.objects.filter(is_published=True).values(*_columns(fields, extra=('id', 'order', 'created_at')))
+    paginator = KeysetPaginator(rows, _limit(request), CASE_STUDY_ORDERING)
+    try:
+        page = paginator.page(request.GET.get('cursor'))
+    except InvalidCursor as exc:
+        raise APIError(str(exc))
+    return _json({
+        'results': serialize(page.object_list, fields),
+        'next': _page_url(request, page.next_cursor),
+        'previous': _page_url(request, page.previous_cursor),
+    })
+
+
+@conditional_page(case_study_validators)
+@cache_public_page(query=('fields',))
+@api_view
+def project_detail(request, slug):
+    """One published case study; retired slugs redirect."""
+    fields = requested_fields(request)
+    found = resolve_slug(slug)
+    if found is None:
+        raise APIError('Not found', status=404)
+    if found[1] != slug:
+        return slug_redirect(request, 'portfolio:api_project_detail', found[1])
+    row = CaseStudy.objects.filter(pk=found[0]).values(*_columns(fields, extra=('id',))).first()
+    if row is None:
+        raise APIError('Not found', status=404)
+    return _json(serialize([row], fields)[0])
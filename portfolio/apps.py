@@ -1,7 +1,25 @@
 from django.apps import AppConfig
+from django.conf import settings
+from django.contrib.admin import apps as admin_apps
 
 
 class PortfolioConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'portfolio'
     verbose_name = 'Portfolio'
+
+    def ready(self):
+        from . import db, metrics, signals  # noqa: F401
+
+
+class PortfolioAdminConfig(admin_apps.AdminConfig):
+    """django.contrib.admin, with the two-factor site as admin.site when ADMIN_2FA_ENABLED is on."""
+
+    # Listed explicitly in INSTALLED_APPS; PortfolioConfig stays the app default
+    default = False
+
+    @property
+    def default_site(self):
+        if getattr(settings, 'ADMIN_2FA_ENABLED', False):
+            return 'portfolio.admin_custom.CustomOTPAdminSite'
+        return 'portfolio.admin_custom.PortfolioAdminSite'
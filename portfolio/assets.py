@@ -0,0 +1,492 @@
+"""
+Front-end asset pipeline: minified CSS/JS bundles, per-page critical CSS and
+preload hints.
+
+collectstatic (portfolio.staticfiles.AssetPipelineStorage) writes
+
+  portfolio/css/main.min.css            minified main.css
+  portfolio/js/main.min.js              minified main.js
+  portfolio/css/critical/<page>.css     rules used above the fold of <page>
+
+before hashing and compressing everything. Critical CSS is picked from the
+templates rather than rendered pages, so the build needs no database: the
+markup of base.html before `{% block content %}` plus the first element of the
+page's content block decides which selectors are kept.
+
+At runtime {% page_styles %} inlines the page's critical CSS and loads the full
+bundle without blocking render; EarlyHintsMiddleware sends the same hints as
+`Link:` headers, which a proxy or CDN can turn into 103 Early Hints. With
+DEBUG, or before collectstatic has run, pages link main.css / main.js as usual.
+"""
+import functools
+import re
+from html.parser import HTMLParser
+
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction
+from django.conf import settings
+from django.utils.html import format_html, format_html_join
+from django.utils.safestring import mark_safe
+
+CSS_SOURCE = 'portfolio/css/main.css'
+JS_SOURCE = 'portfolio/js/main.js'
+CSS_BUNDLE = 'portfolio/css/main.min.css'
+JS_BUNDLE = 'portfolio/js/main.min.js'
+BASE_TEMPLATE = 'portfolio/base.html'
+# URL name -> template whose first screen gets inlined critical CSS
+CRITICAL_PAGES = {
+    'home': 'portfolio/home.html',
+    'casestudy_list': 'portfolio/casestudy_list.html',
+    'casestudy_list_all': 'portfolio/casestudy_list.html',
+    'casestudy_detail': 'portfolio/casestudy_detail.html',
+}
+FONT_STYLESHEET = (
+    'https://fonts.googleapis.com/css2?family=Syne:wght@400;500;600;700;800'
+    '&family=DM+Sans:ital,opsz,wght@0,9..40,300;0,9..40,400;0,9..40,500;0,9..40,600;0,9..40,700'
+    '&family=JetBrains+Mono:wght@400;500&display=swap'
+)
+FONT_ORIGINS = ('https://fonts.googleapis.com', 'https://fonts.gstatic.com')
+
+# Conditional group rules hold rules; other at-rules with a block (@keyframes,
+# @font-face) are kept or dropped as a whole
+GROUP_AT_RULES = ('@media', '@supports', '@container', '@layer', '@document')
+COMMENT_RE = re.compile(r'("(?:\\.|[^"\\])*"|\'(?:\\.|[^\'\\])*\')|/\*.*?\*/', re.S)
+STRING_RE = re.compile(r'("(?:\\.|[^"\\])*"|\'(?:\\.|[^\'\\])*\')')
+PSEUDO_RE = re.compile(r'::?[\w-]+(?:\((?:[^()]|\([^()]*\))*\))?')
+ATTRIBUTE_RE = re.compile(r'\[\s*([\w-]+)[^\]]*\]')
+CLASS_RE = re.compile(r'\.(-?[_a-zA-Z][\w-]*)')
+ID_RE = re.compile(r'#(-?[_a-zA-Z][\w-]*)')
+TAG_RE = re.compile(r'(?<![\w-])([a-zA-Z][\w-]*)')
+TEMPLATE_TAG_RE = re.compile(r'{%.*?%}|{#.*?#}', re.S)
+TEMPLATE_VAR_RE = re.compile(r'{{.*?}}', re.S)
+CONTENT_BLOCK_RE = re.compile(r'{%\s*block\s+content\s*%}')
+INCLUDE_RE = re.compile(r'{%\s*include\s+["\']([^"\']+)["\'][^%]*%}')
+VOID_ELEMENTS = {
+    'area', 'base', 'br', 'col', 'embed', 'hr', 'img', 'input', 'link', 'meta', 'source', 'track', 'wbr',
+}
+
+
+def critical_name(page):
+    return f'portfolio/css/critical/{page}.css'
+
+
+# ----- CSS -----
+
+def _outside_strings(text, func):
+    """Apply func to the parts of text that are not quoted strings."""
+    parts = STRING_RE.split(text)
+    return ''.join(part if i % 2 else func(part) for i, part in enumerate(parts))
+
+
+def _split(text, sep):
+    """Split on sep outside strings and brackets."""
+    parts, depth, quote, start = [], 0, None, 0
+    for i, ch in enumerate(text):
+        if quote:
+            if ch == quote and text[i - 1] != '\\':
+                quote = None
+        elif ch in '"\'':
+            quote = ch
+        elif ch in '([':
+            depth += 1
+        elif ch in ')]':
+            depth -= 1
+        elif ch == sep and depth == 0:
+            parts.append(text[start:i])
+            start = i + 1
+    parts.append(text[start:])
+    return parts
+
+
+def _closing_brace(css, i):
+    depth, quote = 0, None
+    for j in range(i, len(css)):
+        ch = css[j]
+        if quote:
+            if ch == quote and css[j - 1] != '\\':
+                quote = None
+        elif ch in '"\'':
+            quote = ch
+        elif ch == '{':
+            depth += 1
+        elif ch == '}':
+            depth -= 1
+            if depth == 0:
+                return j
+    return len(css)
+
+
+def parse_css(css):
+    """
+    CSS as a list of (prelude, body): body is None for statements (@import …;),
+    a list of nodes for group rules (@media, @supports…) and the text between
+    the braces otherwise.
+    """
+    return _parse(COMMENT_RE.sub(lambda m: m.group(1) or '', css), 0)[0]
+
+
+def _parse(css, i):
+    nodes, start, parens, quote = [], i, 0, None
+    while i < len(css):
+        ch = css[i]
+        if quote:
+            if ch == quote and css[i - 1] != '\\':
+                quote = None
+        elif ch in '"\'':
+            quote = ch
+        elif ch == '(':
+            parens += 1
+        elif ch == ')':
+            parens -= 1
+        elif parens:
+            pass
+        elif ch == ';':
+            if css[start:i].strip():
+                nodes.append((css[start:i].strip(), None))
+            start = i + 1
+        elif ch == '{':
+            prelude = css[start:i].strip()
+            if prelude.lower().startswith(GROUP_AT_RULES):
+                children, i = _parse(css, i + 1)
+                nodes.append((prelude, children))
+            else:
+                end = _closing_brace(css, i)
+                nodes.append((prelude, css[i + 1:end]))
+                i = end + 1
+            start = i
+            continue
+        elif ch == '}':
+            return nodes, i + 1
+        i += 1
+    return nodes, i
+
+
+def _minify_prelude(prelude):
+    def squeeze(text):
+        text = re.sub(r'\s+', ' ', text)
+        if prelude.startswith('@'):
+            # @media (min-width: 640px) -> (min-width:640px); the space before
+            # `(` stays (`and(` is a function token). Selectors keep `a :hover`.
+            return re.sub(r'\s*([,:])\s*|(\()\s+|\s+(\))', lambda m: m.group(m.lastindex), text)
+        return re.sub(r'\s*([,>~+])\s*', r'\1', text)
+    return _outside_strings(prelude, squeeze).strip()
+
+
+def _minify_value(value):
+    def squeeze(text):
+        text = re.sub(r'\s+', ' ', text)
+        text = re.sub(r'\s*,\s*', ',', text)
+        text = re.sub(r'(?<![\w.#-])0\.(\d)', r'.\1', text)
+        return re.sub(r'\s*!\s*important', '!important', text)
+    return _outside_strings(value, squeeze).strip()
+
+
+def declarations(body):
+    """[(property, value)] of a declaration block."""
+    result = []
+    for declaration in _split(body, ';'):
+        prop, sep, value = declaration.partition(':')
+        if sep and prop.strip() and value.strip():
+            result.append((prop.strip(), value))
+    return result
+
+
+def serialize(nodes):
+    """Minified CSS for parsed nodes."""
+    out = []
+    for prelude, body in nodes:
+        if body is None:
+            out.append(_minify_prelude(prelude) + ';')
+        elif isinstance(body, list):
+            inner = serialize(body)
+            if inner:
+                out.append(f'{_minify_prelude(prelude)}{{{inner}}}')
+        elif '{' in STRING_RE.sub('""', body):
+            # @keyframes and friends hold a list of rules
+            out.append(f'{_minify_prelude(prelude)}{{{serialize(parse_css(body))}}}')
+        else:
+            block = ';'.join(f'{prop}:{_minify_value(value)}' for prop, value in declarations(body))
+            if block:
+                out.append(f'{_minify_prelude(prelude)}{{{block}}}')
+    return ''.join(out)
+
+
+def minify_css(css):
+    return serialize(parse_css(css))
+
+
+# ----- JS -----
+
+def minify_js(js):
+    """
+    Conservative JS minifier: drops indentation, blank lines and comments that
+    fill whole lines, and keeps line breaks so automatic semicolon insertion is
+    untouched. /*! … */ licence comments are kept.
+    """
+    lines, in_comment = [], False
+    for line in js.splitlines():
+        stripped = line.strip()
+        if in_comment:
+            in_comment = '*/' not in stripped
+            continue
+        if stripped.startswith('/*') and not stripped.startswith('/*!'):
+            in_comment = '*/' not in stripped
+            continue
+        if not stripped or stripped.startswith('//'):
+            continue
+        lines.append(stripped)
+    return '\n'.join(lines) + '\n'
+
+
+# ----- Critical CSS -----
+
+class Usage(HTMLParser):
+    """
+    Tags, classes, ids and attribute names in markup. With first_element_only,
+    collection stops when the first top-level element closes.
+    """
+
+    def __init__(self, first_element_only=False):
+        super().__init__(convert_charrefs=True)
+        self.tags, self.classes, self.ids, self.attributes = set(), set(), set(), set()
+        self.first_element_only = first_element_only
+        self.depth = 0
+        self.done = False
+
+    def handle_starttag(self, tag, attrs):
+        if self.done:
+            return
+        self.tags.add(tag)
+        for name, value in attrs:
+            self.attributes.add(name)
+            if name == 'class' and value:
+                self.classes.update(value.split())
+            elif name == 'id' and value:
+                self.ids.add(value)
+        if tag not in VOID_ELEMENTS:
+            self.depth += 1
+
+    def handle_endtag(self, tag):
+        if self.done or tag in VOID_ELEMENTS:
+            return
+        self.depth -= 1
+        if self.first_element_only and self.depth <= 0:
+            self.done = True
+
+    def update(self, other):
+        self.tags |= other.tags
+        self.classes |= other.classes
+        self.ids |= other.ids
+        self.attributes |= other.attributes
+
+    def uses(self, selector):
+        """Whether every class, id, attribute and tag the selector names occurs in the markup."""
+        bare = PSEUDO_RE.sub(' ', selector)
+        if not all(name in self.attributes for name in ATTRIBUTE_RE.findall(bare)):
+            return False
+        bare = ATTRIBUTE_RE.sub(' ', bare)
+        if not all(name in self.classes for name in CLASS_RE.findall(bare)):
+            return False
+        if not all(name in self.ids for name in ID_RE.findall(bare)):
+            return False
+        bare = ID_RE.sub(' ', CLASS_RE.sub(' ', bare))
+        return all(name.lower() in self.tags for name in TAG_RE.findall(bare))
+
+
+def _markup(source):
+    """Template source as plain markup: tags removed, variables replaced by a placeholder word."""
+    return TEMPLATE_VAR_RE.sub('x', TEMPLATE_TAG_RE.sub(' ', source))
+
+
+def _template_source(name):
+    """Source of a template with its literal {% include %}s expanded in place."""
+    from django.template.loader import get_template
+
+    source = get_template(name).template.source
+    return INCLUDE_RE.sub(lambda m: _template_source(m[1]), source)
+
+
+def _included(name):
+    """Templates name includes by a literal name, recursively."""
+    from django.template.loader import get_template
+
+    names = INCLUDE_RE.findall(get_template(name).template.source)
+    return [n for included in names for n in (included, *_included(included))]
+
+
+def above_the_fold(template_name):
+    """Usage of base.html up to the content block plus the first element of the page's content."""
+    usage = Usage()
+    usage.feed(_markup(CONTENT_BLOCK_RE.split(_template_source(BASE_TEMPLATE), 1)[0]))
+    parts = CONTENT_BLOCK_RE.split(_template_source(template_name), 1)
+    if len(parts) == 2:
+        content = Usage(first_element_only=True)
+        content.feed(_markup(parts[1]))
+        usage.update(content)
+    return usage
+
+
+def critical_css(css, usage):
+    """Minified subset of css whose selectors occur in usage, plus the @keyframes they animate with."""
+    nodes = _critical_nodes(parse_css(css), usage)
+    animations = set()
+    _collect_animations(nodes, animations)
+    return serialize(_with_keyframes(nodes, parse_css(css), animations))
+
+
+def _critical_nodes(nodes, usage):
+    kept = []
+    for prelude, body in nodes:
+        if body is None or prelude.startswith('@'):
+            # Statements (@import) would block rendering again; keyframes are
+            # added back when used; group rules are filtered recursively
+            if isinstance(body, list):
+                children = _critical_nodes(body, usage)
+                if children:
+                    kept.append((prelude, children))
+            elif prelude.lower().startswith('@font-face'):
+                kept.append((prelude, body))
+            continue
+        selectors = [s.strip() for s in _split(prelude, ',') if usage.uses(s)]
+        if selectors:
+            kept.append((','.join(selectors), body))
+    return kept
+
+
+def _collect_animations(nodes, names):
+    for prelude, body in nodes:
+        if isinstance(body, list):
+            _collect_animations(body, names)
+        elif isinstance(body, str) and '{' not in body:
+            for prop, value in declarations(body):
+                if prop.lower() in ('animation', 'animation-name'):
+                    names.update(re.findall(r'[\w-]+', value))
+
+
+def _with_keyframes(kept, nodes, names):
+    keyframes = [
+        (prelude, body) for prelude, body in nodes
+        if prelude.lower().startswith(('@keyframes', '@-webkit-keyframes')) and prelude.split()[-1] in names
+    ]
+    return kept + keyframes
+
+
+def build(css, js):
+    """{static path: text} of everything the pipeline writes."""
+    built = {CSS_BUNDLE: minify_css(css), JS_BUNDLE: minify_js(js)}
+    for page, template_name in CRITICAL_PAGES.items():
+        built[critical_name(page)] = critical_css(css, above_the_fold(template_name))
+    return built
+
+
+def template_paths():
+    """Files the critical CSS depends on besides the stylesheet."""
+    from django.template.loader import get_template
+
+    pages = {BASE_TEMPLATE, *CRITICAL_PAGES.values()}
+    names = sorted(pages.union(*(_included(name) for name in pages)))
+    return [get_template(name).origin.name for name in names]
+
+
+# ----- Runtime -----
+
+def pipeline_enabled():
+    return not settings.DEBUG and getattr(settings, 'ASSET_PIPELINE_ENABLED', True)
+
+
+@functools.cache
+def built_asset(name):
+    """Text of a file collectstatic's pipeline wrote, or None when it hasn't run."""
+    from django.contrib.staticfiles.storage import staticfiles_storage
+
+    try:
+        with staticfiles_storage.open(name) as f:
+            return f.read().decode()
+    except OSError:
+        return None
+
+
+def _built(name):
+    return pipeline_enabled() and built_asset(name) is not None
+
+
+def stylesheet_url():
+    from django.templatetags.static import static
+
+    return static(CSS_BUNDLE if _built(CSS_BUNDLE) else CSS_SOURCE)
+
+
+def script_url():
+    from django.templatetags.static import static
+
+    return static(JS_BUNDLE if _built(JS_BUNDLE) else JS_SOURCE)
+
+
+def stylesheet_tags(page):
+    """
+    Font and stylesheet markup for <head>. Pages with critical CSS get it
+    inline and load the full stylesheet asynchronously; others link it.
+    """
+    fonts = format_html(
+        '{}<link rel="stylesheet" href="{}" media="print" onload="this.media=\'all\'">'
+        '<noscript><link rel="stylesheet" href="{}"></noscript>',
+        format_html_join('', '<link rel="preconnect" href="{}"{}>', (
+            (origin, mark_safe(' crossorigin') if origin != FONT_ORIGINS[0] else '') for origin in FONT_ORIGINS
+        )),
+        FONT_STYLESHEET, FONT_STYLESHEET,
+    )
+    url = stylesheet_url()
+    critical = built_asset(critical_name(page)) if page in CRITICAL_PAGES and pipeline_enabled() else None
+    if critical is None:
+        return format_html('{}<link rel="stylesheet" href="{}">', fonts, url)
+    # A `</` in a CSS string must not close the <style> element
+    return format_html(
+        '{}<style>{}</style>'
+        '<link rel="preload" href="{}" as="style" onload="this.onload=null;this.rel=\'stylesheet\'">'
+        '<noscript><link rel="stylesheet" href="{}"></noscript>',
+        fonts, mark_safe(critical.replace('</', '<\\/')), url, url,
+    )
+
+
+@functools.cache
+def _link_header(stylesheet, script):
+    links = [f'<{origin}>; rel=preconnect' + ('; crossorigin' if origin != FONT_ORIGINS[0] else '')
+             for origin in FONT_ORIGINS]
+    links += [f'<{stylesheet}>; rel=preload; as=style', f'<{script}>; rel=preload; as=script']
+    return ', '.join(links)
+
+
+def link_header():
+    """`Link:` value announcing the stylesheet, script and font origins."""
+    return _link_header(stylesheet_url(), script_url())
+
+
+class EarlyHintsMiddleware:
+    """
+    Add preload / preconnect `Link:` headers to HTML pages. Proxies and CDNs
+    with Early Hints support replay them as a 103 response before the page is
+    ready; other browsers still start the fetches on the headers alone.
+    """
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        if iscoroutinefunction(self.get_response):
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        if iscoroutinefunction(self):
+            return self.__acall__(request)
+        return self.add_links(self.get_response(request))
+
+    async def __acall__(self, request):
+        return self.add_links(await self.get_response(request))
+
+    def add_links(self, response):
+        if (
+            response.status_code == 200
+            and response.get('Content-Type', '').startswith('text/html')
+            and not response.has_header('Link')
+        ):
+            response['Link'] = link_header()
+        return response
@@ -0,0 +1,102 @@
+"""
+Async versions of the public views, used when served over ASGI.
+
+They share templates, caching and conditional-GET decorators with
+portfolio.views; the ORM is used through its async API and contact emails
+go to the outbox without blocking the event loop.
+"""
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.contrib import messages
+from django.http import Http404
+from django.shortcuts import render, redirect
+
+from .cache import CSRF_PLACEHOLDER, cache_public_page
+from .conditional import (
+    cached_published_validators, case_study_validators, conditional_page, published_validators,
+)
+from .cv import serve_cv
+from .forms import ContactForm
+from .models import CASE_STUDY_CARD_FIELDS, CASE_STUDY_ORDERING, CaseStudy
+from .outbox import aenqueue_mail
+from .pagination import InvalidCursor, KeysetPaginator
+from .slugs import resolve_slug, slug_redirect
+from .streaming import STREAM_CHUNK_SIZE, astream_template
+from .throttle import client_ip, throttle
+
+
+@throttle(('contact', client_ip))
+@conditional_page(published_validators)
+@cache_public_page
+async def home(request):
+    """Landing page: hero, skills, projects preview, experience, contact."""
+    form = ContactForm(request.POST or None)
+    if request.method == 'POST' and form.is_valid():
+        name = form.cleaned_data['name']
+        email = form.cleaned_data['email']
+        message = form.cleaned_data['message']
+        await aenqueue_mail(
+            subject=f'[bbotir.xyz] Contact from {name}',
+            message=f"From: {name} <{email}>\n\n{message}",
+            from_email=settings.DEFAULT_FROM_EMAIL,
+            recipient_list=[settings.CONTACT_EMAIL],
+            reply_to=email,
+        )
+        messages.success(request, 'Message sent. I\'ll get back to you soon.')
+        return redirect('portfolio:home')
+    cards = CaseStudy.objects.filter(is_published=True).only(*CASE_STUDY_CARD_FIELDS)
+    context = {
+        'case_studies': [cs async for cs in cards[:6]],
+        'contact_form': form,
+        'csrf_token': CSRF_PLACEHOLDER,
+    }
+    return render(request, 'portfolio/home.html', context)
+
+
+@conditional_page(published_validators)
+@cache_public_page(query=('cursor',))
+async def casestudy_list(request):
+    """List published case studies, keyset-paginated (?cursor=)."""
+    queryset = CaseStudy.objects.filter(is_published=True).only(*CASE_STUDY_CARD_FIELDS)
+    paginator = KeysetPaginator(queryset, settings.CASE_STUDIES_PER_PAGE, CASE_STUDY_ORDERING)
+    try:
+        page = await paginator.apage(request.GET.get('cursor'))
+    except InvalidCursor:
+        raise Http404('Invalid page')
+    context = {'case_studies': page.object_list, 'page_obj': page, 'is_paginated': page.has_other_pages()}
+    return render(request, 'portfolio/casestudy_list.html', context)
+
+
+@conditional_page(cached_published_validators)
+async def casestudy_list_all(request):
+    """Every published case study on one page, streamed in chunks straight from the cursor."""
+    rows = (
+        CaseStudy.objects.filter(is_published=True)
+        .order_by(*CASE_STUDY_ORDERING)
+        .values('slug', 'title', 'summary')
+        .aiterator(chunk_size=STREAM_CHUNK_SIZE)
+    )
+    return astream_template(
+        request, 'portfolio/casestudy_list.html', {}, rows, 'portfolio/includes/casestudy_cards.html', 'case_studies',
+    )
+
+
+@conditional_page(case_study_validators)
+@cache_public_page
+async def casestudy_detail(request, slug):
+    """Single case study detail page, read by pk; retired slugs redirect."""
+    found = await sync_to_async(resolve_slug)(slug)
+    if found is None:
+        raise Http404('No case study found matching the query')
+    if found[1] != slug:
+        return slug_redirect(request, 'portfolio:casestudy_detail', found[1])
+    try:
+        case_study = await CaseStudy.objects.published().aget(pk=found[0])
+    except CaseStudy.DoesNotExist:
+        raise Http404('No case study found matching the query')
+    return render(request, 'portfolio/casestudy_detail.html', {'case_study': case_study})
+
+
+async def cv_download(request):
+    """Serve CV PDF; the file body is read in worker threads."""
+    return serve_cv(request, asynchronous=True)
@@ -0,0 +1,192 @@
+"""
+Versioned page cache for the public portfolio pages.
+
+Cached pages are keyed by path, the query parameters the view reads and a
+content version counter. The counter is bumped whenever a CaseStudy or
+CaseStudyImage is saved or deleted (see portfolio.signals), so admin edits are
+visible immediately. Both live in the separate 'state' cache: the page cache
+culls entries once it is full, and a culled counter would start over and bring
+old pages back.
+"""
+import time
+from datetime import datetime, timezone
+from functools import partial, wraps
+from urllib.parse import urlencode
+
+from asgiref.sync import iscoroutinefunction, sync_to_async
+from django.conf import settings
+from django.contrib.messages import get_messages
+from django.core.cache import cache, caches
+from django.http import HttpResponse
+from django.middleware.csrf import get_token
+
+CONTENT_VERSION_KEY = 'portfolio:content_version'
+CONTENT_CHANGED_KEY = 'portfolio:content_changed'
+PAGE_KEY_PREFIX = 'portfolio:page'
+STATS_HITS_KEY = 'portfolio:page_cache:hits'
+STATS_MISSES_KEY = 'portfolio:page_cache:misses'
+
+# Rendered in place of the CSRF token in cached pages and swapped for the
+# visitor's own token on every response.
+CSRF_PLACEHOLDER = '__PORTFOLIO_CSRF_TOKEN__'
+
+
+def _initial_version():
+    # Milliseconds rather than 1: if the counter is ever lost it restarts
+    # above every version used before, never on one with pages still cached
+    return int(time.time() * 1000)
+
+
+def get_content_version():
+    """Current content version."""
+    state = caches['state']
+    version = state.get(CONTENT_VERSION_KEY)
+    if version is None:
+        state.add(CONTENT_VERSION_KEY, _initial_version(), None)
+        version = state.get(CONTENT_VERSION_KEY)
+    return version
+
+
+def get_content_changed():
+    """When the content last changed (the last version bump), as an aware datetime."""
+    state = caches['state']
+    changed = state.get(CONTENT_CHANGED_KEY)
+    if changed is None:
+        # Unknown: say "now", so clients revalidate rather than keep stale pages
+        state.add(CONTENT_CHANGED_KEY, time.time(), None)
+        changed = state.get(CONTENT_CHANGED_KEY)
+    return datetime.fromtimestamp(changed, tz=timezone.utc)
+
+
+def bump_content_version():
+    """Invalidate all cached pages by moving to a new content version."""
+    state = caches['state']
+    state.set(CONTENT_CHANGED_KEY, time.time(), None)
+    try:
+        return state.incr(CONTENT_VERSION_KEY)
+    except ValueError:
+        version = _initial_version()
+        state.set(CONTENT_VERSION_KEY, version, None)
+        return version
+
+
+def page_cache_key(request, query=()):
+    """Key for the page at request.path with only the `query` parameters the view reads."""
+    params = urlencode(sorted((name, request.GET[name]) for name in query if name in request.GET))
+    return f'{PAGE_KEY_PREFIX}:{get_content_version()}:{request.path}?{params}'
+
+
+def page_cache_stats():
+    """Return hit/miss counters for the page cache."""
+    hits = cache.get(STATS_HITS_KEY, 0)
+    misses = cache.get(STATS_MISSES_KEY, 0)
+    total = hits + misses
+    return {
+        'hits': hits,
+        'misses': misses,
+        'hit_ratio': hits / total if total else 0.0,
+    }
+
+
+def _count(key):
+    try:
+        cache.incr(key)
+    except ValueError:
+        cache.add(key, 0, None)
+        try:
+            cache.incr(key)
+        except ValueError:
+            pass
+
+
+def _is_cacheable(request):
+    if not getattr(settings, 'PAGE_CACHE_ENABLED', True):
+        return False
+    if request.method not in ('GET', 'HEAD'):
+        return False
+    # Signed-in users may see pages differently (admin links, drafts)
+    if getattr(request, 'user', None) is not None and request.user.is_authenticated:
+        return False
+    # Pages with pending flash messages are per-visitor; render them fresh.
+    if len(get_messages(request)):
+        return False
+    return True
+
+
+def _fill_csrf(request, response):
+    """Replace the CSRF placeholder with the visitor's token."""
+    if getattr(response, 'streaming', False):
+        return response
+    if getattr(response, 'is_rendered', True) is False:
+        response.add_post_render_callback(lambda r: _fill_csrf(request, r))
+        return response
+    placeholder = CSRF_PLACEHOLDER.encode()
+    if placeholder in response.content:
+        response.content = response.content.replace(
+            placeholder, get_token(request).encode()
+        )
+    return response
+
+
+def _lookup(request, query):
+    """Return (cache key, cached response or None), counting the hit or miss."""
+    key = page_cache_key(request, query)
+    cached = cache.get(key)
+    if cached is None:
+        _count(STATS_MISSES_KEY)
+        return key, None
+    _count(STATS_HITS_KEY)
+    content, content_type = cached
+    response = HttpResponse(content, content_type=content_type)
+    response['X-Page-Cache'] = 'HIT'
+    return key, response
+
+
+def _store(key, response):
+    if hasattr(response, 'render') and callable(response.render):
+        response = response.render()
+    if response.status_code == 200 and not getattr(response, 'streaming', False):
+        cache.set(
+            key,
+            (response.content, response['Content-Type']),
+            getattr(settings, 'PAGE_CACHE_TIMEOUT', 60 * 60 * 24),
+        )
+    response['X-Page-Cache'] = 'MISS'
+    return response
+
+
+def cache_public_page(view_func=None, *, query=()):
+    """
+    Serve anonymous GET/HEAD requests from the versioned page cache.
+
+    Only the query parameters named in `query` are part of the cache key, so
+    arbitrary query strings can't fill the cache with copies of a page; use
+    ``@cache_public_page(query=('cursor',))`` for views that read any.
+
+    Views that render ``{% csrf_token %}`` should pass CSRF_PLACEHOLDER as
+    ``csrf_token`` in their context; it is swapped for a real token here.
+    Works with both sync and async views.
+    """
+    if view_func is None:
+        return partial(cache_public_page, query=query)
+    if iscoroutinefunction(view_func):
+        async def wrapper(request, *args, **kwargs):
+            # request.user and the message storage may load the session from the DB
+            if not await sync_to_async(_is_cacheable)(request):
+                return _fill_csrf(request, await view_func(request, *args, **kwargs))
+            # File-based cache I/O: keep it off the event loop
+            key, response = await sync_to_async(_lookup, thread_sensitive=False)(request, query)
+            if response is None:
+                response = await view_func(request, *args, **kwargs)
+                response = await sync_to_async(_store, thread_sensitive=False)(key, response)
+            return _fill_csrf(request, response)
+    else:
+        def wrapper(request, *args, **kwargs):
+            if not _is_cacheable(request):
+                return _fill_csrf(request, view_func(request, *args, **kwargs))
+            key, response = _lookup(request, query)
+            if response is None:
+                response = _store(key, view_func(request, *args, **kwargs))
+            return _fill_csrf(request, response)
+
+    return wraps(view_func)(wrapper)
@@ -0,0 +1,109 @@
+"""
+Conditional GET (ETag / Last-Modified / 304) for the public portfolio pages.
+
+Validators come from one aggregate query over published case studies plus
+the content version, so a matching client gets a 304 before any template is
+rendered. Last-Modified is the time of the last version bump rather than
+max(updated_at), which doesn't move when a case study is deleted or
+unpublished or only its images change.
+"""
+import hashlib
+from functools import wraps
+
+from asgiref.sync import iscoroutinefunction, sync_to_async
+from django.conf import settings
+from django.contrib.messages import get_messages
+from django.core.cache import cache
+from django.db.models import Count
+from django.utils.cache import get_conditional_response, patch_cache_control
+from django.utils.http import http_date, quote_etag
+
+from .cache import get_content_changed, get_content_version
+from .models import CaseStudy
+from .slugs import resolve_slug
+
+VALIDATORS_KEY_PREFIX = 'portfolio:validators'
+
+
+def _validators(queryset):
+    agg = queryset.aggregate(count=Count('id', distinct=True), images=Count('images'))
+    if not agg['count']:
+        return None, None
+    raw = f'{get_content_version()}:{agg["count"]}:{agg["images"]}'
+    # Weak: pages embed a per-visitor CSRF token, so bytes may differ
+    etag = 'W/' + quote_etag(hashlib.md5(raw.encode()).hexdigest())
+    return etag, get_content_changed()
+
+
+def published_validators(request, *args, **kwargs):
+    """Validators for pages listing all published case studies."""
+    return _validators(CaseStudy.objects.filter(is_published=True))
+
+
+def cached_published_validators(request, *args, **kwargs):
+    """published_validators, memoised in the cache per content version (no query on a hit)."""
+    return cache.get_or_set(
+        f'{VALIDATORS_KEY_PREFIX}:{get_content_version()}:published',
+        lambda: published_validators(request),
+        settings.PAGE_CACHE_TIMEOUT,
+    )
+
+
+def case_study_validators(request, slug=None, **kwargs):
+    """Validators for a single published case study (none for retired slugs, which redirect)."""
+    found = resolve_slug(slug)
+    if found is None or found[1] != slug:
+        return None, None
+    return _validators(CaseStudy.objects.filter(pk=found[0]))
+
+
+def _conditional_response(request, validators):
+    etag, last_modified = validators
+    timestamp = int(last_modified.timestamp()) if last_modified else None
+    return get_conditional_response(request, etag=etag, last_modified=timestamp)
+
+
+def _add_validators(response, validators):
+    etag, last_modified = validators
+    if response.status_code in (200, 304) and etag:
+        response.headers.setdefault('ETag', etag)
+        response.headers.setdefault('Last-Modified', http_date(int(last_modified.timestamp())))
+        # Let browsers keep the page but revalidate on each visit
+        patch_cache_control(response, no_cache=True)
+    return response
+
+
+def _skip(request):
+    return request.method not in ('GET', 'HEAD') or len(get_messages(request))
+
+
+def conditional_page(validators_func):
+    """
+    Answer GET/HEAD with 304 when the client's validators still match.
+
+    Requests with pending flash messages always get a full response. Works
+    with both sync and async views.
+    """
+    def decorator(view_func):
+        if iscoroutinefunction(view_func):
+            async def wrapper(request, *args, **kwargs):
+                if _skip(request):
+                    return await view_func(request, *args, **kwargs)
+                validators = await sync_to_async(validators_func)(request, *args, **kwargs)
+                response = _conditional_response(request, validators)
+                if response is None:
+                    response = await view_func(request, *args, **kwargs)
+                return _add_validators(response, validators)
+        else:
+            def wrapper(request, *args, **kwargs):
+                if _skip(request):
+                    return view_func(request, *args, **kwargs)
+                validators = validators_func(request, *args, **kwargs)
+                response = _conditional_response(request, validators)
+                if response is None:
+                    response = view_func(request, *args, **kwargs)
+                return _add_validators(response, validators)
+
+        return wraps(view_func)(wrapper)
+
+    return decorator
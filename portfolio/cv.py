@@ -0,0 +1,170 @@
+"""
+CV file serving helpers: cached stat/validators, byte ranges and proxy offload.
+"""
+import asyncio
+import os
+import re
+import time
+from pathlib import Path
+
+from django.conf import settings
+from django.http import FileResponse, Http404, HttpResponse, StreamingHttpResponse
+from django.utils.cache import get_conditional_response, patch_cache_control
+from django.utils.http import content_disposition_header, http_date, quote_etag
+
+CHUNK_SIZE = 64 * 1024
+RANGE_RE = re.compile(r'^bytes=(\d*)-(\d*)$')
+
+_stat_cache = {}
+
+
+def cv_path():
+    return Path(getattr(
+        settings, 'CV_PATH', Path(settings.BASE_DIR) / 'static' / 'cv' / 'Botir_Bakhtiyarov_CV.pdf'
+    ))
+
+
+def cv_stat(path):
+    """
+    Return (size, mtime, etag) for `path`, or None if it does not exist.
+
+    Results are kept in process memory for CV_STAT_TTL seconds so repeated
+    downloads don't touch the filesystem.
+    """
+    ttl = getattr(settings, 'CV_STAT_TTL', 60)
+    now = time.monotonic()
+    cached = _stat_cache.get(path)
+    if cached and now - cached[0] < ttl:
+        return cached[1]
+    try:
+        st = os.stat(path)
+    except FileNotFoundError:
+        info = None
+    else:
+        mtime = int(st.st_mtime)
+        info = (st.st_size, mtime, quote_etag(f'{mtime:x}-{st.st_size:x}'))
+    _stat_cache[path] = (now, info)
+    return info
+
+
+def parse_range(header, size):
+    """
+    Parse a single `bytes=` range. Returns (start, end) inclusive, None to
+    serve the whole file, or False if the range can't be satisfied.
+    """
+    match = RANGE_RE.match(header.strip())
+    if not match:
+        # Multiple or malformed ranges: ignore and send the full body
+        return None
+    first, last = match.groups()
+    if not first and not last:
+        return None
+    if not first:
+        length = int(last)
+        if length == 0:
+            return False
+        return max(size - length, 0), size - 1
+    start = int(first)
+    end = min(int(last), size - 1) if last else size - 1
+    if start >= size or start > end:
+        return False
+    return start, end
+
+
+def _iter_range(path, start, length):
+    with open(path, 'rb') as fh:
+        fh.seek(start)
+        while length > 0:
+            chunk = fh.read(min(CHUNK_SIZE, length))
+            if not chunk:
+                break
+            length -= len(chunk)
+            yield chunk
+
+
+async def _aiter_range(path, start, length):
+    """Async variant of _iter_range: file reads run in a worker thread."""
+    fh = await asyncio.to_thread(open, path, 'rb')
+    try:
+        await asyncio.to_thread(fh.seek, start)
+        while length > 0:
+            chunk = await asyncio.to_thread(fh.read, min(CHUNK_SIZE, length))
+            if not chunk:
+                break
+            length -= len(chunk)
+            yield chunk
+    finally:
+        fh.close()
+
+
+def offload_response(path):
+    """
+    Hand the file to the front proxy (nginx X-Accel-Redirect or Apache/Caddy
+    X-Sendfile) according to CV_SENDFILE_MODE, or return None.
+    """
+    mode = getattr(settings, 'CV_SENDFILE_MODE', '')
+    if mode == 'x-accel':
+        response = HttpResponse()
+        prefix = getattr(settings, 'CV_ACCEL_REDIRECT_PREFIX', '/protected/cv/')
+        response['X-Accel-Redirect'] = prefix + path.name
+        return response
+    if mode == 'x-sendfile':
+        response = HttpResponse()
+        response['X-Sendfile'] = str(path)
+        return response
+    return None
+
+
+def file_response(request, path, size, etag, mtime, asynchronous=False):
+    """
+    Serve `path` from Python, honouring Range / If-Range. With
+    `asynchronous=True` the body is an async iterator (for ASGI).
+    """
+    byte_range = None
+    range_header = request.headers.get('Range')
+    if range_header and request.method in ('GET', 'HEAD'):
+        if_range = request.headers.get('If-Range')
+        if not if_range or if_range in (etag, http_date(mtime)):
+            byte_range = parse_range(range_header, size)
+
+    if byte_range is False:
+        response = HttpResponse(status=416)
+        response['Content-Range'] = f'bytes */{size}'
+        return response
+    if byte_range:
+        start, end = byte_range
+        length = end - start + 1
+        iter_range = _aiter_range if asynchronous else _iter_range
+        response = StreamingHttpResponse(iter_range(path, start, length), status=206)
+        response['Content-Range'] = f'bytes {start}-{end}/{size}'
+        response['Content-Length'] = str(length)
+        return response
+    if asynchronous:
+        response = StreamingHttpResponse(_aiter_range(path, 0, size))
+        response['Content-Length'] = str(size)
+        return response
+    return FileResponse(open(path, 'rb'))
+
+
+def serve_cv(request, asynchronous=False):
+    """Full /cv/ response: 304, offload, range or whole file, with caching headers."""
+    path = cv_path()
+    info = cv_stat(path)
+    if info is None:
+        raise Http404('CV not found. Add your PDF to static/cv/Botir_Bakhtiyarov_CV.pdf')
+    size, mtime, etag = info
+
+    response = get_conditional_response(request, etag=etag, last_modified=mtime)
+    if response is None:
+        response = offload_response(path) or file_response(
+            request, path, size, etag, mtime, asynchronous=asynchronous
+        )
+        response['Content-Type'] = 'application/pdf'
+        response['Content-Disposition'] = content_disposition_header(
+            as_attachment=True, filename='Botir_Bakhtiyarov_CV.pdf'
+        )
+    response['ETag'] = etag
+    response['Last-Modified'] = http_date(mtime)
+    response['Accept-Ranges'] = 'bytes'
+    patch_cache_control(response, public=True, max_age=settings.CV_CACHE_MAX_AGE)
+    return response
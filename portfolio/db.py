@@ -0,0 +1,16 @@
+"""
+Database connection tuning applied when DB_PROFILE=tuned.
+"""
+from django.conf import settings
+from django.db.backends.signals import connection_created
+from django.dispatch import receiver
+
+
+@receiver(connection_created)
+def configure_sqlite(sender, connection, **kwargs):
+    """Enable WAL and friends so readers don't block on the outbox/admin writer."""
+    if connection.vendor != 'sqlite' or getattr(settings, 'DB_PROFILE', 'default') != 'tuned':
+        return
+    with connection.cursor() as cursor:
+        for name, value in getattr(settings, 'SQLITE_PRAGMAS', {}).items():
+            cursor.execute(f'PRAGMA {name}={value}')
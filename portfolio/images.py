@@ -0,0 +1,148 @@
+"""
+Responsive image derivatives for CaseStudyImage.
+
+Each uploaded image is resized to a set of widths and re-encoded as
+AVIF (when Pillow supports it), WebP and JPEG. EXIF data is dropped, and the
+intrinsic size plus a tiny blurred placeholder are stored on the model.
+Transparency is kept in AVIF and WebP; JPEG is flattened onto white.
+"""
+import base64
+import os
+from io import BytesIO
+
+from django.core.files.base import ContentFile
+from django.core.files.storage import default_storage
+
+DERIVATIVE_WIDTHS = (480, 800, 1200, 1600)
+PLACEHOLDER_WIDTH = 16
+
+FORMATS = {
+    # format key: (Pillow format, extension, MIME type, save options)
+    'avif': ('AVIF', 'avif', 'image/avif', {'quality': 55}),
+    'webp': ('WEBP', 'webp', 'image/webp', {'quality': 78, 'method': 4}),
+    'jpeg': ('JPEG', 'jpg', 'image/jpeg', {'quality': 82, 'optimize': True, 'progressive': True}),
+}
+
+
+def available_formats():
+    """Derivative formats supported by the installed Pillow, best first."""
+    from PIL import features
+
+    formats = []
+    if features.check('avif'):
+        formats.append('avif')
+    if features.check('webp'):
+        formats.append('webp')
+    formats.append('jpeg')
+    return formats
+
+
+def derivative_widths(original_width):
+    """Target widths for an image: the standard steps below its own width."""
+    widths = [w for w in DERIVATIVE_WIDTHS if w < original_width]
+    widths.append(min(original_width, DERIVATIVE_WIDTHS[-1]))
+    return widths
+
+
+def derivative_name(source_name, width, fmt):
+    stem = os.path.splitext(source_name)[0]
+    return f'{stem}-{width}w.{FORMATS[fmt][1]}'
+
+
+def _flatten(img):
+    """img without an alpha channel: transparent areas become white."""
+    from PIL import Image
+
+    if img.mode != 'RGBA':
+        return img
+    flat = Image.new('RGB', img.size, (255, 255, 255))
+    flat.paste(img, mask=img.getchannel('A'))
+    return flat
+
+
+def _encode(img, fmt):
+    pil_format, _, _, options = FORMATS[fmt]
+    if fmt == 'jpeg':
+        img = _flatten(img)
+    buffer = BytesIO()
+    # Saving without an `exif` argument strips the original metadata
+    img.save(buffer, format=pil_format, **options)
+    return buffer.getvalue()
+
+
+def _placeholder(img):
+    from PIL import Image, ImageFilter
+
+    height = max(1, round(img.height * PLACEHOLDER_WIDTH / img.width))
+    tiny = img.resize((PLACEHOLDER_WIDTH, height), Image.Resampling.BILINEAR)
+    tiny = _flatten(tiny).filter(ImageFilter.GaussianBlur(1))
+    buffer = BytesIO()
+    tiny.save(buffer, format='JPEG', quality=40)
+    return 'data:image/jpeg;base64,' + base64.b64encode(buffer.getvalue()).decode()
+
+
+def build_derivatives(source_name, storage=None):
+    """
+    Generate derivatives for the stored image `source_name`.
+
+    Returns a dict of CaseStudyImage field values: width, height, placeholder
+    and derivatives ({'source': name, 'formats': {fmt: [[width, name], ...]}}).
+    """
+    # Pillow is only needed when an upload is processed; keep it out of startup
+    from PIL import Image, ImageOps
+
+    storage = storage or default_storage
+    with storage.open(source_name, 'rb') as fh:
+        img = Image.open(fh)
+        img = ImageOps.exif_transpose(img)
+        has_alpha = img.mode in ('RGBA', 'LA', 'PA') or 'transparency' in img.info
+        img = img.convert('RGBA' if has_alpha else 'RGB')
+
+    # Written next to any current files (the storage picks a free name), which
+    # the caller removes only once the row points at the new ones
+    formats = {}
+    try:
+        for width in derivative_widths(img.width):
+            height = max(1, round(img.height * width / img.width))
+            resized = img if width == img.width else img.resize((width, height), Image.Resampling.LANCZOS)
+            for fmt in available_formats():
+                # The storage may rename (e.g. content-hashed media names)
+                name = storage.save(derivative_name(source_name, width, fmt), ContentFile(_encode(resized, fmt)))
+                formats.setdefault(fmt, []).append([width, name])
+    except Exception:
+        delete_derivatives({'formats': formats}, storage)
+        raise
+
+    return {
+        'width': img.width,
+        'height': img.height,
+        'placeholder': _placeholder(img),
+        'derivatives': {'source': source_name, 'formats': formats},
+    }
+
+
+def derivative_files(derivatives):
+    """File names listed in a CaseStudyImage.derivatives dict."""
+    return {name for entries in (derivatives or {}).get('formats', {}).values() for _, name in entries}
+
+
+def delete_derivatives(derivatives, storage=None, keep=None):
+    """Remove the files listed in a CaseStudyImage.derivatives dict that `keep` (another one) doesn't list."""
+    storage = storage or default_storage
+    for name in derivative_files(derivatives) - derivative_files(keep):
+        if storage.exists(name):
+            storage.delete(name)
+
+
+# Field values for an image whose derivatives couldn't be built: the template
+# falls back to the original, and needs_derivatives() stays true for a retry
+NO_DERIVATIVES = {'width': None, 'height': None, 'placeholder': '', 'derivatives': {}}
+
+
+def process_image(pk, source_name):
+    """Process-pool entry point: build derivatives for one image."""
+    import django
+    from django.apps import apps
+    if not apps.ready:
+        django.setup()
+    return pk, build_derivatives(source_name)
@@ -0,0 +1,129 @@
+"""
+Management command run by entrypoint.sh on every container start.
+Usage: python manage.py bootstrap [--static-only] [--profile]
+
+Collects static files, applies migrations and creates the superuser from
+DJANGO_SUPERUSER_USERNAME / _EMAIL / _PASSWORD, all in one process. Each step
+is skipped when there is nothing to do: collectstatic when the source files
+match the fingerprint stored next to the manifest, migrate when the
+migration plan is empty.
+"""
+import hashlib
+import os
+import time
+from contextlib import contextmanager
+
+from django.conf import settings
+from django.contrib.staticfiles import finders
+from django.core.management import call_command
+from django.core.management.base import BaseCommand
+from django.db import DEFAULT_DB_ALIAS, connections
+from django.db.migrations.executor import MigrationExecutor
+
+from portfolio import assets
+
+FINGERPRINT_NAME = '.bootstrap-fingerprint'
+MANIFEST_NAME = 'staticfiles.json'
+# collectstatic's default ignore patterns
+IGNORE_PATTERNS = ['CVS', '.*', '*~']
+
+
+def static_fingerprint():
+    """
+    Hash of every static source file's (path, size, mtime) plus the storage
+    backend and the templates critical CSS is extracted from.
+    """
+    digest = hashlib.sha256(settings.STORAGES['staticfiles']['BACKEND'].encode())
+    entries = []
+    for finder in finders.get_finders():
+        for path, storage in finder.list(IGNORE_PATTERNS):
+            st = os.stat(storage.path(path))
+            entries.append(f'{path}\0{st.st_size}\0{st.st_mtime_ns}')
+    for path in assets.template_paths():
+        st = os.stat(path)
+        entries.append(f'{path}\0{st.st_size}\0{st.st_mtime_ns}')
+    for entry in sorted(entries):
+        digest.update(entry.encode())
+        digest.update(b'\n')
+    return digest.hexdigest()
+
+
+def pending_migrations(database=DEFAULT_DB_ALIAS):
+    executor = MigrationExecutor(connections[database])
+    return executor.migration_plan(executor.loader.graph.leaf_nodes())
+
+
+class Command(BaseCommand):
+    help = 'Idempotent container start-up: collectstatic, migrate and create the superuser when needed'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--static-only', action='store_true',
+                            help='Only collect static files (e.g. at image build time, without a database)')
+        parser.add_argument('--profile', action='store_true', help='Print the time spent in each step')
+
+    def handle(self, *args, **options):
+        self.timings = []
+        with self.phase('collectstatic'):
+            self.collect_static()
+        if not options['static_only']:
+            with self.phase('migrate'):
+                self.migrate()
+            with self.phase('superuser'):
+                self.create_superuser()
+        if options['profile']:
+            for name, seconds in self.timings:
+                self.stdout.write(f'{name:<14} {seconds * 1000:8.1f} ms')
+
+    @contextmanager
+    def phase(self, name):
+        start = time.perf_counter()
+        yield
+        self.timings.append((name, time.perf_counter() - start))
+
+    def collect_static(self):
+        root = settings.STATIC_ROOT
+        fingerprint_path = os.path.join(root, FINGERPRINT_NAME)
+        fingerprint = static_fingerprint()
+        try:
+            with open(fingerprint_path) as fh:
+                unchanged = fh.read().strip() == fingerprint
+        except FileNotFoundError:
+            unchanged = False
+        if unchanged and os.path.exists(os.path.join(root, MANIFEST_NAME)):
+            self.stdout.write('Static files unchanged; skipping collectstatic.')
+            return
+        call_command('collectstatic', interactive=False, verbosity=0)
+        with open(fingerprint_path, 'w') as fh:
+            fh.write(fingerprint)
+        self.stdout.write(self.style.SUCCESS('Collected static files.'))
+
+    def migrate(self):
+        database = settings.DATABASES[DEFAULT_DB_ALIAS]
+        if database['ENGINE'] == 'django.db.backends.sqlite3' and not os.path.exists(database['NAME']):
+            self.stdout.write(self.style.WARNING(
+                f"No database at {database['NAME']}; creating an empty one. "
+                'If you had data in ./db.sqlite3, stop and move it into ./data/ (see README).'
+            ))
+        plan = pending_migrations()
+        if not plan:
+            self.stdout.write('No migrations to apply.')
+            return
+        call_command('migrate', interactive=False, verbosity=0)
+        self.stdout.write(self.style.SUCCESS(f'Applied {len(plan)} migration(s).'))
+
+    def create_superuser(self):
+        from django.contrib.auth import get_user_model
+
+        username = os.environ.get('DJANGO_SUPERUSER_USERNAME')
+        password = os.environ.get('DJANGO_SUPERUSER_PASSWORD')
+        if not (username and password):
+            self.stdout.write('Superuser env variables not set; skipping.')
+            return
+        User = get_user_model()
+        if User.objects.filter(username=username).exists():
+            self.stdout.write('Superuser already exists.')
+            return
+        User.objects.create_superuser(
+            username=username, email=os.environ.get('DJANGO_SUPERUSER_EMAIL', ''), password=password
+        )
+        self.stdout.write(self.style.SUCCESS(f'Created superuser {username}.'))
@@ -0,0 +1,51 @@
+"""
+Management command to export case studies as JSONL (see portfolio.transfer).
+Usage: python manage.py export_case_studies [--output projects.jsonl] [--published] [--media-url URL]
+
+Rows are streamed with .iterator(), so memory use does not grow with the table.
+"""
+import json
+import sys
+import time
+
+from django.core.management.base import BaseCommand
+from django.db.models import Prefetch
+
+from portfolio.models import CaseStudy, CaseStudyImage
+from portfolio.transfer import to_record
+
+
+class Command(BaseCommand):
+    help = 'Export case studies and their image references to JSONL'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--output', default='-', help='Output file (default: stdout)')
+        parser.add_argument('--chunk-size', type=int, default=500, help='Rows fetched per database round trip')
+        parser.add_argument('--published', action='store_true', help='Only published case studies')
+        parser.add_argument('--media-url', default='',
+                            help='Prefix for image paths, e.g. https://bbotir.xyz/media/ (default: paths relative to MEDIA_ROOT)')
+
+    def handle(self, *args, **options):
+        queryset = CaseStudy.objects.order_by('pk').prefetch_related(
+            Prefetch('images', queryset=CaseStudyImage.objects.order_by('order'))
+        )
+        if options['published']:
+            queryset = queryset.filter(is_published=True)
+
+        out = sys.stdout if options['output'] == '-' else open(options['output'], 'w', encoding='utf-8')
+        start = time.perf_counter()
+        count = 0
+        try:
+            for case_study in queryset.iterator(chunk_size=options['chunk_size']):
+                out.write(json.dumps(to_record(case_study, options['media_url']), ensure_ascii=False))
+                out.write('\n')
+                count += 1
+        finally:
+            if out is not sys.stdout:
+                out.close()
+
+        elapsed = time.perf_counter() - start
+        # Keep stdout clean for the JSONL stream
+        self.stderr.write(self.style.SUCCESS(
+            f'Exported {count} case stud{"y" if count == 1 else "ies"} ({count / elapsed:.0f} rows/s).'
+        ))
@@ -0,0 +1,144 @@
+"""
+Management command to render the public site into a precompressed static tree.
+Usage: python manage.py export_static [--output dist] [--force]
+
+Pages are rendered through the real URLconf and views. A manifest records the
+content key of every page so unchanged pages are skipped on the next run.
+"""
+import json
+import re
+import shutil
+from pathlib import Path
+
+from django.conf import settings
+from django.core.files.storage import default_storage
+from django.core.management.base import BaseCommand, CommandError
+from django.db.models import Count, Max
+from django.test import Client, override_settings
+from django.urls import reverse
+from whitenoise.compress import Compressor
+
+from portfolio.models import CaseStudy, CaseStudyImage
+from portfolio.seo import sitemap_sections
+
+MANIFEST_NAME = '.export-manifest.json'
+# Bump when exported pages change shape, so --force isn't needed after upgrading
+EXPORT_FORMAT = 2
+CSRF_INPUT_RE = re.compile(rb'<input type="hidden" name="csrfmiddlewaretoken" value="[^"]*">')
+
+
+class Command(BaseCommand):
+    help = 'Export home, /projects/, every case study page, the sitemap and feed to static files with gzip/brotli siblings'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--output', default=str(Path(settings.BASE_DIR) / 'dist'), help='Output directory')
+        parser.add_argument('--force', action='store_true', help='Re-render every page (e.g. after template changes)')
+
+    def handle(self, *args, **options):
+        out = Path(options['output'])
+        out.mkdir(parents=True, exist_ok=True)
+        manifest_path = out / MANIFEST_NAME
+        old_manifest = {} if options['force'] or not manifest_path.exists() else json.loads(manifest_path.read_text())
+        self.compressor = Compressor(quiet=True)
+        self.client = Client(HTTP_HOST=settings.SITE_DOMAIN)
+
+        manifest = {}
+        rendered = skipped = 0
+        # Pages rendered for the static tree differ (no ?cursor= links), so
+        # neither read nor fill the live page cache
+        with override_settings(STATIC_EXPORT=True, PAGE_CACHE_ENABLED=False):
+            for url, key in self.page_keys():
+                manifest[url] = key
+                target = self.page_file(out, url)
+                if old_manifest.get(url) == key and target.exists():
+                    skipped += 1
+                    continue
+                self.render_page(url, target)
+                rendered += 1
+
+        # Remove pages for case studies that were deleted or unpublished
+        for url in set(old_manifest) - set(manifest):
+            for path in self.with_siblings(self.page_file(out, url)):
+                path.unlink(missing_ok=True)
+
+        copied = self.copy_static(out) + self.copy_media(out)
+        manifest_path.write_text(json.dumps(manifest, indent=2, sort_keys=True))
+        self.stdout.write(self.style.SUCCESS(
+            f'Exported to {out}: {rendered} page(s) rendered, {skipped} unchanged, {copied} asset(s) copied.'
+        ))
+
+    def page_keys(self):
+        """Yield (url, content key) for every exported page."""
+        published = CaseStudy.objects.filter(is_published=True)
+        agg = published.aggregate(last=Max('updated_at'), count=Count('id', distinct=True), images=Count('images'))
+        listing_key = f'{EXPORT_FORMAT}:{agg["count"]}:{agg["images"]}:{agg["last"].isoformat() if agg["last"] else ""}'
+        yield reverse('portfolio:home'), listing_key
+        yield reverse('portfolio:casestudy_list'), listing_key
+        # The list's ?cursor= pages can't be served statically; this page can
+        yield reverse('portfolio:casestudy_list_all'), listing_key
+        for name in ('portfolio:sitemap', 'portfolio:feed', 'portfolio:robots_txt'):
+            yield reverse(name), listing_key
+        sections = sitemap_sections()
+        if sections > 1:
+            for section in range(1, sections + 1):
+                yield reverse('portfolio:sitemap_section', args=[section]), listing_key
+        for slug, updated_at, images in published.annotate(n=Count('images')).values_list('slug', 'updated_at', 'n'):
+            yield reverse('portfolio:casestudy_detail', kwargs={'slug': slug}), f'{EXPORT_FORMAT}:{images}:{updated_at.isoformat()}'
+
+    def page_file(self, out, url):
+        path = url.strip('/')
+        # sitemap.xml, feed.xml and robots.txt are files; pages get a directory index
+        if '.' in path.rsplit('/', 1)[-1]:
+            return out / path
+        return out / path / 'index.html'
+
+    def with_siblings(self, path):
+        return [path, path.with_name(path.name + '.gz'), path.with_name(path.name + '.br')]
+
+    def render_page(self, url, target):
+        response = self.client.get(url)
+        if response.status_code != 200:
+            raise CommandError(f'{url} returned HTTP {response.status_code}')
+        content = b''.join(response.streaming_content) if response.streaming else response.content
+        # Static pages have no per-visitor CSRF token
+        content = CSRF_INPUT_RE.sub(b'', content)
+        target.parent.mkdir(parents=True, exist_ok=True)
+        target.write_bytes(content)
+        self.compressor.compress(str(target))
+        self.stdout.write(f'  {url}')
+
+    def copy_file(self, src, dest):
+        """Copy `src` to `dest` if missing or changed; compress text assets."""
+        src, dest = Path(src), Path(dest)
+        if dest.exists():
+            s, d = src.stat(), dest.stat()
+            if s.st_size == d.st_size and int(s.st_mtime) == int(d.st_mtime):
+                return 0
+        dest.parent.mkdir(parents=True, exist_ok=True)
+        shutil.copy2(src, dest)
+        if self.compressor.should_compress(dest.name) and not dest.name.endswith(('.gz', '.br')):
+            self.compressor.compress(str(dest))
+        return 1
+
+    def copy_static(self, out):
+        static_root = Path(settings.STATIC_ROOT)
+        if not static_root.exists():
+            self.stdout.write(self.style.WARNING('STATIC_ROOT not found; run collectstatic first to include assets.'))
+            return 0
+        dest_root = out / settings.STATIC_URL.strip('/')
+        return sum(
+            self.copy_file(src, dest_root / src.relative_to(static_root))
+            for src in static_root.rglob('*') if src.is_file()
+        )
+
+    def copy_media(self, out):
+        """Copy image derivatives (or the original when none exist yet)."""
+        dest_root = out / settings.MEDIA_URL.strip('/')
+        copied = 0
+        images = CaseStudyImage.objects.filter(case_study__is_published=True)
+        for img in images.only('image', 'derivatives'):
+            names = [name for entries in img.derivatives.get('formats', {}).values() for _, name in entries]
+            for name in names or [img.image.name]:
+                if default_storage.exists(name):
+                    copied += self.copy_file(default_storage.path(name), dest_root / name)
+        return copied
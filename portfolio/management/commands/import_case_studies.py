@@ -0,0 +1,132 @@
+"""
+Management command to bulk import case studies from JSONL (see portfolio.transfer).
+Usage: python manage.py import_case_studies projects.jsonl [--batch-size 500] [--workers 8]
+
+Case studies are upserted by slug, so re-running the same file is safe. Images
+are fetched/copied in a thread pool; images already attached are skipped.
+"""
+import os
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+
+from django.conf import settings
+from django.core.management import call_command
+from django.core.management.base import BaseCommand, CommandError
+from django.db import transaction
+
+from portfolio.cache import bump_content_version
+from portfolio.models import CaseStudy, CaseStudyImage, sync_tech_links
+from portfolio.search import index_case_studies
+from portfolio.transfer import (
+    UPDATE_FIELDS, RecordError, existing_images, image_name, parse_record, store_image,
+)
+
+
+class Command(BaseCommand):
+    help = 'Import (upsert by slug) case studies and their images from a JSONL file'
+
+    def add_arguments(self, parser):
+        parser.add_argument('path', help='JSONL file, or - for stdin')
+        parser.add_argument('--batch-size', type=int, default=500, help='Case studies per bulk upsert')
+        parser.add_argument('--workers', type=int, default=8, help='Threads fetching/copying images')
+        parser.add_argument('--images-dir', default=str(settings.MEDIA_ROOT),
+                            help='Base directory for relative image paths (default: MEDIA_ROOT)')
+        parser.add_argument('--skip-derivatives', action='store_true',
+                            help="Don't run rebuild_image_derivatives for new images")
+
+    def handle(self, *args, **options):
+        self.options = options
+        self.totals = {'rows': 0, 'invalid': 0, 'images': 0, 'images_skipped': 0, 'images_failed': 0}
+        start = time.perf_counter()
+
+        stream = sys.stdin if options['path'] == '-' else self.open(options['path'])
+        with ThreadPoolExecutor(max_workers=options['workers']) as self.pool:
+            batch = {}
+            for lineno, line in enumerate(stream, start=1):
+                if not line.strip():
+                    continue
+                try:
+                    case_study, images = parse_record(line)
+                except RecordError as e:
+                    self.totals['invalid'] += 1
+                    self.stderr.write(f'line {lineno}: {e}')
+                    continue
+                # A slug repeated within one batch: the last line wins
+                batch[case_study.slug] = (case_study, images)
+                if len(batch) >= options['batch_size']:
+                    self.import_batch(batch)
+                    batch = {}
+            if batch:
+                self.import_batch(batch)
+        if stream is not sys.stdin:
+            stream.close()
+
+        if self.totals['rows']:
+            bump_content_version()
+        if self.totals['images'] and not options['skip_derivatives']:
+            call_command('rebuild_image_derivatives', stdout=self.stdout, stderr=self.stderr)
+
+        elapsed = time.perf_counter() - start
+        t = self.totals
+        self.stdout.write(self.style.SUCCESS(
+            f'Imported {t["rows"]} case stud{"y" if t["rows"] == 1 else "ies"} '
+            f'({t["rows"] / elapsed:.0f} rows/s), {t["invalid"]} invalid; '
+            f'images: {t["images"]} added, {t["images_skipped"]} already present, {t["images_failed"]} failed.'
+        ))
+
+    def open(self, path):
+        if not os.path.exists(path):
+            raise CommandError(f'{path} does not exist')
+        return open(path, encoding='utf-8')
+
+    def import_batch(self, batch):
+        objs = [cs for cs, _ in batch.values()]
+        with transaction.atomic():
+            CaseStudy.objects.bulk_create(
+                objs,
+                update_conflicts=True,
+                unique_fields=['slug'],
+                update_fields=list(UPDATE_FIELDS),
+            )
+            # Not every backend returns pks for upserted rows: look them up by slug
+            saved = CaseStudy.objects.in_bulk(list(batch), field_name='slug')
+            sync_tech_links(saved.values())
+            index_case_studies(saved.values())
+        self.totals['rows'] += len(saved)
+        self.import_images(batch, saved)
+        if self.options['verbosity'] > 1:
+            self.stdout.write(f'  {self.totals["rows"]} rows')
+
+    def import_images(self, batch, saved):
+        seen = existing_images([cs.pk for cs in saved.values()])
+        futures = {}
+        for slug, (_, images) in batch.items():
+            case_study = saved[slug]
+            present = seen.get(case_study.pk, set())
+            for order, img in enumerate(images):
+                name = image_name(case_study, img['src'])
+                if img['src'] in present or os.path.basename(name) in present:
+                    self.totals['images_skipped'] += 1
+                    continue
+                future = self.pool.submit(store_image, img['src'], name, self.options['images_dir'])
+                futures[future] = (case_study, img, order)
+
+        new_images = []
+        for future in as_completed(futures):
+            case_study, img, order = futures[future]
+            try:
+                stored = future.result()
+            except Exception as e:
+                self.totals['images_failed'] += 1
+                self.stderr.write(f'{case_study.slug}: could not fetch {img["src"]}: {e}')
+                continue
+            new_images.append(CaseStudyImage(
+                case_study=case_study,
+                image=stored,
+                alt_text=img.get('alt_text', ''),
+                order=img.get('order', order),
+            ))
+        # bulk_create skips post_save: derivatives are built in one pass at the end
+        CaseStudyImage.objects.bulk_create(new_images)
+        self.totals['images'] += len(new_images)
@@ -0,0 +1,30 @@
+"""
+Management command to report page cache hit/miss counters.
+Usage: python manage.py page_cache_stats [--reset]
+"""
+from django.core.cache import cache
+from django.core.management.base import BaseCommand
+
+from portfolio.cache import (
+    STATS_HITS_KEY,
+    STATS_MISSES_KEY,
+    get_content_version,
+    page_cache_stats,
+)
+
+
+class Command(BaseCommand):
+    help = 'Show page cache hit/miss counters and the current content version'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--reset', action='store_true', help='Reset the counters after printing')
+
+    def handle(self, *args, **options):
+        stats = page_cache_stats()
+        self.stdout.write(f'Content version: {get_content_version()}')
+        self.stdout.write(f'Hits:   {stats["hits"]}')
+        self.stdout.write(f'Misses: {stats["misses"]}')
+        self.stdout.write(f'Hit ratio: {stats["hit_ratio"]:.1%}')
+        if options['reset']:
+            cache.delete_many([STATS_HITS_KEY, STATS_MISSES_KEY])
+            self.stdout.write(self.style.SUCCESS('Counters reset.'))
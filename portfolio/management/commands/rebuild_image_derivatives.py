@@ -0,0 +1,58 @@
+"""
+Management command to (re)build responsive derivatives for CaseStudyImage.
+Usage: python manage.py rebuild_image_derivatives [--all] [--workers N]
+"""
+import os
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+from django.core.management.base import BaseCommand
+from django.db import connections
+
+from portfolio.cache import bump_content_version
+from portfolio.images import NO_DERIVATIVES, delete_derivatives, process_image
+from portfolio.models import CaseStudyImage
+
+
+class Command(BaseCommand):
+    help = 'Generate WebP/AVIF/JPEG derivatives, dimensions and placeholders for case study images'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--all', action='store_true', help='Rebuild every image, not only missing/stale ones')
+        parser.add_argument('--workers', type=int, default=os.cpu_count() or 1, help='Process pool size')
+
+    def handle(self, *args, **options):
+        images = [
+            img for img in CaseStudyImage.objects.exclude(image='')
+            if options['all'] or img.needs_derivatives()
+        ]
+        if not images:
+            self.stdout.write('All images are up to date.')
+            return
+
+        # Child processes must not inherit open DB connections
+        connections.close_all()
+
+        done = failed = 0
+        with ProcessPoolExecutor(max_workers=options['workers']) as pool:
+            futures = {pool.submit(process_image, img.pk, img.image.name): img for img in images}
+            for future in as_completed(futures):
+                img = futures[future]
+                try:
+                    _, fields = future.result()
+                except Exception as e:
+                    failed += 1
+                    self.stdout.write(self.style.ERROR(f'Failed: {img.image.name}: {e}'))
+                    if not img.needs_derivatives():
+                        # A forced rebuild: the current derivatives are still right
+                        continue
+                    # Derivatives of an earlier upload: fall back to the original
+                    fields = NO_DERIVATIVES
+                else:
+                    done += 1
+                    self.stdout.write(f'  {img.image.name}: {fields["width"]}x{fields["height"]}')
+                # Point the row at the new files before the old ones go
+                CaseStudyImage.objects.filter(pk=img.pk).update(**fields)
+                delete_derivatives(img.derivatives, keep=fields['derivatives'])
+
+        bump_content_version()
+        self.stdout.write(self.style.SUCCESS(f'Processed {done} image(s), {failed} failed.'))
@@ -0,0 +1,16 @@
+"""
+Management command to rebuild the case study full-text search index.
+Usage: python manage.py rebuild_search_index
+"""
+from django.core.management.base import BaseCommand
+from django.db import connection
+
+from portfolio.search import rebuild_index
+
+
+class Command(BaseCommand):
+    help = 'Drop and rebuild the full-text search index (FTS5 on SQLite, tsvector/GIN on PostgreSQL)'
+
+    def handle(self, *args, **options):
+        count = rebuild_index()
+        self.stdout.write(self.style.SUCCESS(f'Indexed {count} case stud{"y" if count == 1 else "ies"} ({connection.vendor}).'))
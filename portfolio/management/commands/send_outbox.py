@@ -0,0 +1,28 @@
+"""
+Management command to deliver queued contact-form emails.
+Usage: python manage.py send_outbox [--loop] [--interval 10] [--batch-size 50]
+"""
+import time
+
+from django.core.management.base import BaseCommand
+
+from portfolio.outbox import deliver_pending
+
+
+class Command(BaseCommand):
+    help = 'Send pending outbox emails (retries with exponential backoff, dead-letters after max attempts)'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--loop', action='store_true', help='Keep running and poll the outbox')
+        parser.add_argument('--interval', type=float, default=10, help='Seconds between polls in --loop mode')
+        parser.add_argument('--batch-size', type=int, default=50, help='Max messages per connection')
+
+    def handle(self, *args, **options):
+        while True:
+            sent, failed = deliver_pending(batch_size=options['batch_size'])
+            if sent or failed or not options['loop']:
+                self.stdout.write(f'Outbox: {sent} sent, {failed} failed')
+            if not options['loop']:
+                return
+            if sent + failed < options['batch_size']:
+                time.sleep(options['interval'])
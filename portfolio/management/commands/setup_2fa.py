@@ -4,12 +4,7 @@ Usage: python manage.py setup_2fa <username>
 """
 from django.core.management.base import BaseCommand
 from django.contrib.auth import get_user_model
-from django_otp.plugins.otp_totp.models import TOTPDevice
-from django_otp.util import random_hex
-import qrcode
-from io import BytesIO
-from django.core.files.base import ContentFile
-import base64
+from portfolio.two_factor import device_state, qr_svg
 
 User = get_user_model()
 
@@ -30,7 +25,8 @@ class Command(BaseCommand):
             return
 
         # Check if device already exists
-        existing_device = TOTPDevice.objects.filter(user=user, confirmed=True).first()
+        state = device_state(user)
+        existing_device = state.confirmed
         if existing_device:
             self.stdout.write(self.style.WARNING(
                 f'User "{username}" already has a confirmed TOTP device named "{existing_device.name}".'
@@ -38,24 +34,9 @@ class Command(BaseCommand):
             self.stdout.write('To create a new device, delete the existing one first or use a different name.')
             return
 
-        # Create new TOTP device
-        device = TOTPDevice.objects.create(
-            user=user,
-            name='default',
-            confirmed=False,
-            key=random_hex(20)
-        )
-
-        # Generate QR code
+        # Reuse the pending device (same as the admin setup page) or create one
+        device = state.setup_device()
         config_url = device.config_url
-        qr = qrcode.QRCode(version=1, box_size=10, border=5)
-        qr.add_data(config_url)
-        qr.make(fit=True)
-        
-        img = qr.make_image(fill_color="black", back_color="white")
-        buffer = BytesIO()
-        img.save(buffer, format='PNG')
-        qr_data = base64.b64encode(buffer.getvalue()).decode()
 
         self.stdout.write(self.style.SUCCESS('\n' + '='*60))
         self.stdout.write(self.style.SUCCESS('2FA Setup for user: ' + username))
@@ -72,9 +53,9 @@ class Command(BaseCommand):
         
         # Try to save QR code to file
         try:
-            qr_path = f'qr_code_{username}.png'
-            with open(qr_path, 'wb') as f:
-                f.write(buffer.getvalue())
+            qr_path = f'qr_code_{username}.svg'
+            with open(qr_path, 'w', encoding='utf-8') as f:
+                f.write(qr_svg(config_url))
             self.stdout.write(self.style.SUCCESS(f'QR code saved to: {qr_path}'))
             self.stdout.write(f'  Open this file and scan it with Google Authenticator\n')
         except Exception as e:
@@ -0,0 +1,27 @@
+"""
+Management command to report throttling counters.
+Usage: python manage.py throttle_stats [--reset]
+"""
+from django.conf import settings
+from django.core.management.base import BaseCommand
+
+from portfolio.throttle import reset_throttle_stats, throttle_stats
+
+
+class Command(BaseCommand):
+    help = 'Show allowed/rejected request counters per throttle scope'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--reset', action='store_true', help='Reset the counters after printing')
+
+    def handle(self, *args, **options):
+        if not settings.THROTTLE_ENABLED:
+            self.stdout.write(self.style.WARNING('Throttling is disabled (THROTTLE_ENABLED=False).'))
+        rates = settings.THROTTLE_RATES
+        for scope, counts in throttle_stats().items():
+            self.stdout.write(
+                f'{scope:<12} {rates[scope]:>8}  allowed {counts["allowed"]:>6}  rejected {counts["rejected"]:>6}'
+            )
+        if options['reset']:
+            reset_throttle_stats()
+            self.stdout.write(self.style.SUCCESS('Counters reset.'))
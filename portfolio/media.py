@@ -0,0 +1,80 @@
+"""
+Serving uploaded media: immutable caching for content-hashed names and
+Accept-Encoding negotiation of precompressed siblings.
+"""
+import mimetypes
+import stat
+from pathlib import Path
+
+from django.conf import settings
+from django.core.exceptions import SuspiciousFileOperation
+from django.http import FileResponse, Http404
+from django.utils._os import safe_join
+from django.utils.cache import get_conditional_response, patch_cache_control, patch_vary_headers
+from django.utils.http import http_date, quote_etag
+
+from .storage import is_hashed_name
+
+IMMUTABLE_MAX_AGE = 60 * 60 * 24 * 365
+# Preferred first
+ENCODINGS = (('br', '.br'), ('gzip', '.gz'))
+
+
+def accepted_encodings(header):
+    """Content codings the client accepts (q=0 means refused)."""
+    accepted = set()
+    for part in header.split(','):
+        coding, _, params = part.strip().partition(';')
+        q = params.strip()
+        if q.startswith('q=') and q[2:].strip() in ('0', '0.0', '0.00', '0.000'):
+            continue
+        accepted.add(coding.strip().lower())
+    return accepted
+
+
+def _stat_file(path):
+    try:
+        st = path.stat()
+    except (FileNotFoundError, NotADirectoryError):
+        return None
+    return st if stat.S_ISREG(st.st_mode) else None
+
+
+def serve_media(request, path):
+    """Serve a file from MEDIA_ROOT, preferring a .br/.gz sibling the client accepts."""
+    try:
+        full_path = Path(safe_join(settings.MEDIA_ROOT, path))
+    except SuspiciousFileOperation:
+        raise Http404('Not found')
+    st = _stat_file(full_path)
+    if st is None:
+        raise Http404('Not found')
+
+    serve_path, encoding = full_path, None
+    accepted = accepted_encodings(request.headers.get('Accept-Encoding', ''))
+    for coding, suffix in ENCODINGS:
+        if coding in accepted:
+            sibling = full_path.with_name(full_path.name + suffix)
+            sibling_st = _stat_file(sibling)
+            if sibling_st is not None:
+                serve_path, encoding, st = sibling, coding, sibling_st
+                break
+
+    mtime = int(st.st_mtime)
+    # Each encoding is its own representation, so it gets its own ETag
+    etag = quote_etag(f'{mtime:x}-{st.st_size:x}' + (f'-{encoding}' if encoding else ''))
+    response = get_conditional_response(request, etag=etag, last_modified=mtime)
+    if response is None:
+        content_type, _ = mimetypes.guess_type(full_path.name)
+        response = FileResponse(open(serve_path, 'rb'), content_type=content_type or 'application/octet-stream')
+        if encoding:
+            response['Content-Encoding'] = encoding
+    response['ETag'] = etag
+    response['Last-Modified'] = http_date(mtime)
+    patch_vary_headers(response, ('Accept-Encoding',))
+    if is_hashed_name(path):
+        # The name changes whenever the bytes do
+        patch_cache_control(response, public=True, max_age=IMMUTABLE_MAX_AGE, immutable=True)
+    else:
+        patch_cache_control(response, public=True, max_age=settings.MEDIA_CACHE_MAX_AGE)
+    return response
@@ -0,0 +1,299 @@
+"""
+In-process request metrics: histograms per view, exported in Prometheus text
+format and summarised on the admin metrics page.
+
+Each gunicorn worker keeps its own registry; the `worker` label tells them apart.
+"""
+import bisect
+import contextvars
+import logging
+import os
+import random
+import threading
+import time
+
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction
+from django.conf import settings
+from django.db.backends.signals import connection_created
+from django.dispatch import receiver
+
+logger = logging.getLogger('portfolio.performance')
+
+DURATION_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+QUERY_BUCKETS = (0, 1, 2, 3, 5, 10, 20, 50, 100)
+SIZE_BUCKETS = (1024, 4096, 16384, 65536, 262144, 1048576, 4194304)
+
+
+class Histogram:
+    """Fixed-bucket histogram (Prometheus semantics); Registry holds the lock."""
+
+    def __init__(self, buckets):
+        self.buckets = tuple(buckets)
+        self.counts = [0] * (len(self.buckets) + 1)
+        self.sum = 0.0
+        self.count = 0
+
+    def observe(self, value):
+        self.counts[bisect.bisect_left(self.buckets, value)] += 1
+        self.sum += value
+        self.count += 1
+
+    def quantile(self, q):
+        """Estimate a quantile by linear interpolation inside the bucket."""
+        if not self.count:
+            return 0.0
+        rank = q * self.count
+        seen = 0
+        for i, n in enumerate(self.counts):
+            if seen + n >= rank and n:
+                lower = self.buckets[i - 1] if i else 0.0
+                upper = self.buckets[i] if i < len(self.buckets) else self.buckets[-1]
+                return lower + (upper - lower) * (rank - seen) / n
+            seen += n
+        return self.buckets[-1]
+
+    def mean(self):
+        return self.sum / self.count if self.count else 0.0
+
+
+class Registry:
+    """All histograms and counters, keyed by (metric, view)."""
+
+    METRICS = {
+        'request_duration_seconds': DURATION_BUCKETS,
+        'db_queries': QUERY_BUCKETS,
+        'db_duration_seconds': DURATION_BUCKETS,
+        'template_render_seconds': DURATION_BUCKETS,
+        'response_size_bytes': SIZE_BUCKETS,
+    }
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.reset()
+
+    def reset(self):
+        with self.lock:
+            self.histograms = {}
+            self.counters = {}
+
+    def observe(self, metric, view, value):
+        with self.lock:
+            hist = self.histograms.get((metric, view))
+            if hist is None:
+                hist = self.histograms[(metric, view)] = Histogram(self.METRICS[metric])
+            hist.observe(value)
+
+    def inc(self, metric, labels):
+        with self.lock:
+            key = (metric, labels)
+            self.counters[key] = self.counters.get(key, 0) + 1
+
+    def summary(self):
+        """Per-view rows for the admin dashboard."""
+        with self.lock:
+            views = sorted({view for _, view in self.histograms})
+            rows = []
+            for view in views:
+                duration = self.histograms.get(('request_duration_seconds', view))
+                queries = self.histograms.get(('db_queries', view))
+                db_time = self.histograms.get(('db_duration_seconds', view))
+                render = self.histograms.get(('template_render_seconds', view))
+                size = self.histograms.get(('response_size_bytes', view))
+                hits = self.counters.get(('page_cache_total', (view, 'HIT')), 0)
+                misses = self.counters.get(('page_cache_total', (view, 'MISS')), 0)
+                rows.append({
+                    'view': view,
+                    'requests': duration.count if duration else 0,
+                    'p50_ms': duration.quantile(0.5) * 1000 if duration else 0,
+                    'p95_ms': duration.quantile(0.95) * 1000 if duration else 0,
+                    'queries': queries.mean() if queries else 0,
+                    'db_ms': db_time.mean() * 1000 if db_time else 0,
+                    'render_ms': render.mean() * 1000 if render else 0,
+                    'size_kb': size.mean() / 1024 if size else 0,
+                    'cache_hit_ratio': hits / (hits + misses) if hits + misses else None,
+                })
+            return rows
+
+    def prometheus(self):
+        """Render everything in the Prometheus text exposition format."""
+        worker = os.getpid()
+        lines = []
+        with self.lock:
+            for metric in self.METRICS:
+                name = f'portfolio_{metric}'
+                lines.append(f'# TYPE {name} histogram')
+                for (m, view), hist in sorted(self.histograms.items()):
+                    if m != metric:
+                        continue
+                    labels = f'view="{view}",worker="{worker}"'
+                    cumulative = 0
+                    for bound, n in zip(hist.buckets, hist.counts):
+                        cumulative += n
+                        lines.append(f'{name}_bucket{{{labels},le="{bound}"}} {cumulative}')
+                    lines.append(f'{name}_bucket{{{labels},le="+Inf"}} {hist.count}')
+                    lines.append(f'{name}_sum{{{labels}}} {hist.sum}')
+                    lines.append(f'{name}_count{{{labels}}} {hist.count}')
+            lines.append('# TYPE portfolio_page_cache_total counter')
+            for (metric, (view, result)), n in sorted(self.counters.items()):
+                lines.append(
+                    f'portfolio_{metric}{{view="{view}",result="{result}",worker="{worker}"}} {n}'
+                )
+        return '\n'.join(lines) + '\n'
+
+
+registry = Registry()
+
+# Accumulators for the request being measured (contextvars work for sync and async)
+_template_time = contextvars.ContextVar('portfolio_template_time', default=None)
+_query_timer = contextvars.ContextVar('portfolio_query_timer', default=None)
+
+
+def _patch_template_render():
+    """Time top-level template renders (the Django backend's Template.render)."""
+    from django.template.backends.django import Template
+
+    if getattr(Template.render, '_portfolio_timed', False):
+        return
+    original = Template.render
+
+    def render(self, context=None, request=None):
+        acc = _template_time.get()
+        if acc is None:
+            return original(self, context, request)
+        start = time.perf_counter()
+        try:
+            return original(self, context, request)
+        finally:
+            acc[0] += time.perf_counter() - start
+
+    render._portfolio_timed = True
+    Template.render = render
+
+
+class QueryTimer:
+    """One request's queries (run through _timed_execute): counts them, times them, logs slow SQL."""
+
+    def __init__(self, slow_query_ms):
+        self.count = 0
+        self.duration = 0.0
+        self.slow_query_ms = slow_query_ms
+
+    def __call__(self, execute, sql, params, many, context):
+        start = time.perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            elapsed = time.perf_counter() - start
+            self.count += 1
+            self.duration += elapsed
+            if self.slow_query_ms and elapsed * 1000 >= self.slow_query_ms:
+                logger.warning('Slow query (%.1f ms): %s', elapsed * 1000, sql)
+
+
+def _timed_execute(execute, sql, params, many, context):
+    timer = _query_timer.get()
+    if timer is None:
+        return execute(sql, params, many, context)
+    return timer(execute, sql, params, many, context)
+
+
+@receiver(connection_created)
+def install_query_timer(sender, connection, **kwargs):
+    """
+    Time queries on every connection, in the thread that runs them.
+
+    Connections are per thread, and under ASGI the ORM runs in sync_to_async
+    threads, not on the event loop where the middleware runs. asgiref copies
+    the request's context into those threads, so _query_timer still finds
+    the request's QueryTimer.
+    """
+    if _timed_execute not in connection.execute_wrappers:
+        connection.execute_wrappers.append(_timed_execute)
+
+
+class PerformanceMiddleware:
+    """
+    Record per-view wall time, DB queries/time, template render time, page
+    cache result and response size.
+
+    Settings: METRICS_ENABLED, METRICS_SAMPLE_RATE (0-1, share of requests that
+    get DB/template instrumentation), METRICS_SLOW_REQUEST_MS, METRICS_SLOW_QUERY_MS.
+    """
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        self.enabled = getattr(settings, 'METRICS_ENABLED', True)
+        self.sample_rate = getattr(settings, 'METRICS_SAMPLE_RATE', 1.0)
+        self.slow_request_ms = getattr(settings, 'METRICS_SLOW_REQUEST_MS', 500)
+        self.slow_query_ms = getattr(settings, 'METRICS_SLOW_QUERY_MS', 100)
+        if self.enabled:
+            _patch_template_render()
+        if iscoroutinefunction(self.get_response):
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        if iscoroutinefunction(self):
+            return self.__acall__(request)
+        if not self.enabled:
+            return self.get_response(request)
+        start, timer, tokens = self._begin()
+        try:
+            response = self.get_response(request)
+        finally:
+            template_time = self._end(tokens)
+        self._record(request, response, start, timer, template_time)
+        return response
+
+    async def __acall__(self, request):
+        if not self.enabled:
+            return await self.get_response(request)
+        start, timer, tokens = self._begin()
+        try:
+            response = await self.get_response(request)
+        finally:
+            template_time = self._end(tokens)
+        self._record(request, response, start, timer, template_time)
+        return response
+
+    def _begin(self):
+        """Start the clock; for a sampled request, also start the query and template accumulators."""
+        if not (self.sample_rate >= 1 or random.random() < self.sample_rate):
+            return time.perf_counter(), None, None
+        timer = QueryTimer(self.slow_query_ms)
+        tokens = (_query_timer.set(timer), _template_time.set([0.0]))
+        return time.perf_counter(), timer, tokens
+
+    @staticmethod
+    def _end(tokens):
+        """Stop the accumulators; the template render time, or None for an unsampled request."""
+        if tokens is None:
+            return None
+        template_time = _template_time.get()[0]
+        _query_timer.reset(tokens[0])
+        _template_time.reset(tokens[1])
+        return template_time
+
+    def _record(self, request, response, start, timer, template_time):
+        duration = time.perf_counter() - start
+        match = request.resolver_match
+        view = match.view_name if match else 'unresolved'
+        registry.observe('request_duration_seconds', view, duration)
+        if timer is not None:
+            registry.observe('db_queries', view, timer.count)
+            registry.observe('db_duration_seconds', view, timer.duration)
+            registry.observe('template_render_seconds', view, template_time)
+        if response.has_header('Content-Length'):
+            registry.observe('response_size_bytes', view, int(response['Content-Length']))
+        elif not getattr(response, 'streaming', False):
+            registry.observe('response_size_bytes', view, len(response.content))
+        cache_result = response.get('X-Page-Cache')
+        if cache_result:
+            registry.inc('page_cache_total', (view, cache_result))
+        if self.slow_request_ms and duration * 1000 >= self.slow_request_ms:
+            logger.warning(
+                'Slow request %s %s (%s): %.1f ms, %s queries',
+                request.method, request.path, view, duration * 1000,
+                timer.count if timer is not None else '?',
+            )
@@ -0,0 +1,46 @@
+# Generated by Django 5.2.18 on 2026-10-18 01:11
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('portfolio', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='Tech',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('name', models.CharField(max_length=100, unique=True)),
+            ],
+            options={
+                'verbose_name_plural': 'Tech',
+                'ordering': ['name'],
+            },
+        ),
+        migrations.CreateModel(
+            name='CaseStudyTech',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('order', models.PositiveIntegerField(default=0)),
+                ('case_study', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='tech_links', to='portfolio.casestudy')),
+                ('tech', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='case_study_links', to='portfolio.tech')),
+            ],
+            options={
+                'ordering': ['order'],
+            },
+        ),
+        migrations.AddField(
+            model_name='casestudy',
+            name='techs',
+            field=models.ManyToManyField(blank=True, related_name='case_studies', through='portfolio.CaseStudyTech', to='portfolio.tech'),
+        ),
+        migrations.AddConstraint(
+            model_name='casestudytech',
+            constraint=models.UniqueConstraint(fields=('case_study', 'tech'), name='unique_case_study_tech'),
+        ),
+    ]
@@ -0,0 +1,28 @@
+from django.db import migrations
+
+
+def populate_tech_tags(apps, schema_editor):
+    CaseStudy = apps.get_model('portfolio', 'CaseStudy')
+    CaseStudyTech = apps.get_model('portfolio', 'CaseStudyTech')
+    Tech = apps.get_model('portfolio', 'Tech')
+
+    techs = {}
+    links = []
+    for case_study in CaseStudy.objects.only('pk', 'tech_stack').iterator():
+        names = dict.fromkeys(t.strip() for t in case_study.tech_stack.split(',') if t.strip())
+        for order, name in enumerate(names):
+            if name not in techs:
+                techs[name], _ = Tech.objects.get_or_create(name=name)
+            links.append(CaseStudyTech(case_study_id=case_study.pk, tech=techs[name], order=order))
+    CaseStudyTech.objects.bulk_create(links, ignore_conflicts=True)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('portfolio', '0002_tech_tags'),
+    ]
+
+    operations = [
+        migrations.RunPython(populate_tech_tags, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,68 @@
+from django.db import migrations, OperationalError
+
+# The search index DDL as of this migration. Kept here rather than imported
+# from portfolio.search, so later edits to that module can't change it.
+CREATE_SQL = {
+    'postgresql': [
+        'CREATE TABLE IF NOT EXISTS portfolio_casestudy_search ('
+        'case_study_id bigint PRIMARY KEY REFERENCES portfolio_casestudy(id) ON DELETE CASCADE, '
+        'document tsvector NOT NULL)',
+        'CREATE INDEX IF NOT EXISTS portfolio_casestudy_search_document_gin '
+        'ON portfolio_casestudy_search USING gin (document)',
+    ],
+    'sqlite': [
+        'CREATE VIRTUAL TABLE IF NOT EXISTS portfolio_casestudy_fts USING fts5('
+        'title, summary, tech, problem, solution, key_results, tokenize="porter unicode61")',
+    ],
+}
+DROP_SQL = {
+    'postgresql': ['DROP TABLE IF EXISTS portfolio_casestudy_search'],
+    'sqlite': ['DROP TABLE IF EXISTS portfolio_casestudy_fts'],
+}
+# Index the existing case studies (the tech column holds tech_stack with spaces for commas)
+POPULATE_SQL = {
+    'postgresql': (
+        "INSERT INTO portfolio_casestudy_search (case_study_id, document) "
+        "SELECT id, "
+        "setweight(to_tsvector('english', title), 'A') || "
+        "setweight(to_tsvector('english', summary), 'B') || "
+        "setweight(to_tsvector('english', replace(tech_stack, ',', ' ')), 'B') || "
+        "setweight(to_tsvector('english', problem || ' ' || solution || ' ' || key_results), 'C') "
+        "FROM portfolio_casestudy "
+        "ON CONFLICT (case_study_id) DO UPDATE SET document = EXCLUDED.document"
+    ),
+    'sqlite': (
+        "INSERT INTO portfolio_casestudy_fts (rowid, title, summary, tech, problem, solution, key_results) "
+        "SELECT id, title, summary, replace(tech_stack, ',', ' '), problem, solution, key_results "
+        "FROM portfolio_casestudy"
+    ),
+}
+
+
+def create_search_index(apps, schema_editor):
+    vendor = schema_editor.connection.vendor
+    if vendor not in CREATE_SQL:
+        return
+    try:
+        for sql in CREATE_SQL[vendor]:
+            schema_editor.execute(sql)
+    except OperationalError:
+        # e.g. SQLite compiled without FTS5: search falls back to icontains
+        return
+    schema_editor.execute(POPULATE_SQL[vendor])
+
+
+def drop_search_index(apps, schema_editor):
+    for sql in DROP_SQL.get(schema_editor.connection.vendor, []):
+        schema_editor.execute(sql)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('portfolio', '0005_image_derivatives'),
+    ]
+
+    operations = [
+        migrations.RunPython(create_search_index, drop_search_index),
+    ]
@@ -0,0 +1,25 @@
+# Generated by Django 5.2.18 on 2026-10-18 01:29
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('portfolio', '0006_search_index'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='casestudy',
+            index=models.Index(fields=['order', '-created_at'], name='casestudy_order_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='casestudy',
+            index=models.Index(fields=['is_published', 'order', '-created_at'], name='casestudy_published_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='casestudyimage',
+            index=models.Index(fields=['case_study', 'order'], name='casestudyimage_order_idx'),
+        ),
+    ]
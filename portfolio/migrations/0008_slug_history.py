@@ -0,0 +1,27 @@
+# Generated by Django 5.2.18 on 2026-10-18 01:59
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('portfolio', '0007_admin_indexes'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='SlugHistory',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('slug', models.SlugField(max_length=220, unique=True)),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('case_study', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='slug_history', to='portfolio.casestudy')),
+            ],
+            options={
+                'verbose_name_plural': 'Slug history',
+                'ordering': ['-created_at'],
+            },
+        ),
+    ]
@@ -0,0 +1,23 @@
+# Generated by Django 5.2.18 on 2026-10-18 02:22
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('portfolio', '0008_slug_history'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ThrottleBucket',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('key', models.CharField(help_text='scope:hash of the client identifier', max_length=64, unique=True)),
+                ('tokens', models.FloatField()),
+                ('updated', models.FloatField(help_text='Unix time tokens was last computed at')),
+                ('expires_at', models.FloatField(db_index=True, help_text='Unix time the bucket is full again and can go')),
+            ],
+        ),
+    ]
@@ -0,0 +1,19 @@
+# Generated by Django 5.2.18 on 2026-10-18 02:46
+
+import portfolio.models
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('portfolio', '0010_outbox_sending_status'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='casestudy',
+            name='slug',
+            field=models.SlugField(blank=True, max_length=220, unique=True, validators=[portfolio.models.validate_slug_not_reserved]),
+        ),
+    ]
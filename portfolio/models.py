@@ -1,14 +1,86 @@
 """
 Portfolio models: case studies (projects) manageable via Django Admin.
 """
+from django.core.exceptions import ValidationError
 from django.db import models
+from django.utils import timezone
 from django.utils.text import slugify
 
 
+class Tech(models.Model):
+    """A technology tag (e.g. Django, PostgreSQL) shared across case studies."""
+    name = models.CharField(max_length=100, unique=True)
+
+    class Meta:
+        ordering = ['name']
+        verbose_name_plural = 'Tech'
+
+    def __str__(self):
+        return self.name
+
+
+def split_tech_stack(tech_stack):
+    """Split a comma-separated tech stack string into clean tag names."""
+    return [t.strip() for t in tech_stack.split(',') if t.strip()]
+
+
+# Paths under /projects/ that aren't case studies
+RESERVED_SLUGS = frozenset({'all', 'search'})
+
+
+def validate_slug_not_reserved(slug):
+    """A case study with one of these slugs would be hidden behind /projects/<slug>/."""
+    if slug in RESERVED_SLUGS:
+        raise ValidationError(f'"{slug}" is reserved for /projects/{slug}/; choose another slug.', code='reserved')
+
+
+def unique_slug(title, exclude_pk=None):
+    """
+    slugify(title), with -2, -3… appended when another case study uses it now
+    or used it before (its old links keep redirecting there).
+    """
+    max_length = CaseStudy._meta.get_field('slug').max_length
+    base = (slugify(title) or 'project')[:max_length]
+    # Room for a suffix; the candidates below all start with this prefix
+    prefix = base[:max_length - 8]
+    taken = set(
+        CaseStudy.objects.filter(slug__startswith=prefix).exclude(pk=exclude_pk).values_list('slug', flat=True)
+    )
+    taken.update(
+        SlugHistory.objects.filter(slug__startswith=prefix)
+        .exclude(case_study_id=exclude_pk).values_list('slug', flat=True)
+    )
+    taken.update(RESERVED_SLUGS)
+    slug, n = base, 1
+    while slug in taken:
+        n += 1
+        suffix = f'-{n}'
+        slug = base[:max_length - len(suffix)] + suffix
+    return slug
+
+
+# Public listing order (Meta.ordering) with id as a unique tie-breaker for keyset pagination
+CASE_STUDY_ORDERING = ('order', '-created_at', 'id')
+# What a project card shows, plus the ordering columns; list pages load only these
+CASE_STUDY_CARD_FIELDS = ('slug', 'title', 'summary', 'order', 'created_at')
+
+
+class CaseStudyQuerySet(models.QuerySet):
+    def published(self):
+        """Published case studies with images and tech tags prefetched."""
+        return self.filter(is_published=True).prefetch_related(
+            models.Prefetch('images', queryset=CaseStudyImage.objects.order_by('order')),
+            models.Prefetch(
+                'tech_links',
+                queryset=CaseStudyTech.objects.select_related('tech').order_by('order'),
+            ),
+        )
+
+
 class CaseStudy(models.Model):
     """A project / case study displayed on the portfolio."""
     title = models.CharField(max_length=200)
-    slug = models.SlugField(max_length=220, unique=True, blank=True)
+    slug = models.SlugField(max_length=220, unique=True, blank=True, validators=[validate_slug_not_reserved])
     summary = models.CharField(max_length=300, help_text='Short one-line summary')
     problem = models.TextField(help_text='Problem description')
     solution = models.TextField(help_text='Solution approach')
@@ -25,21 +97,107 @@ class CaseStudy(models.Model):
     is_published = models.BooleanField(default=True)
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
+    techs = models.ManyToManyField(
+        Tech, through='CaseStudyTech', related_name='case_studies', blank=True
+    )
+
+    objects = CaseStudyQuerySet.as_manager()
 
     class Meta:
         ordering = ['order', '-created_at']
         verbose_name_plural = 'Case studies'
+        indexes = [
+            # Admin changelist (Meta.ordering) and the public published() listings
+            models.Index(fields=['order', '-created_at'], name='casestudy_order_idx'),
+            models.Index(fields=['is_published', 'order', '-created_at'], name='casestudy_published_idx'),
+        ]
+
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        instance = super().from_db(db, field_names, values)
+        # The stored slug, to tell when save() retires it (absent when deferred)
+        instance._saved_slug = instance.__dict__.get('slug')
+        return instance
 
     def save(self, *args, **kwargs):
         if not self.slug:
-            self.slug = slugify(self.title)
+            self.slug = unique_slug(self.title, exclude_pk=self.pk)
+        old_slug = getattr(self, '_saved_slug', None)
+        if self.pk and old_slug and old_slug != self.slug:
+            # Before the save, whose post_save signal bumps the content version
+            # that the slug map (portfolio.slugs) is keyed by
+            self.retire_slug(old_slug)
         super().save(*args, **kwargs)
+        self._saved_slug = self.slug
+        self.sync_techs()
+
+    def retire_slug(self, slug):
+        """Keep an old slug redirecting here; the current slug stops being a redirect."""
+        SlugHistory.objects.filter(slug=self.slug).delete()
+        SlugHistory.objects.update_or_create(slug=slug, defaults={'case_study': self})
 
     def __str__(self):
         return self.title
 
+    def sync_techs(self):
+        """Rebuild tech tag links from the comma-separated tech_stack."""
+        names = list(dict.fromkeys(split_tech_stack(self.tech_stack)))
+        if [link.tech.name for link in self.tech_links.select_related('tech')] == names:
+            return
+        Tech.objects.bulk_create([Tech(name=n) for n in names], ignore_conflicts=True)
+        techs = {t.name: t for t in Tech.objects.filter(name__in=names)}
+        self.tech_links.all().delete()
+        CaseStudyTech.objects.bulk_create([
+            CaseStudyTech(case_study=self, tech=techs[n], order=i)
+            for i, n in enumerate(names)
+        ])
+        # Drop any stale prefetch cache
+        getattr(self, '_prefetched_objects_cache', {}).pop('tech_links', None)
+
     def tech_list(self):
-        return [t.strip() for t in self.tech_stack.split(',') if t.strip()]
+        """Tech tag names in display order (uses prefetched links when available)."""
+        return [link.tech.name for link in self.tech_links.all()]
+
+
+class CaseStudyTech(models.Model):
+    """Ordered link between a case study and a tech tag."""
+    case_study = models.ForeignKey(CaseStudy, on_delete=models.CASCADE, related_name='tech_links')
+    tech = models.ForeignKey(Tech, on_delete=models.CASCADE, related_name='case_study_links')
+    order = models.PositiveIntegerField(default=0)
+
+    class Meta:
+        ordering = ['order']
+        constraints = [
+            models.UniqueConstraint(fields=['case_study', 'tech'], name='unique_case_study_tech'),
+        ]
+
+
+def sync_tech_links(case_studies):
+    """Bulk version of CaseStudy.sync_techs for saved case studies (e.g. after bulk_create)."""
+    wanted = {cs.pk: list(dict.fromkeys(split_tech_stack(cs.tech_stack))) for cs in case_studies}
+    names = {n for ns in wanted.values() for n in ns}
+    Tech.objects.bulk_create([Tech(name=n) for n in names], ignore_conflicts=True)
+    techs = dict(Tech.objects.filter(name__in=names).values_list('name', 'pk'))
+    CaseStudyTech.objects.filter(case_study_id__in=wanted).delete()
+    CaseStudyTech.objects.bulk_create([
+        CaseStudyTech(case_study_id=pk, tech_id=techs[n], order=i)
+        for pk, ns in wanted.items()
+        for i, n in enumerate(ns)
+    ])
+
+
+class SlugHistory(models.Model):
+    """A slug a case study used before; its URLs redirect to the current slug."""
+    case_study = models.ForeignKey(CaseStudy, on_delete=models.CASCADE, related_name='slug_history')
+    slug = models.SlugField(max_length=220, unique=True)
+    created_at = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        ordering = ['-created_at']
+        verbose_name_plural = 'Slug history'
+
+    def __str__(self):
+        return self.slug
 
 
 class CaseStudyImage(models.Model):
@@ -48,6 +206,71 @@ class CaseStudyImage(models.Model):
     image = models.ImageField(upload_to='case_studies/%Y/%m/')
     alt_text = models.CharField(max_length=200, blank=True)
     order = models.PositiveIntegerField(default=0)
+    width = models.PositiveIntegerField(null=True, blank=True, editable=False)
+    height = models.PositiveIntegerField(null=True, blank=True, editable=False)
+    placeholder = models.TextField(blank=True, editable=False, help_text='Tiny blurred data URI')
+    derivatives = models.JSONField(default=dict, blank=True, editable=False)
 
     class Meta:
         ordering = ['order']
+        indexes = [
+            models.Index(fields=['case_study', 'order'], name='casestudyimage_order_idx'),
+        ]
+
+    def needs_derivatives(self):
+        return bool(self.image) and self.derivatives.get('source') != self.image.name
+
+    def srcset(self, fmt):
+        """`srcset` attribute value for one derivative format."""
+        entries = self.derivatives.get('formats', {}).get(fmt, [])
+        return ', '.join(f'{self.image.storage.url(name)} {w}w' for w, name in entries)
+
+
+class OutboxMessage(models.Model):
+    """Queued outgoing email (contact form), delivered by `manage.py send_outbox`."""
+    STATUS_PENDING = 'pending'
+    # Claimed by a send_outbox worker until next_attempt_at (then due again)
+    STATUS_SENDING = 'sending'
+    STATUS_SENT = 'sent'
+    STATUS_DEAD = 'dead'
+    STATUS_CHOICES = [
+        (STATUS_PENDING, 'Pending'),
+        (STATUS_SENDING, 'Sending'),
+        (STATUS_SENT, 'Sent'),
+        (STATUS_DEAD, 'Dead letter'),
+    ]
+
+    subject = models.CharField(max_length=255)
+    body = models.TextField()
+    from_email = models.CharField(max_length=255)
+    to = models.TextField(help_text='Comma-separated recipient addresses')
+    reply_to = models.CharField(max_length=255, blank=True)
+    status = models.CharField(max_length=10, choices=STATUS_CHOICES, default=STATUS_PENDING)
+    attempts = models.PositiveIntegerField(default=0)
+    next_attempt_at = models.DateTimeField(default=timezone.now)
+    last_error = models.TextField(blank=True)
+    created_at = models.DateTimeField(auto_now_add=True)
+    sent_at = models.DateTimeField(null=True, blank=True)
+
+    class Meta:
+        ordering = ['created_at']
+        indexes = [
+            models.Index(fields=['status', 'next_attempt_at'], name='outbox_due_idx'),
+        ]
+
+    def __str__(self):
+        return f'{self.subject} ({self.status})'
+
+    def recipients(self):
+        return [a.strip() for a in self.to.split(',') if a.strip()]
+
+
+class ThrottleBucket(models.Model):
+    """Token bucket for one throttle scope and client (see portfolio.throttle)."""
+    key = models.CharField(max_length=64, unique=True, help_text='scope:hash of the client identifier')
+    tokens = models.FloatField()
+    updated = models.FloatField(help_text='Unix time tokens was last computed at')
+    expires_at = models.FloatField(db_index=True, help_text='Unix time the bucket is full again and can go')
+
+    def __str__(self):
+        return self.key
@@ -0,0 +1,150 @@
+"""
+Durable email outbox: requests enqueue, `manage.py send_outbox` delivers.
+"""
+from datetime import timedelta
+
+from django.conf import settings
+from django.core.mail import EmailMessage, get_connection
+from django.utils import timezone
+
+from .models import OutboxMessage
+
+
+def enqueue_mail(subject, message, from_email, recipient_list, reply_to=''):
+    """Store an email for background delivery and return the outbox row."""
+    return OutboxMessage.objects.create(
+        subject=subject,
+        body=message,
+        from_email=from_email,
+        to=','.join(recipient_list),
+        reply_to=reply_to,
+    )
+
+
+async def aenqueue_mail(subject, message, from_email, recipient_list, reply_to=''):
+    """Async variant of enqueue_mail for async views."""
+    return await OutboxMessage.objects.acreate(
+        subject=subject,
+        body=message,
+        from_email=from_email,
+        to=','.join(recipient_list),
+        reply_to=reply_to,
+    )
+
+
+def backoff_delay(attempts):
+    """Exponential backoff after the given number of failed attempts."""
+    base = getattr(settings, 'OUTBOX_BACKOFF_SECONDS', 60)
+    cap = getattr(settings, 'OUTBOX_BACKOFF_MAX_SECONDS', 60 * 60 * 6)
+    return timedelta(seconds=min(base * 2 ** (attempts - 1), cap))
+
+
+def claim_due(batch_size=50):
+    """
+    Claim up to batch_size due messages for this worker and return them.
+
+    Each row is taken with one UPDATE conditional on the status and
+    next_attempt_at just read, so concurrent workers never claim the same
+    message. A claim lasts OUTBOX_CLAIM_SECONDS (deliver_pending renews it
+    before each send): a message left in 'sending' by a crashed worker is
+    due again after that (and may be sent twice, if the crash came after
+    the mail server accepted it).
+    """
+    now = timezone.now()
+    lease_until = _lease_until(now)
+    due = OutboxMessage.objects.filter(
+        status__in=[OutboxMessage.STATUS_PENDING, OutboxMessage.STATUS_SENDING],
+        next_attempt_at__lte=now,
+    ).order_by('next_attempt_at')[:batch_size]
+    claimed = []
+    for msg in due:
+        won = OutboxMessage.objects.filter(
+            pk=msg.pk, status=msg.status, next_attempt_at=msg.next_attempt_at,
+        ).update(status=OutboxMessage.STATUS_SENDING, next_attempt_at=lease_until)
+        if won:
+            msg.status, msg.next_attempt_at = OutboxMessage.STATUS_SENDING, lease_until
+            claimed.append(msg)
+    return claimed
+
+
+def _lease_until(now):
+    return now + timedelta(seconds=getattr(settings, 'OUTBOX_CLAIM_SECONDS', 300))
+
+
+def _renew_claim(msg):
+    """
+    Extend this worker's claim on msg just before sending it, so a slow batch
+    never outlives the claim of a message it hasn't sent yet. False when the
+    claim has expired and another worker has taken the message.
+    """
+    lease_until = _lease_until(timezone.now())
+    renewed = OutboxMessage.objects.filter(
+        pk=msg.pk, status=OutboxMessage.STATUS_SENDING, next_attempt_at=msg.next_attempt_at,
+    ).update(next_attempt_at=lease_until)
+    if renewed:
+        msg.next_attempt_at = lease_until
+    return bool(renewed)
+
+
+def deliver_pending(batch_size=50, connection=None):
+    """
+    Send due outbox messages over a single email connection.
+
+    Messages are claimed first (claim_due), so several send_outbox workers
+    can run at once. Failed messages are rescheduled with exponential
+    backoff and moved to the dead-letter state after OUTBOX_MAX_ATTEMPTS.
+    Returns (sent, failed) counts.
+    """
+    max_attempts = getattr(settings, 'OUTBOX_MAX_ATTEMPTS', 5)
+    due = claim_due(batch_size)
+    if not due:
+        return 0, 0
+
+    sent = failed = 0
+    connection = connection or get_connection(fail_silently=False)
+    try:
+        connection.open()
+    except Exception as e:
+        # Could not reach the mail server: count an attempt for every message
+        for msg in due:
+            _record_failure(msg, e, max_attempts)
+        return 0, len(due)
+
+    try:
+        for msg in due:
+            if not _renew_claim(msg):
+                continue
+            email = EmailMessage(
+                subject=msg.subject,
+                body=msg.body,
+                from_email=msg.from_email,
+                to=msg.recipients(),
+                reply_to=[msg.reply_to] if msg.reply_to else None,
+                connection=connection,
+            )
+            try:
+                email.send(fail_silently=False)
+            except Exception as e:
+                _record_failure(msg, e, max_attempts)
+                failed += 1
+                continue
+            msg.status = OutboxMessage.STATUS_SENT
+            msg.attempts += 1
+            msg.sent_at = timezone.now()
+            msg.last_error = ''
+            msg.save(update_fields=['status', 'attempts', 'sent_at', 'last_error'])
+            sent += 1
+    finally:
+        connection.close()
+    return sent, failed
+
+
+def _record_failure(msg, error, max_attempts):
+    msg.attempts += 1
+    msg.last_error = f'{type(error).__name__}: {error}'
+    if msg.attempts >= max_attempts:
+        msg.status = OutboxMessage.STATUS_DEAD
+    else:
+        msg.status = OutboxMessage.STATUS_PENDING
+        msg.next_attempt_at = timezone.now() + backoff_delay(msg.attempts)
+    msg.save(update_fields=['status', 'attempts', 'last_error', 'next_attempt_at'])
@@ -0,0 +1,185 @@
+"""
+Full-text search over case studies.
+
+The index lives in its own table, kept in sync by model signals:
+- PostgreSQL: `portfolio_casestudy_search` (tsvector + GIN index), ranked by ts_rank.
+- SQLite: `portfolio_casestudy_fts` FTS5 virtual table, ranked by bm25.
+If neither is available (e.g. SQLite built without FTS5) search falls back to
+icontains scans.
+
+The PostgreSQL side is raw SQL rather than django.contrib.postgres.search.
+That module imports psycopg on import, which SQLite installs don't need. A
+SearchVectorField or GinIndex on CaseStudy would also make the migrations
+PostgreSQL-only. The statements are the ones SearchVector/SearchRank would
+generate: a stored, weighted to_tsvector document, @@ websearch_to_tsquery
+against its GIN index, ordered by ts_rank.
+"""
+import re
+from contextlib import nullcontext
+
+from django.db import DatabaseError, connection, transaction
+from django.db.models import Q
+
+from .models import CASE_STUDY_CARD_FIELDS, CaseStudy, split_tech_stack
+
+PG_TABLE = 'portfolio_casestudy_search'
+FTS_TABLE = 'portfolio_casestudy_fts'
+FIELDS = ('title', 'summary', 'problem', 'solution', 'key_results')
+TOKEN_RE = re.compile(r'\w+', re.UNICODE)
+
+PG_DOCUMENT = (
+    "setweight(to_tsvector('english', %s), 'A') || "
+    "setweight(to_tsvector('english', %s), 'B') || "
+    "setweight(to_tsvector('english', %s), 'B') || "
+    "setweight(to_tsvector('english', %s || ' ' || %s || ' ' || %s), 'C')"
+)
+
+
+def create_index_sql(vendor):
+    """DDL for the search index on the given database vendor."""
+    if vendor == 'postgresql':
+        return [
+            f'CREATE TABLE IF NOT EXISTS {PG_TABLE} ('
+            f'case_study_id bigint PRIMARY KEY REFERENCES portfolio_casestudy(id) ON DELETE CASCADE, '
+            f'document tsvector NOT NULL)',
+            f'CREATE INDEX IF NOT EXISTS {PG_TABLE}_document_gin ON {PG_TABLE} USING gin (document)',
+        ]
+    if vendor == 'sqlite':
+        return [
+            f'CREATE VIRTUAL TABLE IF NOT EXISTS {FTS_TABLE} USING fts5('
+            f'title, summary, tech, problem, solution, key_results, tokenize="porter unicode61")',
+        ]
+    return []
+
+
+def drop_index_sql(vendor):
+    if vendor == 'postgresql':
+        return [f'DROP TABLE IF EXISTS {PG_TABLE}']
+    if vendor == 'sqlite':
+        return [f'DROP TABLE IF EXISTS {FTS_TABLE}']
+    return []
+
+
+_index_tables = set()
+
+
+def _index_available():
+    table = {'postgresql': PG_TABLE, 'sqlite': FTS_TABLE}.get(connection.vendor)
+    if not table:
+        return False
+    if table not in _index_tables and table in connection.introspection.table_names():
+        _index_tables.add(table)
+    return table in _index_tables
+
+
+def _row(case_study):
+    tech = ' '.join(split_tech_stack(case_study.tech_stack))
+    return [case_study.pk, case_study.title, case_study.summary, tech,
+            case_study.problem, case_study.solution, case_study.key_results]
+
+
+def index_case_studies(case_studies):
+    """Insert or replace index rows for the given case studies."""
+    if not _index_available():
+        return
+    rows = [_row(cs) for cs in case_studies]
+    if not rows:
+        return
+    with connection.cursor() as cursor:
+        if connection.vendor == 'postgresql':
+            cursor.executemany(
+                f'INSERT INTO {PG_TABLE} (case_study_id, document) VALUES (%s, {PG_DOCUMENT}) '
+                f'ON CONFLICT (case_study_id) DO UPDATE SET document = EXCLUDED.document',
+                rows,
+            )
+        else:
+            cursor.executemany(f'DELETE FROM {FTS_TABLE} WHERE rowid = %s', [[r[0]] for r in rows])
+            cursor.executemany(
+                f'INSERT INTO {FTS_TABLE} (rowid, title, summary, tech, problem, solution, key_results) '
+                f'VALUES (%s, %s, %s, %s, %s, %s, %s)',
+                rows,
+            )
+
+
+def remove_case_study(pk):
+    if not _index_available():
+        return
+    table, column = (PG_TABLE, 'case_study_id') if connection.vendor == 'postgresql' else (FTS_TABLE, 'rowid')
+    with connection.cursor() as cursor:
+        cursor.execute(f'DELETE FROM {table} WHERE {column} = %s', [pk])
+
+
+def rebuild_index(batch_size=1000):
+    """Recreate the whole index from CaseStudy rows. Returns the row count."""
+    with connection.cursor() as cursor:
+        for sql in drop_index_sql(connection.vendor) + create_index_sql(connection.vendor):
+            cursor.execute(sql)
+    count = 0
+    batch = []
+    for cs in CaseStudy.objects.only('pk', 'tech_stack', *FIELDS).iterator(chunk_size=batch_size):
+        batch.append(cs)
+        if len(batch) >= batch_size:
+            index_case_studies(batch)
+            count += len(batch)
+            batch = []
+    index_case_studies(batch)
+    return count + len(batch)
+
+
+def _fts_query(query):
+    """Turn free text into a safe FTS5 query: every term, prefix-matched."""
+    return ' '.join(f'"{t}"*' for t in TOKEN_RE.findall(query))
+
+
+def search_ids(query, limit=50):
+    """Return ids of published case studies matching `query`, best first."""
+    if not TOKEN_RE.search(query or ''):
+        return []
+    if connection.vendor == 'postgresql' and _index_available():
+        sql = (
+            f"SELECT s.case_study_id FROM {PG_TABLE} s "
+            f"JOIN portfolio_casestudy c ON c.id = s.case_study_id, "
+            f"websearch_to_tsquery('english', %s) q "
+            f"WHERE c.is_published AND s.document @@ q "
+            f"ORDER BY ts_rank(s.document, q) DESC LIMIT %s"
+        )
+        params = [query, limit]
+    elif connection.vendor == 'sqlite' and _index_available():
+        # bm25 column weights: title, summary, tech, problem, solution, key_results
+        sql = (
+            f"SELECT f.rowid FROM {FTS_TABLE} f "
+            f"JOIN portfolio_casestudy c ON c.id = f.rowid "
+            f"WHERE {FTS_TABLE} MATCH %s AND c.is_published "
+            f"ORDER BY bm25({FTS_TABLE}, 10.0, 4.0, 4.0, 1.0, 1.0, 2.0) LIMIT %s"
+        )
+        params = [_fts_query(query), limit]
+    else:
+        return _fallback_ids(query, limit)
+    # Inside a transaction, a failed query aborts it on PostgreSQL, and the
+    # fallback below has to run in it: isolate the query in a savepoint. In
+    # autocommit there is nothing to protect, and an outermost atomic() would
+    # take SQLite's write lock (transaction_mode IMMEDIATE) for a read.
+    guard = transaction.atomic() if connection.in_atomic_block else nullcontext()
+    try:
+        with guard, connection.cursor() as cursor:
+            cursor.execute(sql, params)
+            return [row[0] for row in cursor.fetchall()]
+    except DatabaseError:
+        return _fallback_ids(query, limit)
+
+
+def _fallback_ids(query, limit):
+    qs = CaseStudy.objects.filter(is_published=True)
+    for term in TOKEN_RE.findall(query):
+        term_q = Q()
+        for field in FIELDS + ('tech_stack',):
+            term_q |= Q(**{f'{field}__icontains': term})
+        qs = qs.filter(term_q)
+    return list(qs.values_list('pk', flat=True)[:limit])
+
+
+def search(query, limit=50):
+    """Published case studies matching `query` in rank order (card fields only)."""
+    ids = search_ids(query, limit)
+    by_pk = CaseStudy.objects.filter(is_published=True).only(*CASE_STUDY_CARD_FIELDS).in_bulk(ids)
+    return [by_pk[pk] for pk in ids if pk in by_pk]
@@ -0,0 +1,208 @@
+"""
+Sitemap, Atom feed and JSON-LD for published case studies.
+
+Generated documents are cached by content version (see portfolio.cache), so
+they are rebuilt only after an edit. Their validators are cached the same way
+(cached_published_validators), so a crawler revalidating with If-None-Match /
+If-Modified-Since gets a 304 without touching the database. The sitemap is streamed from a chunked
+queryset and splits into a sitemap index past the 50,000 URL limit.
+"""
+import json
+import math
+from xml.sax.saxutils import escape
+
+from django.conf import settings
+from django.core.cache import cache
+from django.http import HttpResponse, StreamingHttpResponse
+from django.urls import reverse
+from django.utils.feedgenerator import Atom1Feed
+
+from .cache import get_content_version
+from .conditional import cached_published_validators
+from .models import CaseStudy, CaseStudyImage, split_tech_stack
+
+SEO_KEY_PREFIX = 'portfolio:seo'
+# sitemaps.org: at most 50,000 URLs per sitemap file
+SITEMAP_MAX_URLS = 50_000
+SITEMAP_CHUNK_SIZE = 2000
+STATIC_PAGES = ('portfolio:home', 'portfolio:casestudy_list')
+FEED_ITEMS = 20
+
+SITEMAP_CONTENT_TYPE = 'application/xml; charset=utf-8'
+URLSET_OPEN = (
+    '<?xml version="1.0" encoding="UTF-8"?>\n'
+    '<urlset xmlns="http://www.sitemaps.org/schemas/sitemap/0.9"'
+    ' xmlns:image="http://www.google.com/schemas/sitemap-image/1.1">\n'
+)
+SITEMAPINDEX_OPEN = (
+    '<?xml version="1.0" encoding="UTF-8"?>\n'
+    '<sitemapindex xmlns="http://www.sitemaps.org/schemas/sitemap/0.9">\n'
+)
+# Keep "</script>" and friends out of inline JSON
+JSON_SCRIPT_ESCAPES = {ord('<'): '\\u003C', ord('>'): '\\u003E', ord('&'): '\\u0026'}
+
+
+def site_url(url):
+    """Absolute URL on the canonical https://SITE_DOMAIN (already absolute URLs pass through)."""
+    if url.startswith(('http://', 'https://')):
+        return url
+    return f'https://{settings.SITE_DOMAIN}{url}'
+
+
+def _cache_key(name):
+    return f'{SEO_KEY_PREFIX}:{get_content_version()}:{name}'
+
+
+def _published():
+    return CaseStudy.objects.filter(is_published=True)
+
+
+def sitemap_sections():
+    """Number of sitemap files needed (the static pages go in the first one)."""
+    per_section = SITEMAP_MAX_URLS - len(STATIC_PAGES)
+    return cache.get_or_set(
+        _cache_key('sitemap-sections'),
+        lambda: max(1, math.ceil(_published().count() / per_section)),
+        settings.PAGE_CACHE_TIMEOUT,
+    )
+
+
+def _url_entry(loc, lastmod=None, images=()):
+    parts = [f'<url><loc>{escape(loc)}</loc>']
+    if lastmod is not None:
+        parts.append(f'<lastmod>{lastmod.isoformat(timespec="seconds")}</lastmod>')
+    for image in images:
+        parts.append(f'<image:image><image:loc>{escape(image)}</image:loc></image:image>')
+    parts.append('</url>\n')
+    return ''.join(parts)
+
+
+def _section_rows(section):
+    """Yield lists of (pk, slug, updated_at) for one sitemap section, keyset-paginated by pk."""
+    per_section = SITEMAP_MAX_URLS - len(STATIC_PAGES)
+    rows = _published().order_by('pk')
+    if section > 1:
+        rows = rows.filter(pk__gt=rows.values_list('pk', flat=True)[(section - 1) * per_section - 1])
+    remaining, last_pk = per_section, None
+    while remaining > 0:
+        page = rows if last_pk is None else rows.filter(pk__gt=last_pk)
+        chunk = list(page.values_list('pk', 'slug', 'updated_at')[:min(SITEMAP_CHUNK_SIZE, remaining)])
+        if not chunk:
+            return
+        yield chunk
+        remaining -= len(chunk)
+        last_pk = chunk[-1][0]
+
+
+def _image_urls(first_pk, last_pk):
+    """{case study pk: [absolute image URL, ...]} for published case studies in a pk range."""
+    storage = CaseStudyImage._meta.get_field('image').storage
+    images = (
+        CaseStudyImage.objects
+        .filter(case_study_id__gte=first_pk, case_study_id__lte=last_pk, case_study__is_published=True)
+        .exclude(image='')
+        .order_by('case_study_id', 'order')
+        .values_list('case_study_id', 'image')
+    )
+    urls = {}
+    for pk, name in images:
+        urls.setdefault(pk, []).append(site_url(storage.url(name)))
+    return urls
+
+
+def sitemap_chunks(section=1):
+    """Yield the <urlset> for one section as encoded chunks, two queries per chunk of rows."""
+    yield URLSET_OPEN.encode()
+    if section == 1:
+        _, last_modified = cached_published_validators(None)
+        yield ''.join(_url_entry(site_url(reverse(name)), last_modified) for name in STATIC_PAGES).encode()
+
+    # Reverse once; slugs never contain the '/' that follows them
+    prefix, suffix = site_url(reverse('portfolio:casestudy_detail', args=['slug'])).rsplit('slug', 1)
+    for chunk in _section_rows(section):
+        images = _image_urls(chunk[0][0], chunk[-1][0])
+        yield ''.join(
+            _url_entry(f'{prefix}{slug}{suffix}', updated_at, images.get(pk, ()))
+            for pk, slug, updated_at in chunk
+        ).encode()
+    yield b'</urlset>\n'
+
+
+def sitemap_index_chunks(sections):
+    _, last_modified = cached_published_validators(None)
+    lastmod = f'<lastmod>{last_modified.isoformat(timespec="seconds")}</lastmod>' if last_modified else ''
+    yield SITEMAPINDEX_OPEN.encode()
+    for section in range(1, sections + 1):
+        loc = site_url(reverse('portfolio:sitemap_section', args=[section]))
+        yield f'<sitemap><loc>{escape(loc)}</loc>{lastmod}</sitemap>\n'.encode()
+    yield b'</sitemapindex>\n'
+
+
+def cached_stream(name, chunks, content_type):
+    """
+    Serve a cached document, or stream `chunks()` while keeping a copy
+    that is cached once the whole document has been sent.
+    """
+    key = _cache_key(name)
+    content = cache.get(key)
+    if content is not None:
+        return HttpResponse(content, content_type=content_type)
+
+    def tee():
+        parts = []
+        for chunk in chunks():
+            parts.append(chunk)
+            yield chunk
+        # Only complete documents are cached (a dropped client stops the generator)
+        cache.set(key, b''.join(parts), settings.PAGE_CACHE_TIMEOUT)
+
+    return StreamingHttpResponse(tee(), content_type=content_type)
+
+
+def atom_feed():
+    """Atom document for the most recently updated case studies."""
+    feed = Atom1Feed(
+        title=f'{settings.SITE_NAME} — Projects',
+        link=site_url(reverse('portfolio:casestudy_list')),
+        description=settings.SITE_DESCRIPTION,
+        subtitle=settings.SITE_DESCRIPTION,
+        feed_url=site_url(reverse('portfolio:feed')),
+        author_name=settings.SITE_NAME,
+        language='en',
+    )
+    fields = ('slug', 'title', 'summary', 'tech_stack', 'created_at', 'updated_at')
+    for cs in _published().only(*fields).order_by('-updated_at', '-pk')[:FEED_ITEMS]:
+        link = site_url(reverse('portfolio:casestudy_detail', args=[cs.slug]))
+        feed.add_item(
+            title=cs.title,
+            link=link,
+            unique_id=link,
+            description=cs.summary,
+            pubdate=cs.created_at,
+            updateddate=cs.updated_at,
+            categories=split_tech_stack(cs.tech_stack),
+        )
+    return feed.writeString('utf-8')
+
+
+def case_study_json_ld(case_study):
+    """schema.org Article for a case study detail page, as a JSON string safe to inline."""
+    url = site_url(reverse('portfolio:casestudy_detail', args=[case_study.slug]))
+    data = {
+        '@context': 'https://schema.org',
+        '@type': 'Article',
+        'headline': case_study.title,
+        'description': case_study.summary,
+        'url': url,
+        'mainEntityOfPage': url,
+        'datePublished': case_study.created_at.isoformat(timespec='seconds'),
+        'dateModified': case_study.updated_at.isoformat(timespec='seconds'),
+        'author': {'@type': 'Person', 'name': settings.SITE_NAME, 'url': site_url('/')},
+        'keywords': case_study.tech_list(),
+    }
+    images = [site_url(img.image.url) for img in case_study.images.all() if img.image]
+    if images:
+        data['image'] = images
+    if case_study.github_link:
+        data['sameAs'] = case_study.github_link
+    return json.dumps(data, ensure_ascii=False).translate(JSON_SCRIPT_ESCAPES)
@@ -0,0 +1,58 @@
+"""
+Signal handlers: invalidate cached pages, sync the search index and build image
+derivatives on content changes.
+"""
+import logging
+
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from .cache import bump_content_version
+from .images import NO_DERIVATIVES, build_derivatives, delete_derivatives
+from .models import CaseStudy, CaseStudyImage
+from .search import index_case_studies, remove_case_study
+
+logger = logging.getLogger(__name__)
+
+
+@receiver(post_save, sender=CaseStudy)
+@receiver(post_delete, sender=CaseStudy)
+@receiver(post_save, sender=CaseStudyImage)
+@receiver(post_delete, sender=CaseStudyImage)
+def content_changed(sender, **kwargs):
+    bump_content_version()
+
+
+@receiver(post_save, sender=CaseStudy)
+def update_search_index(sender, instance, **kwargs):
+    index_case_studies([instance])
+
+
+@receiver(post_delete, sender=CaseStudy)
+def remove_from_search_index(sender, instance, **kwargs):
+    remove_case_study(instance.pk)
+
+
+@receiver(post_save, sender=CaseStudyImage)
+def generate_image_derivatives(sender, instance, raw=False, **kwargs):
+    if raw or not instance.needs_derivatives():
+        return
+    old = instance.derivatives
+    try:
+        fields = build_derivatives(instance.image.name)
+    except OSError:
+        # Missing or unreadable upload: the old derivatives show an earlier
+        # upload, so serve the original instead and rebuild later
+        logger.exception('Could not build derivatives for %s', instance.image.name)
+        fields = NO_DERIVATIVES
+    # Point the row at the new files before the old ones go
+    CaseStudyImage.objects.filter(pk=instance.pk).update(**fields)
+    for name, value in fields.items():
+        setattr(instance, name, value)
+    delete_derivatives(old, keep=fields['derivatives'])
+    bump_content_version()
+
+
+@receiver(post_delete, sender=CaseStudyImage)
+def remove_image_derivatives(sender, instance, **kwargs):
+    delete_derivatives(instance.derivatives)
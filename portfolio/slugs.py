@@ -0,0 +1,64 @@
+"""
+Slug resolution for the case study detail pages.
+
+`/projects/<slug>/` is resolved to (pk, current slug) through a per-process
+LRU map that is dropped whenever the content version changes, so a warm lookup
+runs no query and the page is then read by primary key. A miss costs at most
+two unique-index lookups: the live slug, then SlugHistory for retired ones,
+which redirect (301) to the current URL.
+"""
+import threading
+from collections import OrderedDict
+
+from django.http import HttpResponsePermanentRedirect
+from django.urls import reverse
+
+from .cache import get_content_version
+from .models import CaseStudy, SlugHistory
+
+SLUG_CACHE_SIZE = 10000
+_MISSING = object()
+
+_lock = threading.Lock()
+_slugs = OrderedDict()
+_version = None
+
+
+def resolve_slug(slug):
+    """(pk, current slug) of the published case study a slug belongs to, or None."""
+    global _version
+    version = get_content_version()
+    with _lock:
+        if version != _version:
+            _slugs.clear()
+            _version = version
+        found = _slugs.get(slug, _MISSING)
+        if found is not _MISSING:
+            _slugs.move_to_end(slug)
+            return found
+    found = _lookup(slug)
+    with _lock:
+        # Don't store a result read under an older version than the map's
+        if version == _version:
+            _slugs[slug] = found
+            if len(_slugs) > SLUG_CACHE_SIZE:
+                _slugs.popitem(last=False)
+    return found
+
+
+def _lookup(slug):
+    row = CaseStudy.objects.filter(slug=slug, is_published=True).values_list('pk', 'slug').first()
+    if row is None:
+        row = (
+            SlugHistory.objects.filter(slug=slug, case_study__is_published=True)
+            .values_list('case_study_id', 'case_study__slug').first()
+        )
+    return tuple(row) if row else None
+
+
+def slug_redirect(request, url_name, slug):
+    """301 to url_name for the current slug, keeping the query string."""
+    url = reverse(url_name, kwargs={'slug': slug})
+    if request.META.get('QUERY_STRING'):
+        url = f'{url}?{request.META["QUERY_STRING"]}'
+    return HttpResponsePermanentRedirect(url)
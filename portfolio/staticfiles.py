@@ -0,0 +1,31 @@
+"""
+Static files storage that runs the asset pipeline (portfolio/assets.py) as part
+of collectstatic.
+"""
+from django.core.files.base import ContentFile
+from whitenoise.storage import CompressedManifestStaticFilesStorage
+
+from . import assets
+
+
+class AssetPipelineStorage(CompressedManifestStaticFilesStorage):
+    """
+    Write the minified bundles and per-page critical CSS into STATIC_ROOT, then
+    let the manifest storage fingerprint them and WhiteNoise compress them
+    along with every collected file.
+    """
+
+    def post_process(self, paths, dry_run=False, **options):
+        if not dry_run and assets.CSS_SOURCE in paths and assets.JS_SOURCE in paths:
+            for name, text in assets.build(self._source(paths, assets.CSS_SOURCE),
+                                           self._source(paths, assets.JS_SOURCE)).items():
+                if self.exists(name):
+                    self.delete(name)
+                self.save(name, ContentFile(text.encode()))
+                paths[name] = (self, name)
+        yield from super().post_process(paths, dry_run=dry_run, **options)
+
+    def _source(self, paths, name):
+        storage, path = paths[name]
+        with storage.open(path) as f:
+            return f.read().decode()
@@ -0,0 +1,75 @@
+"""
+Media storage with content-hashed file names and precompressed siblings.
+
+Every saved file gets a hash of its bytes in the name
+(`case_studies/2026/10/shot.3f2a9c0d1b7e.png`), so a URL never changes
+meaning and can be cached as immutable. Compressible files (SVG, JSON,
+text…) also get `.br` / `.gz` siblings, which portfolio.media.serve_media
+negotiates.
+"""
+import hashlib
+import os
+import re
+
+from django.core.files import File
+from django.core.files.storage import FileSystemStorage
+
+HASH_LENGTH = 12
+# When the hashed name is taken, get_available_name adds `_abc1234` to the stem
+# (shot_abc1234.<hash>.png); the name still only ever holds those bytes
+HASHED_NAME_RE = re.compile(r'\.[0-9a-f]{%d}\.[A-Za-z0-9]+$' % HASH_LENGTH)
+# The name passed to save(): the stem without the collision suffix, and the extension
+ORIGINAL_NAME_RE = re.compile(r'^(.+?)(?:_[A-Za-z0-9]{7})?\.[0-9a-f]{%d}(\.[A-Za-z0-9]+)$' % HASH_LENGTH)
+COMPRESSED_SUFFIXES = ('.br', '.gz')
+# Already-compressed formats WhiteNoise doesn't know about
+EXTRA_SKIP_COMPRESS_EXTENSIONS = ('avif', 'pdf')
+
+
+def is_hashed_name(name):
+    return bool(HASHED_NAME_RE.search(name))
+
+
+def original_name(name):
+    """The name a file was saved under, before hashing (shot_abc1234.3f2a9c0d1b7e.png -> shot.png)."""
+    directory, base = os.path.split(name)
+    match = ORIGINAL_NAME_RE.match(base)
+    return os.path.join(directory, ''.join(match.groups())) if match else name
+
+
+class HashedMediaStorage(FileSystemStorage):
+    """FileSystemStorage that content-hashes names and precompresses text-like files."""
+
+    def save(self, name, content, max_length=None):
+        if name is None:
+            name = content.name
+        if not hasattr(content, 'chunks'):
+            content = File(content, name)
+        # Identical uploads still get separate files (Django adds a suffix),
+        # so deleting one image never removes another image's file
+        name = super().save(self.hashed_name(name, content), content, max_length=max_length)
+        self.compress(name)
+        return name
+
+    def hashed_name(self, name, content):
+        digest = hashlib.sha256()
+        for chunk in content.chunks():
+            digest.update(chunk)
+        content.seek(0)
+        root, ext = os.path.splitext(name)
+        return f'{root}.{digest.hexdigest()[:HASH_LENGTH]}{ext}'
+
+    def compress(self, name):
+        """Write .br/.gz siblings when the file type compresses well."""
+        # Imported on first upload so the media URLconf doesn't load brotli
+        from whitenoise.compress import Compressor
+
+        skip = Compressor.SKIP_COMPRESS_EXTENSIONS + EXTRA_SKIP_COMPRESS_EXTENSIONS
+        compressor = Compressor(extensions=skip, quiet=True)
+        if compressor.should_compress(name):
+            compressor.compress(self.path(name))
+
+    def delete(self, name):
+        super().delete(name)
+        for suffix in COMPRESSED_SUFFIXES:
+            if super().exists(name + suffix):
+                super().delete(name + suffix)
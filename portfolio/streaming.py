@@ -0,0 +1,67 @@
+"""
+Streaming HTML for long lists.
+
+The page template is rendered once with a placeholder where the rows go and
+split there. The head is sent first, then the rows are rendered in chunks of
+STREAM_CHUNK_SIZE as they come from the database cursor, then the tail. Neither
+the rows nor the page are held in memory whole, so the time to first byte and
+peak memory don't grow with the list.
+"""
+from itertools import islice
+
+from django.http import StreamingHttpResponse
+from django.template.loader import get_template, render_to_string
+from django.utils.safestring import mark_safe
+
+STREAM_CHUNK_SIZE = 200
+STREAM_MARKER = '<!-- portfolio:stream -->'
+
+
+def _frame(request, template_name, context):
+    """(head, tail) of the page around the rows."""
+    page = render_to_string(template_name, {**context, 'stream_placeholder': mark_safe(STREAM_MARKER)}, request)
+    head, tail = page.split(STREAM_MARKER, 1)
+    return head, tail
+
+
+def _response(chunks):
+    return StreamingHttpResponse(chunks, content_type='text/html; charset=utf-8')
+
+
+def stream_template(request, template_name, context, rows, rows_template, rows_name, chunk_size=STREAM_CHUNK_SIZE):
+    """
+    Stream template_name with rows (an iterable, e.g. `.values().iterator()`)
+    rendered through rows_template, which gets each chunk as `rows_name`.
+    template_name must output `{{ stream_placeholder }}` where the rows go.
+    """
+    head, tail = _frame(request, template_name, context)
+    rows_template = get_template(rows_template)
+
+    def chunks():
+        yield head
+        iterator = iter(rows)
+        while batch := list(islice(iterator, chunk_size)):
+            yield rows_template.render({rows_name: batch})
+        yield tail
+
+    return _response(chunks())
+
+
+def astream_template(request, template_name, context, rows, rows_template, rows_name, chunk_size=STREAM_CHUNK_SIZE):
+    """stream_template for async views; rows is an async iterable (e.g. `.values().aiterator()`)."""
+    head, tail = _frame(request, template_name, context)
+    rows_template = get_template(rows_template)
+
+    async def chunks():
+        yield head
+        batch = []
+        async for row in rows:
+            batch.append(row)
+            if len(batch) == chunk_size:
+                yield rows_template.render({rows_name: batch})
+                batch = []
+        if batch:
+            yield rows_template.render({rows_name: batch})
+        yield tail
+
+    return _response(chunks())
@@ -0,0 +1,25 @@
+"""
+Template tags for the asset pipeline.
+
+Usage: {% load portfolio_assets %}{% page_styles %} … {% page_script %}
+"""
+from django import template
+from django.utils.html import format_html
+
+from .. import assets
+
+register = template.Library()
+
+
+@register.simple_tag(takes_context=True)
+def page_styles(context):
+    """Fonts plus the page's inline critical CSS and async stylesheet (or a plain link)."""
+    request = context.get('request')
+    match = getattr(request, 'resolver_match', None)
+    return assets.stylesheet_tags(match.url_name if match else None)
+
+
+@register.simple_tag
+def page_script():
+    """The site script, deferred so it never blocks parsing."""
+    return format_html('<script src="{}" defer></script>', assets.script_url())
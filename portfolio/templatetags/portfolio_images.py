@@ -0,0 +1,41 @@
+"""
+Template tags for responsive CaseStudyImage markup.
+
+Usage: {% load portfolio_images %}{% responsive_image img alt=case_study.title %}
+"""
+from django import template
+from django.utils.html import format_html, format_html_join
+
+from ..images import FORMATS
+
+register = template.Library()
+
+DEFAULT_SIZES = '(max-width: 860px) 100vw, 800px'
+
+
+@register.simple_tag
+def responsive_image(img, alt='', sizes=DEFAULT_SIZES, loading='lazy'):
+    """Emit <picture> with AVIF/WebP sources and a JPEG <img> fallback."""
+    alt = img.alt_text or alt
+    formats = img.derivatives.get('formats', {})
+    dims = format_html(' width="{}" height="{}"', img.width, img.height) if img.width else ''
+    style = format_html(
+        ' style="background-size:cover;background-image:url({})"', img.placeholder
+    ) if img.placeholder else ''
+
+    if not formats.get('jpeg'):
+        return format_html(
+            '<img src="{}" alt="{}" loading="{}" decoding="async"{}{}>',
+            img.image.url, alt, loading, dims, style,
+        )
+
+    sources = format_html_join(
+        '', '<source type="{}" srcset="{}" sizes="{}">',
+        ((FORMATS[fmt][2], img.srcset(fmt), sizes) for fmt in formats if fmt != 'jpeg'),
+    )
+    jpeg = formats['jpeg']
+    fallback = next((name for w, name in jpeg if w >= 800), jpeg[-1][1])
+    return format_html(
+        '<picture>{}<img src="{}" srcset="{}" sizes="{}" alt="{}" loading="{}" decoding="async"{}{}></picture>',
+        sources, img.image.storage.url(fallback), img.srcset('jpeg'), sizes, alt, loading, dims, style,
+    )
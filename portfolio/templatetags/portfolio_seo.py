@@ -0,0 +1,18 @@
+"""
+Template tags for structured data.
+
+Usage: {% load portfolio_seo %}{% case_study_json_ld case_study %}
+"""
+from django import template
+from django.utils.html import format_html
+from django.utils.safestring import mark_safe
+
+from ..seo import case_study_json_ld as build_json_ld
+
+register = template.Library()
+
+
+@register.simple_tag
+def case_study_json_ld(case_study):
+    """Emit a schema.org Article <script type="application/ld+json"> for a case study."""
+    return format_html('<script type="application/ld+json">{}</script>', mark_safe(build_json_ld(case_study)))
@@ -0,0 +1,693 @@
+"""
+Tests for the portfolio app.
+
+Run with `python manage.py test portfolio`. Caches are per-test memory
+caches, static files are served unhashed (no collectstatic needed) and
+uploads go to a temporary MEDIA_ROOT.
+"""
+import io
+import json
+import shutil
+import tempfile
+import time
+from datetime import timedelta
+from pathlib import Path
+from unittest import mock
+
+from asgiref.sync import async_to_sync, sync_to_async
+from django.conf import settings
+from django.contrib.auth.models import User
+from django.core.cache import caches
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.core.management import call_command
+from django.http import HttpResponse
+from django.test import AsyncClient, RequestFactory, SimpleTestCase, TestCase, override_settings
+from django.urls import include, path, reverse
+from django.utils import timezone
+from django_otp.oath import TOTP
+from django_otp.plugins.otp_totp.models import TOTPDevice
+
+from .cache import bump_content_version, get_content_version
+from .models import CaseStudy, CaseStudyImage, OutboxMessage, ThrottleBucket
+from .images import derivative_files
+from . import async_views
+from .admin_custom import CustomOTPAdminSite
+from .assets import Usage, critical_css, minify_css, minify_js
+from .metrics import PerformanceMiddleware, registry
+from .outbox import claim_due, deliver_pending, enqueue_mail
+from .throttle import client_ip, consume, posted_username, throttle
+
+TEST_CACHES = {
+    alias: {'BACKEND': 'django.core.cache.backends.locmem.LocMemCache', 'LOCATION': f'portfolio-test-{alias}'}
+    for alias in ('default', 'state', 'fragments')
+}
+TEST_STORAGES = {
+    **settings.STORAGES,
+    'staticfiles': {'BACKEND': 'django.contrib.staticfiles.storage.StaticFilesStorage'},
+}
+
+# ROOT_URLCONF for tests of the ASGI (ASYNC_VIEWS) home page and of the 2FA
+# admin, which is admin.site only with ADMIN_2FA_ENABLED=True at start-up
+otp_admin = CustomOTPAdminSite()
+urlpatterns = [
+    path('', async_views.home),
+    path('admin/login/', throttle(('login_ip', client_ip), ('login_user', posted_username))(otp_admin.login)),
+    path('admin/', otp_admin.urls),
+    path('', include('portfolio_project.urls')),
+]
+
+
+@override_settings(
+    CACHES=TEST_CACHES, STORAGES=TEST_STORAGES, ASSET_PIPELINE_ENABLED=False, PAGE_CACHE_ENABLED=True,
+)
+class PortfolioTestCase(TestCase):
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls._media_root = tempfile.mkdtemp(prefix='portfolio-test-media-')
+        cls._media = override_settings(MEDIA_ROOT=cls._media_root)
+        cls._media.enable()
+
+    @classmethod
+    def tearDownClass(cls):
+        cls._media.disable()
+        shutil.rmtree(cls._media_root, ignore_errors=True)
+        super().tearDownClass()
+
+    def setUp(self):
+        for alias in TEST_CACHES:
+            caches[alias].clear()
+
+    @staticmethod
+    def case_study(title='Project', **fields):
+        defaults = {
+            'summary': f'{title} summary', 'problem': 'Problem', 'solution': 'Solution',
+            'tech_stack': 'Django, PostgreSQL', 'key_results': 'Results',
+        }
+        return CaseStudy.objects.create(title=title, **{**defaults, **fields})
+
+    @staticmethod
+    def png(size=(64, 48), mode='RGB'):
+        from PIL import Image
+
+        buffer = io.BytesIO()
+        # Fully transparent in RGBA mode
+        Image.new(mode, size).save(buffer, 'PNG')
+        return buffer.getvalue()
+
+    def image(self, case_study, name='shot.png', size=(64, 48), mode='RGB'):
+        return CaseStudyImage.objects.create(
+            case_study=case_study, image=SimpleUploadedFile(name, self.png(size, mode), 'image/png'),
+        )
+
+
+class PageCacheTests(PortfolioTestCase):
+    def test_edit_is_visible_after_the_page_cache_is_flooded(self):
+        case_study = self.case_study('Old title')
+        self.assertEqual(self.client.get('/projects/')['X-Page-Cache'], 'MISS')
+        case_study.title = 'New title'
+        case_study.save()
+        # Fill (and cull) the page cache with distinct URLs
+        default = settings.CACHES['default']
+        with self.settings(CACHES={**TEST_CACHES, 'default': {**default, 'OPTIONS': {'MAX_ENTRIES': 20}}}):
+            for i in range(100):
+                self.client.get(f'/projects/{i}/')
+                self.client.get(f'/?page={i}')
+        self.assertContains(self.client.get('/projects/'), '<h3>New title</h3>', html=False)
+
+    def test_content_version_restarts_above_older_versions(self):
+        version = bump_content_version()
+        time.sleep(0.01)
+        caches['state'].clear()
+        self.assertGreater(get_content_version(), version)
+
+    def test_unread_query_parameters_share_the_cached_page(self):
+        self.case_study()
+        self.assertEqual(self.client.get('/')['X-Page-Cache'], 'MISS')
+        self.assertEqual(self.client.get('/?utm_source=x')['X-Page-Cache'], 'HIT')
+        self.assertEqual(self.client.get('/?utm_source=y&b=2')['X-Page-Cache'], 'HIT')
+
+    def test_read_query_parameters_are_part_of_the_key(self):
+        for i in range(30):
+            self.case_study(f'Project {i}')
+        first = self.client.get('/projects/')
+        cursor = first.context['page_obj'].next_cursor
+        self.assertEqual(self.client.get(f'/projects/?cursor={cursor}')['X-Page-Cache'], 'MISS')
+        self.assertEqual(self.client.get(f'/projects/?cursor={cursor}&x=1')['X-Page-Cache'], 'HIT')
+
+    def test_signed_in_users_bypass_the_cache(self):
+        self.case_study()
+        self.client.get('/')
+        self.client.force_login(User.objects.create_superuser('admin', 'admin@example.com', 'pw'))
+        response = self.client.get('/')
+        self.assertEqual(response.status_code, 200)
+        self.assertNotIn('X-Page-Cache', response)
+
+    @override_settings(ROOT_URLCONF='portfolio.tests')
+    def test_signed_in_users_bypass_the_cache_in_async_views(self):
+        self.case_study()
+        user = User.objects.create_superuser('admin', 'admin@example.com', 'pw')
+        client = AsyncClient()
+        self.assertEqual(async_to_sync(client.get)('/')['X-Page-Cache'], 'MISS')
+        # The session and user are loaded from the database, not on the event loop
+        async_to_sync(client.aforce_login)(user)
+        response = async_to_sync(client.get)('/')
+        self.assertEqual(response.status_code, 200)
+        self.assertNotIn('X-Page-Cache', response)
+
+
+@override_settings(THROTTLE_ENABLED=True, THROTTLE_RATES={'contact': '5/h'})
+class ThrottleTests(PortfolioTestCase):
+    def test_bucket_empties_and_refills(self):
+        now = 1_000_000.0
+        self.assertEqual([consume('contact', '203.0.113.7', now)[0] for _ in range(6)], [True] * 5 + [False])
+        allowed, retry_after = consume('contact', '203.0.113.7', now)
+        self.assertFalse(allowed)
+        self.assertAlmostEqual(retry_after, 720)
+        self.assertTrue(consume('contact', '203.0.113.7', now + 720)[0])
+        self.assertFalse(consume('contact', '203.0.113.7', now + 720)[0])
+        self.assertTrue(consume('contact', '198.51.100.1', now)[0])
+
+    def test_flooding_the_page_cache_does_not_refill_the_bucket(self):
+        data = {'name': 'Bot', 'email': 'bot@example.com', 'message': 'Hello there, this is a message.'}
+        statuses = [self.client.post('/', data).status_code for _ in range(6)]
+        self.assertEqual(statuses[-1], 429)
+        for alias in TEST_CACHES:
+            caches[alias].clear()
+        self.assertEqual(self.client.post('/', data).status_code, 429)
+
+    def test_expired_buckets_are_pruned(self):
+        consume('contact', '203.0.113.7', 1_000_000.0)
+        consume('contact', '198.51.100.1', 1_000_000.0 + 2 * 60 * 60)
+        self.assertEqual(ThrottleBucket.objects.count(), 1)
+
+
+class ConditionalGetTests(PortfolioTestCase):
+    def setUp(self):
+        super().setUp()
+        self.first = self.case_study('First')
+        self.second = self.case_study('Second')
+        self.offset = 0
+
+    def later(self):
+        """Run the next content change a few seconds later (Last-Modified has second resolution)."""
+        self.offset += 5
+        return mock.patch('portfolio.cache.time.time', return_value=time.time() + self.offset)
+
+    def assert_revalidates(self, url, change):
+        response = self.client.get(url)
+        self.assertEqual(response.status_code, 200)
+        etag, last_modified = response['ETag'], response['Last-Modified']
+        self.assertEqual(self.client.get(url, HTTP_IF_NONE_MATCH=etag).status_code, 304)
+        self.assertEqual(self.client.get(url, HTTP_IF_MODIFIED_SINCE=last_modified).status_code, 304)
+        with self.later():
+            change()
+        self.assertEqual(self.client.get(url, HTTP_IF_NONE_MATCH=etag).status_code, 200)
+        self.assertEqual(self.client.get(url, HTTP_IF_MODIFIED_SINCE=last_modified).status_code, 200)
+
+    def test_edit(self):
+        def change():
+            self.second.title = 'Second, edited'
+            self.second.save()
+
+        self.assert_revalidates('/', change)
+
+    def test_delete(self):
+        self.assert_revalidates('/', self.second.delete)
+        self.assert_revalidates('/projects/', self.first.delete)
+
+    def test_unpublish(self):
+        self.assert_revalidates('/projects/', lambda: CaseStudy.objects.filter(pk=self.second.pk).update(
+            is_published=False) and bump_content_version())
+
+    def test_image_change(self):
+        self.assert_revalidates('/projects/', lambda: self.image(self.second))
+        self.assert_revalidates(f'/projects/{self.second.slug}/', lambda: self.second.images.get().delete())
+
+    def test_detail_page(self):
+        response = self.client.get(f'/projects/{self.first.slug}/')
+        self.assertEqual(
+            self.client.get(f'/projects/{self.first.slug}/', HTTP_IF_NONE_MATCH=response['ETag']).status_code, 304,
+        )
+
+
+class ImageDerivativeTests(PortfolioTestCase):
+    def setUp(self):
+        super().setUp()
+        self.case_study = self.case_study()
+
+    @staticmethod
+    def existing(names):
+        from django.core.files.storage import default_storage
+
+        return {name for name in names if default_storage.exists(name)}
+
+    def test_replacing_the_upload_swaps_the_files(self):
+        img = self.image(self.case_study, size=(900, 600))
+        old = derivative_files(img.derivatives)
+        self.assertEqual(self.existing(old), old)
+        img.image = SimpleUploadedFile('other.png', self.png((1000, 500)), 'image/png')
+        img.save()
+        img.refresh_from_db()
+        new = derivative_files(img.derivatives)
+        self.assertEqual((img.width, img.height), (1000, 500))
+        self.assertEqual(self.existing(new), new)
+        self.assertFalse(self.existing(old - new))
+
+    def test_unreadable_upload_falls_back_to_the_original(self):
+        img = self.image(self.case_study)
+        old = derivative_files(img.derivatives)
+        img.image = SimpleUploadedFile('broken.png', b'not an image', 'image/png')
+        with self.assertLogs('portfolio', 'ERROR'):
+            img.save()
+        img.refresh_from_db()
+        self.assertEqual(img.derivatives, {})
+        self.assertIsNone(img.width)
+        self.assertFalse(self.existing(old))
+        response = self.client.get(f'/projects/{self.case_study.slug}/')
+        self.assertNotContains(response, '<picture>')
+        self.assertContains(response, img.image.url)
+
+    def test_transparency_is_kept_except_in_jpeg(self):
+        from PIL import Image
+        from django.core.files.storage import default_storage
+
+        img = self.image(self.case_study, mode='RGBA')
+        formats = img.derivatives['formats']
+        with default_storage.open(formats['jpeg'][0][1]) as fh:
+            self.assertEqual(Image.open(fh).convert('RGB').getpixel((0, 0)), (255, 255, 255))
+        if 'webp' in formats:
+            with default_storage.open(formats['webp'][0][1]) as fh:
+                self.assertEqual(Image.open(fh).convert('RGBA').getpixel((0, 0))[3], 0)
+
+
+class ExportStaticTests(PortfolioTestCase):
+    def test_every_project_is_reachable_in_the_static_tree(self):
+        for i in range(30):
+            self.case_study(f'Project {i}')
+        out = Path(tempfile.mkdtemp(prefix='portfolio-test-export-'))
+        self.addCleanup(shutil.rmtree, out, ignore_errors=True)
+        call_command('export_static', output=str(out), stdout=io.StringIO())
+        listing = (out / 'projects' / 'index.html').read_text()
+        self.assertNotIn('?cursor=', listing)
+        self.assertIn('href="/projects/all/"', listing)
+        self.assertEqual((out / 'projects' / 'all' / 'index.html').read_text().count('class="card"'), 30)
+
+
+class AssetPipelineTests(SimpleTestCase):
+    def usage(self, markup):
+        usage = Usage()
+        usage.feed(markup)
+        return usage
+
+    def test_minify_css(self):
+        css = """
+            /* header */
+            a  >  b , .x ~ .y + .z { color : red ; margin : 0.5em  0 !important ; }
+            a :hover { color: blue }
+            .empty { }
+        """
+        self.assertEqual(
+            minify_css(css),
+            'a>b,.x~.y+.z{color:red;margin:.5em 0!important}a :hover{color:blue}',
+        )
+
+    def test_comments_and_braces_inside_strings_are_kept(self):
+        css = """
+            .q::before { content: "/* not a comment */"; } /* gone */
+            .u { background: url("a;b{c}.png"); }
+            .s { content: 'a  ,  b' }
+        """
+        self.assertEqual(
+            minify_css(css),
+            '.q::before{content:"/* not a comment */"}'
+            '.u{background:url("a;b{c}.png")}'
+            ".s{content:'a  ,  b'}",
+        )
+
+    def test_minify_at_rules(self):
+        css = """
+            @import url('x.css');
+            @media (min-width : 640px) and (max-width: 900px) { .a { color: red } .b { } }
+            @media print { .b { } }
+            @supports (display: grid) { @media screen { .a:hover { opacity: 0.25 } } }
+            @keyframes spin { from { transform: rotate(0deg) } to { transform: rotate(360deg) } }
+        """
+        self.assertEqual(
+            minify_css(css),
+            "@import url('x.css');"
+            '@media (min-width:640px) and (max-width:900px){.a{color:red}}'
+            '@supports (display:grid){@media screen{.a:hover{opacity:.25}}}'
+            '@keyframes spin{from{transform:rotate(0deg)}to{transform:rotate(360deg)}}',
+        )
+
+    def test_critical_css_keeps_only_rules_the_markup_uses(self):
+        usage = self.usage('<main class="hero"><a href="#" class="btn">Go</a><div data-open></div></main>')
+        css = """
+            @import url(x.css);
+            @font-face { font-family: X; src: url(x.woff2) }
+            .hero { animation: fade 1s }
+            .unused, .also-unused { color: red }
+            .btn:hover, .unused { color: blue }
+            [data-open] { display: block }
+            @media (min-width: 640px) { .unused { color: red } }
+            @supports (display: grid) { @media screen { .hero { display: grid } .gone { color: red } } }
+            @keyframes fade { from { opacity: 0 } to { opacity: 1 } }
+            @keyframes spin { to { transform: rotate(1turn) } }
+        """
+        self.assertEqual(
+            critical_css(css, usage),
+            '@font-face{font-family:X;src:url(x.woff2)}'
+            '.hero{animation:fade 1s}'
+            '.btn:hover{color:blue}'
+            '[data-open]{display:block}'
+            '@supports (display:grid){@media screen{.hero{display:grid}}}'
+            '@keyframes fade{from{opacity:0}to{opacity:1}}',
+        )
+
+    def test_minify_js(self):
+        js = "/*! licence */\n  // note\n  /* block\n     comment */\n  let a = 1\n\n  a++\n"
+        self.assertEqual(minify_js(js), '/*! licence */\nlet a = 1\na++\n')
+
+
+class ImportCaseStudiesTests(PortfolioTestCase):
+    def test_importing_the_same_file_again_adds_no_images(self):
+        source = Path(tempfile.mkdtemp(prefix='portfolio-test-import-'))
+        self.addCleanup(shutil.rmtree, source, ignore_errors=True)
+        (source / 'p.png').write_bytes(self.png())
+        record = {
+            'slug': 'p', 'title': 'P', 'summary': 'S', 'problem': 'P', 'solution': 'S',
+            'tech_stack': ['Django'], 'key_results': 'K', 'images': [{'src': 'p.png'}],
+        }
+        (source / 'case_studies.jsonl').write_text(json.dumps(record) + '\n')
+        for _ in range(2):
+            call_command(
+                'import_case_studies', str(source / 'case_studies.jsonl'), images_dir=str(source),
+                skip_derivatives=True, stdout=io.StringIO(), stderr=io.StringIO(),
+            )
+        self.assertEqual(CaseStudyImage.objects.count(), 1)
+
+
+class ReservedSlugTests(PortfolioTestCase):
+    def test_admin_form_refuses_a_reserved_slug(self):
+        from django.contrib import admin
+
+        form_class = admin.site._registry[CaseStudy].get_form(RequestFactory().get('/'))
+        data = {'title': 'All', 'summary': 'S', 'problem': 'P', 'solution': 'S', 'tech_stack': 'Django',
+                'key_results': 'K', 'order': 0}
+        for slug in ('all', 'search'):
+            form = form_class(data={**data, 'slug': slug})
+            self.assertFalse(form.is_valid())
+            self.assertIn('slug', form.errors)
+        self.assertTrue(form_class(data={**data, 'slug': ''}).is_valid())
+
+    def test_import_refuses_a_reserved_slug(self):
+        from .transfer import RecordError, parse_record
+
+        record = {'title': 'Search', 'summary': 'S', 'problem': 'P', 'solution': 'S', 'tech_stack': 'Django',
+                  'key_results': 'K'}
+        for line in (record, {**record, 'title': 'Other', 'slug': 'all'}):
+            with self.assertRaisesMessage(RecordError, 'reserved'):
+                parse_record(json.dumps(line))
+
+
+@override_settings(PAGE_CACHE_ENABLED=False)
+class QueryCountTests(PortfolioTestCase):
+    """Pages cost a fixed number of queries however many projects, images and tech tags there are."""
+
+    # validators, six cards
+    HOME_QUERIES = 2
+    # validators, one page of cards
+    LIST_QUERIES = 2
+    # slug lookup, validators, the case study, its images, its tech links
+    DETAIL_QUERIES = 5
+
+    def assert_queries(self, count, url):
+        # Cold: no page cache, and fragments and slug map cleared
+        for alias in TEST_CACHES:
+            caches[alias].clear()
+        with self.assertNumQueries(count):
+            self.assertEqual(self.client.get(url).status_code, 200)
+
+    def test_query_counts_do_not_grow_with_projects(self):
+        for n in (1, 8):
+            with self.subTest(projects=n):
+                CaseStudy.objects.all().delete()
+                case_studies = [
+                    self.case_study(f'Project {n}-{i}', tech_stack='Django, PostgreSQL, Redis') for i in range(n)
+                ]
+                for case_study in case_studies:
+                    self.image(case_study)
+                    self.image(case_study)
+                self.assert_queries(self.HOME_QUERIES, '/')
+                self.assert_queries(self.LIST_QUERIES, '/projects/')
+                self.assert_queries(self.DETAIL_QUERIES, f'/projects/{case_studies[-1].slug}/')
+
+
+@override_settings(
+    ROOT_URLCONF='portfolio.tests', ADMIN_2FA_ENABLED=True, THROTTLE_ENABLED=True,
+    PASSWORD_HASHERS=['django.contrib.auth.hashers.MD5PasswordHasher'],
+)
+class TwoFactorFlowTests(PortfolioTestCase):
+    """Admin sign-in: password, then QR setup the first time or a TOTP code after that."""
+
+    # Each throttled step takes a token from two buckets (IP and username or
+    # user): one UPDATE when the bucket exists, six queries when it is created.
+    LOGIN_GET_QUERIES = 0
+    # buckets (new), user, session create, last_login, devices, session save
+    FIRST_LOGIN_POST_QUERIES = 22
+    # session, user, devices, pending device created
+    SETUP_GET_QUERIES = 4
+    # session, user, buckets (new), devices, token check, confirm, session save
+    SETUP_POST_QUERIES = 20
+    # buckets, user, session create, last_login, devices, session save
+    LOGIN_POST_QUERIES = 12
+    # session, user, devices
+    VERIFY_GET_QUERIES = 3
+    # session, user, buckets, devices, token check, session save
+    VERIFY_POST_QUERIES = 9
+    # session, user, buckets, devices, failure counted on the device
+    VERIFY_FAILED_QUERIES = 6
+    # session, user, OTP device, recent actions
+    INDEX_QUERIES = 4
+
+    def setUp(self):
+        super().setUp()
+        User.objects.create_superuser('admin', 'admin@example.com', 'pw')
+
+    def step(self, queries, method, url, data=None, redirect=None):
+        with self.assertNumQueries(queries):
+            response = getattr(self.client, method)(url, data)
+        if redirect is None:
+            self.assertEqual(response.status_code, 200)
+        else:
+            self.assertRedirects(response, redirect, fetch_redirect_response=False)
+        return response
+
+    @staticmethod
+    def token(device):
+        device.refresh_from_db()
+        # TOTP refuses a code twice in one time step; forget the last one
+        device.last_t = -1
+        device.save(update_fields=['last_t'])
+        return f'{TOTP(device.bin_key, device.step, device.t0, device.digits, device.drift).token():0{device.digits}d}'
+
+    def test_first_sign_in_sets_up_the_device(self):
+        self.step(self.LOGIN_GET_QUERIES, 'get', '/admin/login/')
+        self.step(
+            self.FIRST_LOGIN_POST_QUERIES, 'post', '/admin/login/', {'username': 'admin', 'password': 'pw'},
+            reverse('admin:setup_2fa'),
+        )
+        # Not verified yet: the admin sends the user back to the code step
+        self.assertRedirects(self.client.get('/admin/'), '/admin/login/?next=/admin/', fetch_redirect_response=False)
+        self.assertRedirects(self.client.get('/admin/login/'), reverse('admin:setup_2fa'), fetch_redirect_response=False)
+        response = self.step(self.SETUP_GET_QUERIES, 'get', reverse('admin:setup_2fa'))
+        self.assertContains(response, '<svg')
+        self.assertContains(response, 'otpauth://')
+        device = TOTPDevice.objects.get()
+        self.step(self.SETUP_POST_QUERIES, 'post', reverse('admin:setup_2fa'), {'token': self.token(device)}, '/admin/')
+        self.step(self.INDEX_QUERIES, 'get', '/admin/')
+        device.refresh_from_db()
+        self.assertTrue(device.confirmed)
+
+    def set_up_device(self):
+        self.client.post('/admin/login/', {'username': 'admin', 'password': 'pw'})
+        self.client.get(reverse('admin:setup_2fa'))
+        device = TOTPDevice.objects.get()
+        self.client.post(reverse('admin:setup_2fa'), {'token': self.token(device)})
+        self.client.logout()
+        return device
+
+    def test_later_sign_in_asks_for_a_code(self):
+        device = self.set_up_device()
+        self.step(
+            self.LOGIN_POST_QUERIES, 'post', '/admin/login/', {'username': 'admin', 'password': 'pw'},
+            reverse('admin:verify_otp'),
+        )
+        self.step(self.VERIFY_GET_QUERIES, 'get', reverse('admin:verify_otp'))
+        self.step(self.VERIFY_POST_QUERIES, 'post', reverse('admin:verify_otp'), {'token': self.token(device)}, '/admin/')
+        self.step(self.INDEX_QUERIES, 'get', '/admin/')
+
+    def test_wrong_code_is_refused(self):
+        self.set_up_device()
+        self.client.post('/admin/login/', {'username': 'admin', 'password': 'pw'})
+        response = self.step(self.VERIFY_FAILED_QUERIES, 'post', reverse('admin:verify_otp'), {'token': '000000'})
+        self.assertContains(response, 'Invalid code')
+        self.assertRedirects(self.client.get('/admin/'), '/admin/login/?next=/admin/', fetch_redirect_response=False)
+
+
+@override_settings(METRICS_ENABLED=True, METRICS_SAMPLE_RATE=1.0, METRICS_SLOW_REQUEST_MS=0)
+class MetricsTests(PortfolioTestCase):
+    def setUp(self):
+        super().setUp()
+        self.case_study()
+        registry.reset()
+        self.addCleanup(registry.reset)
+
+    def queries_recorded(self):
+        return registry.histograms[('db_queries', 'unresolved')].sum
+
+    def test_sync_request_queries_are_counted(self):
+        def view(request):
+            return HttpResponse(str(len(list(CaseStudy.objects.all()))))
+
+        PerformanceMiddleware(view)(RequestFactory().get('/'))
+        self.assertEqual(self.queries_recorded(), 1)
+
+    def test_async_request_queries_are_counted(self):
+        # The ORM runs in a sync_to_async thread, not where the middleware runs
+        async def view(request):
+            await sync_to_async(list)(CaseStudy.objects.all())
+            await sync_to_async(CaseStudy.objects.count)()
+            return HttpResponse()
+
+        async_to_sync(PerformanceMiddleware(view))(RequestFactory().get('/'))
+        self.assertEqual(self.queries_recorded(), 2)
+
+    def test_unsampled_requests_are_not_timed(self):
+        def view(request):
+            return HttpResponse(str(CaseStudy.objects.count()))
+
+        with self.settings(METRICS_SAMPLE_RATE=0.0):
+            PerformanceMiddleware(view)(RequestFactory().get('/'))
+        self.assertNotIn(('db_queries', 'unresolved'), registry.histograms)
+        self.assertIn(('request_duration_seconds', 'unresolved'), registry.histograms)
+
+    def test_prometheus_endpoint_wants_a_verified_staff_session_with_2fa(self):
+        from .views import metrics
+
+        user = User.objects.create_superuser('admin', 'admin@example.com', 'pw')
+        for enabled, verified, status in ((False, False, 200), (True, False, 403), (True, True, 200)):
+            with self.subTest(enabled=enabled, verified=verified), self.settings(ADMIN_2FA_ENABLED=enabled):
+                request = RequestFactory().get('/metrics')
+                request.user = user
+                # What OTPMiddleware sets
+                user.is_verified = lambda verified=verified: verified
+                self.assertEqual(metrics(request).status_code, status)
+
+    def test_metrics_page_is_on_the_served_admin(self):
+        from django.contrib import admin
+        from .admin_custom import PortfolioAdminSite
+
+        self.assertEqual(reverse('admin:portfolio_metrics'), '/admin/metrics/')
+        self.assertIsInstance(admin.site._wrapped, PortfolioAdminSite)
+        # The password-only admin (ADMIN_2FA_ENABLED=False) has it too
+        user = User.objects.create_superuser('admin', 'admin@example.com', 'pw')
+        request = RequestFactory().get('/admin/metrics/')
+        request.user = user
+        response = PortfolioAdminSite().metrics_view(request)
+        self.assertContains(response, 'Performance metrics')
+
+
+class OutboxTests(PortfolioTestCase):
+    class Connection:
+        """Email backend stand-in that records sends and can run code before each one."""
+
+        def __init__(self, before_send=None):
+            self.sent, self.before_send = [], before_send
+
+        def open(self):
+            pass
+
+        def close(self):
+            pass
+
+        def send_messages(self, messages):
+            if self.before_send:
+                self.before_send(len(self.sent))
+            self.sent.extend(m.subject for m in messages)
+            return len(messages)
+
+    def setUp(self):
+        super().setUp()
+        for i in range(3):
+            enqueue_mail(f'Message {i}', 'Body', 'site@example.com', ['me@example.com'])
+
+    def test_concurrent_workers_send_each_message_once(self):
+        second = self.Connection()
+        first = self.Connection(before_send=lambda i: i == 0 and deliver_pending(connection=second))
+        self.assertEqual(deliver_pending(connection=first), (3, 0))
+        self.assertEqual(second.sent, [])
+        self.assertEqual(sorted(first.sent), ['Message 0', 'Message 1', 'Message 2'])
+        self.assertEqual(OutboxMessage.objects.filter(status=OutboxMessage.STATUS_SENT).count(), 3)
+
+    def test_claims_are_exclusive_until_they_expire(self):
+        self.assertEqual(len(claim_due()), 3)
+        self.assertEqual(claim_due(), [])
+        # The worker died mid-batch: its messages are due again after the claim
+        with mock.patch('portfolio.outbox.timezone.now', return_value=timezone.now() + timedelta(minutes=10)):
+            self.assertEqual(len(claim_due()), 3)
+
+    def test_slow_batch_outlives_its_claim(self):
+        clock = [timezone.now()]
+        second = self.Connection()
+
+        def before_send(i):
+            # Each send takes most of a claim period
+            clock[0] += timedelta(seconds=settings.OUTBOX_CLAIM_SECONDS - 10)
+            if i == 1:
+                # Another worker polls after the batch's first claim has expired:
+                # it takes the message not yet sent, not the one being sent
+                deliver_pending(connection=second)
+
+        first = self.Connection(before_send=before_send)
+        with mock.patch('portfolio.outbox.timezone.now', side_effect=lambda: clock[0]):
+            self.assertEqual(deliver_pending(connection=first), (2, 0))
+        self.assertEqual(first.sent, ['Message 0', 'Message 1'])
+        self.assertEqual(second.sent, ['Message 2'])
+
+    def test_failed_send_is_rescheduled(self):
+        connection = self.Connection()
+        connection.send_messages = mock.Mock(side_effect=OSError('refused'))
+        self.assertEqual(deliver_pending(connection=connection), (0, 3))
+        msg = OutboxMessage.objects.first()
+        self.assertEqual((msg.status, msg.attempts), (OutboxMessage.STATUS_PENDING, 1))
+        self.assertGreater(msg.next_attempt_at, timezone.now())
+
+
+class SearchTests(PortfolioTestCase):
+    # ranked ids from the index, their card fields; plus a savepoint and its
+    # release around the index query, as TestCase runs inside a transaction
+    SEARCH_QUERIES = 4
+
+    def test_results_are_not_page_cached(self):
+        for i in range(3):
+            self.case_study(f'Project {i}', tech_stack='Django, Redis' if i == 1 else 'Flask')
+        self.client.get('/projects/search/?q=warm')
+        for q in ('redis', 'redi', 'Project'):
+            with self.subTest(q=q), self.assertNumQueries(self.SEARCH_QUERIES):
+                response = self.client.get('/projects/search/', {'q': q})
+            self.assertNotIn('X-Page-Cache', response)
+        found = self.client.get('/projects/search/?q=redis').context['case_studies']
+        self.assertEqual([cs.title for cs in found], ['Project 1'])
+        self.assertEqual(len(self.client.get('/projects/search/?q=Project').context['case_studies']), 3)
+
+    def test_a_failing_index_query_falls_back_inside_a_transaction(self):
+        from django.db import transaction
+
+        self.case_study('Redis cache', tech_stack='Redis')
+        with mock.patch('portfolio.search._fts_query', return_value='"unterminated'), transaction.atomic():
+            # A broken MATCH expression must not leave the transaction unusable
+            found = self.client.get('/projects/search/?q=redis').context['case_studies']
+            self.assertEqual([cs.title for cs in found], ['Redis cache'])
+            self.assertEqual(CaseStudy.objects.count(), 1)
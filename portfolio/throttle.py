@@ -0,0 +1,165 @@
+"""
+Token-bucket throttling for abuse-prone POST endpoints (contact form, admin
+login, OTP verification).
+
+Buckets are ThrottleBucket rows, shared by all gunicorn workers. They are
+kept out of the page cache, which visitors can fill (and cull) with distinct
+URLs. A token is taken with one conditional UPDATE that refills and
+decrements in the database, so concurrent requests can't spend the same
+token. Rejections happen before form validation and password hashing.
+"""
+import hashlib
+import time
+from functools import wraps
+
+from asgiref.sync import iscoroutinefunction, sync_to_async
+from django.conf import settings
+from django.core.cache import cache
+from django.db import IntegrityError, transaction
+from django.db.models import F, Value
+from django.db.models.functions import Least
+from django.db.models.lookups import GreaterThanOrEqual
+from django.http import HttpResponse
+
+from .models import ThrottleBucket
+
+STATS_KEY_PREFIX = 'portfolio:throttle_stats'
+PERIODS = {'s': 1, 'm': 60, 'h': 60 * 60, 'd': 60 * 60 * 24}
+
+
+def parse_rate(rate):
+    """'5/m' -> (capacity 5, refilled over 60 seconds)."""
+    num, period = rate.split('/')
+    return int(num), PERIODS[period[0]]
+
+
+def client_ip(request):
+    """Client address; the first X-Forwarded-For hop only behind a trusted proxy."""
+    if getattr(settings, 'THROTTLE_TRUST_X_FORWARDED_FOR', False):
+        forwarded = request.META.get('HTTP_X_FORWARDED_FOR', '')
+        if forwarded:
+            return forwarded.split(',')[0].strip()
+    return request.META.get('REMOTE_ADDR', '')
+
+
+def posted_username(request):
+    return request.POST.get('username', '').strip().lower() or None
+
+
+def user_id(request):
+    return str(request.user.pk) if request.user.is_authenticated else None
+
+
+def consume(scope, ident, now=None):
+    """
+    Take one token from the bucket for (scope, ident).
+
+    Returns (allowed, retry_after_seconds). Scopes without a rate in
+    THROTTLE_RATES are not limited.
+    """
+    rate = getattr(settings, 'THROTTLE_RATES', {}).get(scope)
+    if not rate:
+        return True, 0
+    capacity, period = parse_rate(rate)
+    refill = capacity / period
+    now = time.time() if now is None else now
+    digest = hashlib.sha256(ident.encode()).hexdigest()[:24]
+    key = f'{scope}:{digest}'
+    bucket = ThrottleBucket.objects.filter(key=key)
+    # An idle bucket is full again after one period; it can go then
+    expires_at = now + period
+
+    available = Least(Value(float(capacity)), F('tokens') + (now - F('updated')) * refill)
+    for _ in range(2):
+        if bucket.filter(GreaterThanOrEqual(available, 1)).update(
+            tokens=available - 1, updated=now, expires_at=expires_at,
+        ):
+            return True, 0
+        row = bucket.values_list('tokens', 'updated').first()
+        if row is not None:
+            tokens = min(capacity, row[0] + (now - row[1]) * refill)
+            return False, (1 - tokens) / refill
+        try:
+            with transaction.atomic():
+                ThrottleBucket.objects.create(key=key, tokens=capacity - 1, updated=now, expires_at=expires_at)
+        except IntegrityError:
+            # Created by a concurrent request: take the token from that row
+            continue
+        ThrottleBucket.objects.filter(expires_at__lt=now).delete()
+        return True, 0
+    return False, 1 / refill
+
+
+def _count(scope, result):
+    key = f'{STATS_KEY_PREFIX}:{scope}:{result}'
+    cache.add(key, 0, None)
+    try:
+        cache.incr(key)
+    except ValueError:
+        pass
+
+
+def throttle_stats():
+    """{scope: {'allowed': n, 'rejected': n}} for every configured scope."""
+    scopes = getattr(settings, 'THROTTLE_RATES', {})
+    keys = [f'{STATS_KEY_PREFIX}:{s}:{r}' for s in scopes for r in ('allowed', 'rejected')]
+    values = cache.get_many(keys)
+    return {
+        scope: {r: values.get(f'{STATS_KEY_PREFIX}:{scope}:{r}', 0) for r in ('allowed', 'rejected')}
+        for scope in scopes
+    }
+
+
+def reset_throttle_stats():
+    scopes = getattr(settings, 'THROTTLE_RATES', {})
+    cache.delete_many([f'{STATS_KEY_PREFIX}:{s}:{r}' for s in scopes for r in ('allowed', 'rejected')])
+
+
+def check(request, rules):
+    """
+    Apply (scope, key_func) rules in order; stop at the first empty bucket.
+    Returns a 429 response, or None if the request may proceed.
+    """
+    if not getattr(settings, 'THROTTLE_ENABLED', True):
+        return None
+    for scope, key_func in rules:
+        ident = key_func(request)
+        if not ident:
+            continue
+        allowed, retry_after = consume(scope, ident)
+        _count(scope, 'allowed' if allowed else 'rejected')
+        if not allowed:
+            response = HttpResponse('Too many requests. Please try again later.', status=429,
+                                    content_type='text/plain; charset=utf-8')
+            response['Retry-After'] = str(max(1, round(retry_after)))
+            return response
+    return None
+
+
+def throttle(*rules, methods=('POST',)):
+    """
+    Rate-limit a view (or admin site method with `method_decorator`) with
+    token buckets. `rules` are (scope, key_func) pairs; rates come from
+    THROTTLE_RATES[scope]. Only `methods` are limited. Works with both sync
+    and async views.
+    """
+    def decorator(view_func):
+        if iscoroutinefunction(view_func):
+            async def wrapper(request, *args, **kwargs):
+                if request.method in methods:
+                    # Database and cache I/O: keep it off the event loop
+                    rejected = await sync_to_async(check, thread_sensitive=False)(request, rules)
+                    if rejected is not None:
+                        return rejected
+                return await view_func(request, *args, **kwargs)
+        else:
+            def wrapper(request, *args, **kwargs):
+                if request.method in methods:
+                    rejected = check(request, rules)
+                    if rejected is not None:
+                        return rejected
+                return view_func(request, *args, **kwargs)
+
+        return wraps(view_func)(wrapper)
+
+    return decorator
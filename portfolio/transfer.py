@@ -0,0 +1,118 @@
+"""
+JSONL import/export of case studies (see the import_case_studies and
+export_case_studies management commands).
+
+One case study per line:
+    {"slug": "...", "title": "...", "summary": "...", "problem": "...",
+     "solution": "...", "tech_stack": "Django, Redis" | ["Django", "Redis"],
+     "key_results": "...", "github_link": "", "demo_link": "", "order": 0,
+     "is_published": true, "images": [{"src": "...", "alt_text": "", "order": 0}]}
+
+Image `src` is an http(s) URL, an absolute path, or a path relative to the
+images directory (MEDIA_ROOT by default, which is what the export writes).
+"""
+import hashlib
+import json
+import os
+import urllib.request
+from pathlib import Path, PurePosixPath
+
+from django.core.files.base import ContentFile
+from django.core.files.storage import default_storage
+from django.utils.text import slugify
+
+from .models import RESERVED_SLUGS, CaseStudy, CaseStudyImage
+from .storage import original_name
+
+REQUIRED_FIELDS = ('title', 'summary', 'problem', 'solution', 'tech_stack', 'key_results')
+OPTIONAL_FIELDS = {'github_link': '', 'demo_link': '', 'order': 0, 'is_published': True}
+# Columns overwritten when an existing slug is imported again
+UPDATE_FIELDS = REQUIRED_FIELDS + tuple(OPTIONAL_FIELDS) + ('updated_at',)
+IMAGE_EXTENSIONS = {'.jpg', '.jpeg', '.png', '.gif', '.webp', '.avif'}
+FETCH_TIMEOUT = 30
+
+
+class RecordError(ValueError):
+    """A JSONL line that can't be imported."""
+
+
+def to_record(case_study, media_url=''):
+    """Serialise a case study (with prefetched images) to a JSON-able dict."""
+    record = {'slug': case_study.slug}
+    for field in REQUIRED_FIELDS + tuple(OPTIONAL_FIELDS):
+        record[field] = getattr(case_study, field)
+    record['images'] = [
+        {'src': media_url + img.image.name, 'alt_text': img.alt_text, 'order': img.order}
+        for img in case_study.images.all()
+        if img.image
+    ]
+    return record
+
+
+def parse_record(line):
+    """Validate one JSONL line; returns (CaseStudy, image dicts)."""
+    try:
+        data = json.loads(line)
+    except ValueError as e:
+        raise RecordError(f'invalid JSON: {e}')
+    if not isinstance(data, dict):
+        raise RecordError('expected a JSON object')
+    missing = [f for f in REQUIRED_FIELDS if not data.get(f)]
+    if missing:
+        raise RecordError(f'missing {", ".join(missing)}')
+    if isinstance(data['tech_stack'], list):
+        data['tech_stack'] = ', '.join(data['tech_stack'])
+    slug = data.get('slug') or slugify(data['title'])
+    if not slug:
+        raise RecordError('no slug and the title does not slugify')
+    if slug in RESERVED_SLUGS:
+        # Upserts skip model validation (validate_slug_not_reserved)
+        raise RecordError(f'slug "{slug}" is reserved; set another "slug"')
+    fields = {f: data[f] for f in REQUIRED_FIELDS}
+    fields.update({f: data.get(f, default) for f, default in OPTIONAL_FIELDS.items()})
+    images = data.get('images') or []
+    if not all(isinstance(img, dict) and img.get('src') for img in images):
+        raise RecordError('every image needs a "src"')
+    return CaseStudy(slug=slug, **fields), images
+
+
+def image_name(case_study, src):
+    """
+    Storage name for an imported image. It is derived from the case study
+    and the source, so importing the same file again maps to the same name.
+    """
+    ext = PurePosixPath(src.split('?', 1)[0]).suffix.lower()
+    if ext not in IMAGE_EXTENSIONS:
+        ext = '.jpg'
+    digest = hashlib.sha1(src.encode()).hexdigest()[:12]
+    field = CaseStudyImage._meta.get_field('image')
+    return field.generate_filename(None, f'{case_study.slug[:50]}-{digest}{ext}')
+
+
+def read_source(src, images_dir):
+    """Bytes of an image given as a URL or a (relative) file path."""
+    if src.startswith(('http://', 'https://')):
+        with urllib.request.urlopen(src, timeout=FETCH_TIMEOUT) as response:
+            return response.read()
+    path = Path(src)
+    if not path.is_absolute():
+        path = Path(images_dir) / path
+    return path.read_bytes()
+
+
+def store_image(src, name, images_dir):
+    """Fetch `src` and save it under `name` (runs in the import thread pool)."""
+    return default_storage.save(name, ContentFile(read_source(src, images_dir)))
+
+
+def existing_images(case_study_ids):
+    """
+    {case_study_id: {stored name, basename before hashing, ...}} for skipping
+    re-imports. Stored names carry a content hash (portfolio.storage), so an
+    image_name() is matched against the basename it was saved under.
+    """
+    seen = {}
+    rows = CaseStudyImage.objects.filter(case_study_id__in=case_study_ids).values_list('case_study_id', 'image')
+    for pk, name in rows:
+        seen.setdefault(pk, set()).update((name, os.path.basename(original_name(name))))
+    return seen
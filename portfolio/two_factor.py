@@ -0,0 +1,65 @@
+"""
+TOTP two-factor helpers shared by CustomOTPAdminSite and `manage.py setup_2fa`.
+
+Device state is loaded with one query and memoised on the request. QR codes
+are rendered as SVG (no Pillow round trip) and cached in process memory by
+provisioning URL, so they are never written to the shared cache on disk.
+"""
+from functools import lru_cache
+
+from django_otp.plugins.otp_totp.models import TOTPDevice
+from django_otp.util import random_hex
+
+DEFAULT_DEVICE_NAME = 'default'
+
+
+class DeviceState:
+    """A user's TOTP devices: the confirmed one (if any) and the pending setup device."""
+
+    def __init__(self, user, devices):
+        self.user = user
+        self.confirmed = next((d for d in devices if d.confirmed), None)
+        self.pending = next(
+            (d for d in devices if not d.confirmed and d.name == DEFAULT_DEVICE_NAME), None
+        )
+
+    def setup_device(self):
+        """The unconfirmed device to show during setup, created on first use."""
+        if self.pending is None:
+            self.pending = TOTPDevice.objects.create(
+                user=self.user, name=DEFAULT_DEVICE_NAME, key=random_hex(20), confirmed=False
+            )
+        return self.pending
+
+    def confirm(self, device):
+        device.confirmed = True
+        device.save(update_fields=['confirmed'])
+        self.confirmed, self.pending = device, None
+
+
+def device_state(user, request=None):
+    """Load all TOTP devices for `user` in one query (memoised per request)."""
+    if request is not None:
+        state = getattr(request, '_totp_device_state', None)
+        if state is not None and state.user.pk == user.pk:
+            return state
+    devices = list(TOTPDevice.objects.filter(user=user).order_by('pk'))
+    for device in devices:
+        # config_url and verification read device.user; don't fetch it again
+        device.user = user
+    state = DeviceState(user, devices)
+    if request is not None:
+        request._totp_device_state = state
+    return state
+
+
+@lru_cache(maxsize=64)
+def qr_svg(config_url):
+    """SVG markup of the QR code for a provisioning URL."""
+    import qrcode
+    from qrcode.image.svg import SvgPathImage
+
+    qr = qrcode.QRCode(border=4, image_factory=SvgPathImage)
+    qr.add_data(config_url)
+    qr.make(fit=True)
+    return qr.make_image().to_string(encoding='unicode')
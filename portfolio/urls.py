@@ -1,14 +1,38 @@
 """
 Portfolio URL configuration. Clean URLs for SEO.
 """
+from django.conf import settings
 from django.urls import path
-from . import views
+from . import api, async_views, views
 
 app_name = 'portfolio'
 
+if settings.ASYNC_VIEWS:
+    # ASGI deployment: async views for the public pages
+    home = async_views.home
+    cv_download = async_views.cv_download
+    casestudy_list = async_views.casestudy_list
+    casestudy_list_all = async_views.casestudy_list_all
+    casestudy_detail = async_views.casestudy_detail
+else:
+    home = views.home
+    cv_download = views.cv_download
+    casestudy_list = views.CaseStudyListView.as_view()
+    casestudy_list_all = views.casestudy_list_all
+    casestudy_detail = views.CaseStudyDetailView.as_view()
+
 urlpatterns = [
-    path('', views.home, name='home'),
-    path('cv/', views.cv_download, name='cv_download'),
-    path('projects/', views.CaseStudyListView.as_view(), name='casestudy_list'),
-    path('projects/<slug:slug>/', views.CaseStudyDetailView.as_view(), name='casestudy_detail'),
+    path('', home, name='home'),
+    path('cv/', cv_download, name='cv_download'),
+    path('metrics', views.metrics, name='metrics'),
+    path('projects/', casestudy_list, name='casestudy_list'),
+    path('projects/all/', casestudy_list_all, name='casestudy_list_all'),
+    path('projects/search/', views.casestudy_search, name='casestudy_search'),
+    path('projects/<slug:slug>/', casestudy_detail, name='casestudy_detail'),
+    path('api/projects/', api.project_list, name='api_project_list'),
+    path('api/projects/<slug:slug>/', api.project_detail, name='api_project_detail'),
+    path('sitemap.xml', views.sitemap, name='sitemap'),
+    path('sitemap-<int:section>.xml', views.sitemap_section, name='sitemap_section'),
+    path('feed.xml', views.feed, name='feed'),
+    path('robots.txt', views.robots_txt, name='robots_txt'),
 ]
@@ -1,92 +1,180 @@
 """
-Portfolio views: home, case studies, contact, CV download.
+Portfolio views: home, case studies, search, contact, CV download, metrics,
+sitemap, feed and robots.txt.
 """
 from django.conf import settings
 from django.contrib import messages
-from django.core.mail import send_mail
-from django.http import FileResponse, Http404
+from django.http import Http404, HttpResponse, HttpResponseForbidden
 from django.shortcuts import render, redirect
+from django.urls import reverse
+from django.utils.crypto import constant_time_compare
+from django.utils.decorators import method_decorator
 from django.views.generic import ListView, DetailView
 
+from .cache import CSRF_PLACEHOLDER, cache_public_page
+from .conditional import (
+    cached_published_validators, case_study_validators, conditional_page, published_validators,
+)
+from .cv import serve_cv
 from .forms import ContactForm
-from .models import CaseStudy
+from .metrics import registry
+from .models import CASE_STUDY_CARD_FIELDS, CASE_STUDY_ORDERING, CaseStudy
+from .outbox import enqueue_mail
+from .pagination import InvalidCursor, KeysetPaginator
+from .search import search
+from .seo import (
+    SITEMAP_CONTENT_TYPE, atom_feed, cached_stream, site_url, sitemap_chunks,
+    sitemap_index_chunks, sitemap_sections,
+)
+from .slugs import resolve_slug, slug_redirect
+from .streaming import STREAM_CHUNK_SIZE, stream_template
+from .throttle import client_ip, throttle
 
 
+@throttle(('contact', client_ip))
+@conditional_page(published_validators)
+@cache_public_page
 def home(request):
     """Landing page: hero, skills, projects preview, experience, contact."""
-    case_studies = CaseStudy.objects.filter(is_published=True)[:6]
+    # Cards only; lazy, so a cached projects fragment skips the query
+    case_studies = CaseStudy.objects.filter(is_published=True).only(*CASE_STUDY_CARD_FIELDS)[:6]
     form = ContactForm(request.POST or None)
     if request.method == 'POST' and form.is_valid():
         name = form.cleaned_data['name']
         email = form.cleaned_data['email']
         message = form.cleaned_data['message']
         body = f"From: {name} <{email}>\n\n{message}"
-        try:
-            send_mail(
-                subject=f'[bbotir.xyz] Contact from {name}',
-                message=body,
-                from_email=settings.DEFAULT_FROM_EMAIL,
-                recipient_list=[settings.CONTACT_EMAIL],
-                fail_silently=False,
-            )
-            messages.success(request, 'Message sent. I\'ll get back to you soon.')
-            return redirect('portfolio:home')
-        except TimeoutError:
-            if settings.DEBUG:
-                print('Email error: SMTP connection timed out (check network/firewall or use console backend for local dev).')
-            messages.error(
-                request,
-                'The mail server did not respond in time. Please try again later or email directly at hello@bbotir.xyz',
-            )
-        except OSError as e:
-            if settings.DEBUG:
-                print(f'Email error: {e}')
-            messages.error(
-                request,
-                'Sorry, the message could not be sent. Please try emailing directly at hello@bbotir.xyz',
-            )
-        except Exception as e:
-            if settings.DEBUG:
-                import traceback
-                print(f'Email error: {e}')
-                traceback.print_exc()
-            messages.error(
-                request,
-                'Sorry, the message could not be sent. Please try emailing directly at hello@bbotir.xyz',
-            )
+        enqueue_mail(
+            subject=f'[bbotir.xyz] Contact from {name}',
+            message=body,
+            from_email=settings.DEFAULT_FROM_EMAIL,
+            recipient_list=[settings.CONTACT_EMAIL],
+            reply_to=email,
+        )
+        messages.success(request, 'Message sent. I\'ll get back to you soon.')
+        return redirect('portfolio:home')
     context = {
         'case_studies': case_studies,
         'contact_form': form,
+        'csrf_token': CSRF_PLACEHOLDER,
     }
     return render(request, 'portfolio/home.html', context)
 
 
+@method_decorator(conditional_page(published_validators), name='dispatch')
+@method_decorator(cache_public_page(query=('cursor',)), name='dispatch')
 class CaseStudyListView(ListView):
-    """List all published case studies."""
+    """List published case studies, keyset-paginated (?cursor=)."""
     model = CaseStudy
     context_object_name = 'case_studies'
     template_name = 'portfolio/casestudy_list.html'
-    queryset = CaseStudy.objects.filter(is_published=True)
+    # Cards only: no long text fields, images or tech tags
+    queryset = CaseStudy.objects.filter(is_published=True).only(*CASE_STUDY_CARD_FIELDS)
+    paginate_by = settings.CASE_STUDIES_PER_PAGE
+
+    def paginate_queryset(self, queryset, page_size):
+        paginator = KeysetPaginator(queryset, page_size, CASE_STUDY_ORDERING)
+        try:
+            page = paginator.page(self.request.GET.get('cursor'))
+        except InvalidCursor:
+            raise Http404('Invalid page')
+        return paginator, page, page.object_list, page.has_other_pages()
+
+
+@conditional_page(cached_published_validators)
+def casestudy_list_all(request):
+    """Every published case study on one page, streamed in chunks straight from the cursor."""
+    rows = (
+        CaseStudy.objects.filter(is_published=True)
+        .order_by(*CASE_STUDY_ORDERING)
+        .values('slug', 'title', 'summary')
+        .iterator(chunk_size=STREAM_CHUNK_SIZE)
+    )
+    return stream_template(
+        request, 'portfolio/casestudy_list.html', {}, rows, 'portfolio/includes/casestudy_cards.html', 'case_studies',
+    )
 
 
+@method_decorator(conditional_page(case_study_validators), name='dispatch')
+@method_decorator(cache_public_page, name='dispatch')
 class CaseStudyDetailView(DetailView):
-    """Single case study detail page."""
+    """Single case study detail page, read by pk; retired slugs redirect."""
     model = CaseStudy
     context_object_name = 'case_study'
     template_name = 'portfolio/casestudy_detail.html'
     slug_url_kwarg = 'slug'
-    queryset = CaseStudy.objects.filter(is_published=True)
+    queryset = CaseStudy.objects.published()
 
+    def get(self, request, *args, **kwargs):
+        found = resolve_slug(kwargs['slug'])
+        if found is None:
+            raise Http404('No case study found matching the query')
+        pk, slug = found
+        if slug != kwargs['slug']:
+            return slug_redirect(request, 'portfolio:casestudy_detail', slug)
+        # With a pk, DetailView.get_object() filters on it alone
+        self.kwargs['pk'] = pk
+        return super().get(request, *args, **kwargs)
 
-def cv_download(request):
-    """Serve CV PDF for download."""
-    from pathlib import Path
-    cv_path = Path(settings.BASE_DIR) / 'static' / 'cv' / 'Botir_Bakhtiyarov_CV.pdf'
-    if not cv_path.exists():
-        raise Http404('CV not found. Add your PDF to static/cv/Botir_Bakhtiyarov_CV.pdf')
-    return FileResponse(
-        open(cv_path, 'rb'),
-        as_attachment=True,
-        filename='Botir_Bakhtiyarov_CV.pdf',
-        content_type='application/pdf',
+
+def casestudy_search(request):
+    """
+    Full-text search over published case studies (?q=).
+
+    Not page-cached: every distinct query would add a cache entry that is
+    rarely read again, and flooding with random queries would push out the
+    cached pages that matter.
+    """
+    query = request.GET.get('q', '').strip()[:200]
+    context = {
+        'query': query,
+        'case_studies': search(query) if query else [],
+    }
+    return render(request, 'portfolio/casestudy_search.html', context)
+
+
+def metrics(request):
+    """Prometheus metrics for this worker (staff session or METRICS_TOKEN bearer)."""
+    token = settings.METRICS_TOKEN
+    authorized = bool(token) and constant_time_compare(
+        request.headers.get('Authorization', ''), f'Bearer {token}'
     )
+    # With 2FA on, a password-only staff session isn't enough (as in the admin)
+    staff = request.user.is_staff and (not settings.ADMIN_2FA_ENABLED or request.user.is_verified())
+    if not authorized and not staff:
+        return HttpResponseForbidden()
+    return HttpResponse(registry.prometheus(), content_type='text/plain; version=0.0.4')
+
+
+def cv_download(request):
+    """Serve CV PDF for download (byte ranges, 304 revalidation, optional proxy offload)."""
+    return serve_cv(request)
+
+
+@conditional_page(cached_published_validators)
+def sitemap(request):
+    """sitemap.xml: every public URL, or a sitemap index past SITEMAP_MAX_URLS."""
+    sections = sitemap_sections()
+    if sections > 1:
+        return cached_stream('sitemap-index', lambda: sitemap_index_chunks(sections), SITEMAP_CONTENT_TYPE)
+    return cached_stream('sitemap-1', sitemap_chunks, SITEMAP_CONTENT_TYPE)
+
+
+@conditional_page(cached_published_validators)
+def sitemap_section(request, section):
+    """One file of a split sitemap (listed by the sitemap index)."""
+    if not 1 <= section <= sitemap_sections():
+        raise Http404('No such sitemap section')
+    return cached_stream(f'sitemap-{section}', lambda: sitemap_chunks(section), SITEMAP_CONTENT_TYPE)
+
+
+@conditional_page(cached_published_validators)
+@cache_public_page
+def feed(request):
+    """Atom feed of recently updated case studies."""
+    return HttpResponse(atom_feed(), content_type='application/atom+xml; charset=utf-8')
+
+
+def robots_txt(request):
+    lines = ['User-agent: *', 'Disallow: /admin/', f'Sitemap: {site_url(reverse("portfolio:sitemap"))}']
+    return HttpResponse('\n'.join(lines) + '\n', content_type='text/plain; charset=utf-8')
@@ -0,0 +1,17 @@
+"""
+ASGI config for portfolio project.
+"""
+import os
+
+from django.core.asgi import get_asgi_application
+from django.urls import get_resolver
+
+os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'portfolio_project.settings')
+# Serve the public pages with their async views under ASGI
+os.environ.setdefault('ASYNC_VIEWS', 'True')
+
+application = get_asgi_application()
+
+# Load the URLconf (views, admin) now: gunicorn's preloaded master does it
+# once instead of every worker on its first request
+get_resolver().url_patterns
@@ -2,6 +2,9 @@
 Context processors for global template context (e.g. SEO / site info).
 """
 from django.conf import settings
+from django.utils.functional import SimpleLazyObject
+
+from portfolio.cache import get_content_version
 
 
 def site_meta(request):
@@ -9,4 +12,8 @@ def site_meta(request):
         'site_name': getattr(settings, 'SITE_NAME', 'Botir Bakhtiyarov'),
         'site_domain': getattr(settings, 'SITE_DOMAIN', 'bbotir.xyz'),
         'site_description': getattr(settings, 'SITE_DESCRIPTION', 'Backend Engineer | Django • APIs • AI-Powered Systems'),
+        # Fragment cache key; read from the cache only if a template uses it
+        'content_version': SimpleLazyObject(get_content_version),
+        # Set by export_static: links must work without a server (no query strings)
+        'static_export': getattr(settings, 'STATIC_EXPORT', False),
     }
@@ -13,23 +13,33 @@ DEBUG = config('DEBUG', default=True, cast=bool)
 
 ALLOWED_HOSTS = config('ALLOWED_HOSTS', default='localhost,127.0.0.1,bbotir.xyz,www.bbotir.xyz').split(',')
 
+# Opt-in: admin sign-in asks for a TOTP code after the password (portfolio.admin_custom).
+# Staff without a device are shown a QR code at their next sign-in.
+ADMIN_2FA_ENABLED = config('ADMIN_2FA_ENABLED', default=False, cast=bool)
+
 INSTALLED_APPS = [
-    'django.contrib.admin',
+    # django.contrib.admin; the 2FA site is admin.site when ADMIN_2FA_ENABLED is on
+    'portfolio.apps.PortfolioAdminConfig',
     'django.contrib.auth',
     'django.contrib.contenttypes',
     'django.contrib.sessions',
     'django.contrib.messages',
     'django.contrib.staticfiles',
+    'django_otp',
+    'django_otp.plugins.otp_totp',
     'portfolio',
 ]
 
 MIDDLEWARE = [
+    'portfolio.metrics.PerformanceMiddleware',
     'django.middleware.security.SecurityMiddleware',
     'whitenoise.middleware.WhiteNoiseMiddleware',
+    'portfolio.assets.EarlyHintsMiddleware',
     'django.contrib.sessions.middleware.SessionMiddleware',
     'django.middleware.common.CommonMiddleware',
     'django.middleware.csrf.CsrfViewMiddleware',
     'django.contrib.auth.middleware.AuthenticationMiddleware',
+    'django_otp.middleware.OTPMiddleware',
     'django.contrib.messages.middleware.MessageMiddleware',
     'django.middleware.clickjacking.XFrameOptionsMiddleware',
 ]
@@ -40,8 +50,18 @@ TEMPLATES = [
     {
         'BACKEND': 'django.template.backends.django.DjangoTemplates',
         'DIRS': [],
-        'APP_DIRS': True,
+        # Explicit loaders instead of APP_DIRS so production always compiles
+        # each template once per worker (cached loader); DEBUG reloads them
         'OPTIONS': {
+            'loaders': [
+                'django.template.loaders.filesystem.Loader',
+                'django.template.loaders.app_directories.Loader',
+            ] if DEBUG else [
+                ('django.template.loaders.cached.Loader', [
+                    'django.template.loaders.filesystem.Loader',
+                    'django.template.loaders.app_directories.Loader',
+                ]),
+            ],
             'context_processors': [
                 'django.template.context_processors.debug',
                 'django.template.context_processors.request',
@@ -54,9 +74,14 @@ TEMPLATES = [
 ]
 
 WSGI_APPLICATION = 'portfolio_project.wsgi.application'
+ASGI_APPLICATION = 'portfolio_project.asgi.application'
+# Route public pages to portfolio.async_views (set automatically by asgi.py)
+ASYNC_VIEWS = config('ASYNC_VIEWS', default=False, cast=bool)
 
 # Database configuration - choose via DATABASE_TYPE in .env
 DATABASE_TYPE = config('DATABASE_TYPE', default='sqlite').lower()
+# 'tuned' (persistent connections, pooling / WAL) or 'default' (Django defaults)
+DB_PROFILE = config('DB_PROFILE', default='tuned').lower()
 
 if DATABASE_TYPE == 'postgresql' or DATABASE_TYPE == 'postgres':
     DATABASES = {
@@ -72,13 +97,81 @@ if DATABASE_TYPE == 'postgresql' or DATABASE_TYPE == 'postgres':
             },
         }
     }
+    if DB_PROFILE == 'tuned':
+        if config('DB_POOL', default=False, cast=bool):
+            # Native psycopg 3 pool (Django 5.1+); incompatible with CONN_MAX_AGE
+            DATABASES['default']['OPTIONS']['pool'] = {
+                'min_size': config('DB_POOL_MIN_SIZE', default=2, cast=int),
+                'max_size': config('DB_POOL_MAX_SIZE', default=10, cast=int),
+                'timeout': 10,
+            }
+        else:
+            DATABASES['default']['CONN_MAX_AGE'] = config('DB_CONN_MAX_AGE', default=60, cast=int)
+            DATABASES['default']['CONN_HEALTH_CHECKS'] = True
 else:  # Default to SQLite
     DATABASES = {
         'default': {
             'ENGINE': 'django.db.backends.sqlite3',
-            'NAME': BASE_DIR / 'db.sqlite3',
+            'NAME': config('SQLITE_PATH', default=str(BASE_DIR / 'db.sqlite3')),
         }
     }
+    if DB_PROFILE == 'tuned':
+        DATABASES['default']['CONN_MAX_AGE'] = config('DB_CONN_MAX_AGE', default=60, cast=int)
+        DATABASES['default']['CONN_HEALTH_CHECKS'] = True
+        # Take the write lock up front instead of failing on lock upgrade
+        DATABASES['default']['OPTIONS'] = {'transaction_mode': 'IMMEDIATE'}
+
+# Applied to every new SQLite connection when DB_PROFILE=tuned (see portfolio/db.py)
+SQLITE_PRAGMAS = {
+    'journal_mode': 'WAL',
+    'synchronous': 'NORMAL',
+    'busy_timeout': config('SQLITE_BUSY_TIMEOUT', default=5000, cast=int),  # ms
+    'mmap_size': config('SQLITE_MMAP_SIZE', default=128 * 1024 * 1024, cast=int),  # bytes
+    'cache_size': -20000,  # KiB
+    'temp_store': 'MEMORY',
+}
+
+# Cache - file-based by default so all gunicorn workers share one store
+CACHE_LOCATION = config('CACHE_LOCATION', default=str(BASE_DIR / '.cache'))
+CACHES = {
+    'default': {
+        'BACKEND': config(
+            'CACHE_BACKEND',
+            default='django.core.cache.backends.filebased.FileBasedCache'
+        ),
+        'LOCATION': CACHE_LOCATION,
+    },
+    # The content version counter only. Kept apart from the page cache, which
+    # anyone can fill with distinct URLs, so culling never evicts (and resets) it.
+    'state': {
+        'BACKEND': config(
+            'STATE_CACHE_BACKEND',
+            default='django.core.cache.backends.filebased.FileBasedCache'
+        ),
+        'LOCATION': config('STATE_CACHE_LOCATION', default=str(Path(CACHE_LOCATION) / 'state')),
+        'TIMEOUT': None,
+        'OPTIONS': {'MAX_ENTRIES': 100000},
+    },
+    # Per-worker memory cache for {% cache %} template fragments. Fragment keys
+    # include the content version, so workers never serve stale fragments.
+    # Disabled under DEBUG so template edits show up immediately.
+    'fragments': {
+        'BACKEND': (
+            'django.core.cache.backends.dummy.DummyCache' if DEBUG
+            else 'django.core.cache.backends.locmem.LocMemCache'
+        ),
+        'LOCATION': 'portfolio-fragments',
+        'TIMEOUT': None,
+        'OPTIONS': {'MAX_ENTRIES': 1000},
+    },
+}
+
+# Full-page cache for home / projects (invalidated on CaseStudy changes)
+PAGE_CACHE_ENABLED = config('PAGE_CACHE_ENABLED', default=True, cast=bool)
+PAGE_CACHE_TIMEOUT = config('PAGE_CACHE_TIMEOUT', default=60 * 60 * 24, cast=int)  # seconds
+
+# /projects/ page size (keyset-paginated with ?cursor=)
+CASE_STUDIES_PER_PAGE = config('CASE_STUDIES_PER_PAGE', default=24, cast=int)
 
 AUTH_PASSWORD_VALIDATORS = [
     {'NAME': 'django.contrib.auth.password_validation.UserAttributeSimilarityValidator'},
@@ -93,11 +186,24 @@ USE_I18N = True
 USE_TZ = True
 
 STATIC_URL = 'static/'
-STATIC_ROOT = BASE_DIR / 'staticfiles'
-STATICFILES_STORAGE = 'whitenoise.storage.CompressedManifestStaticFilesStorage'
+STATIC_ROOT = config('STATIC_ROOT', default=str(BASE_DIR / 'staticfiles'))
+# STATICFILES_STORAGE is gone in Django 5.1; hashed, compressed static files
+# need the STORAGES form
+STORAGES = {
+    # Content-hashed names + .br/.gz siblings for uploads (portfolio/storage.py)
+    'default': {'BACKEND': 'portfolio.storage.HashedMediaStorage'},
+    # Hashed + compressed, plus minified bundles and critical CSS (portfolio/assets.py)
+    'staticfiles': {'BACKEND': 'portfolio.staticfiles.AssetPipelineStorage'},
+}
+
+# Inline per-page critical CSS and serve the minified bundles (ignored with DEBUG)
+ASSET_PIPELINE_ENABLED = config('ASSET_PIPELINE_ENABLED', default=True, cast=bool)
 
 MEDIA_URL = 'media/'
 MEDIA_ROOT = BASE_DIR / 'media'
+# Hashed media names are cached for a year as immutable; this applies to
+# files uploaded before hashing was enabled
+MEDIA_CACHE_MAX_AGE = config('MEDIA_CACHE_MAX_AGE', default=60 * 60, cast=int)  # seconds
 
 DEFAULT_AUTO_FIELD = 'django.db.models.BigAutoField'
 
@@ -119,6 +225,51 @@ DEFAULT_FROM_EMAIL = config(
     default='bbotir.xyz <botirbakhtiyarovb@gmail.com>'
 )
 
+# Outbox worker (manage.py send_outbox) retry policy
+OUTBOX_MAX_ATTEMPTS = config('OUTBOX_MAX_ATTEMPTS', default=5, cast=int)
+OUTBOX_BACKOFF_SECONDS = config('OUTBOX_BACKOFF_SECONDS', default=60, cast=int)
+OUTBOX_BACKOFF_MAX_SECONDS = config('OUTBOX_BACKOFF_MAX_SECONDS', default=60 * 60 * 6, cast=int)
+OUTBOX_CLAIM_SECONDS = config('OUTBOX_CLAIM_SECONDS', default=300, cast=int)  # a crashed worker's messages are retried after this
+
+# CV download (/cv/)
+CV_PATH = BASE_DIR / 'static' / 'cv' / 'Botir_Bakhtiyarov_CV.pdf'
+CV_CACHE_MAX_AGE = config('CV_CACHE_MAX_AGE', default=60 * 60, cast=int)  # seconds
+CV_STAT_TTL = config('CV_STAT_TTL', default=60, cast=int)  # seconds to trust the cached stat()
+# '' (serve from Django), 'x-accel' (nginx X-Accel-Redirect) or 'x-sendfile'
+CV_SENDFILE_MODE = config('CV_SENDFILE_MODE', default='')
+CV_ACCEL_REDIRECT_PREFIX = config('CV_ACCEL_REDIRECT_PREFIX', default='/protected/cv/')
+
+# Request metrics (/metrics and Admin → Performance metrics)
+METRICS_ENABLED = config('METRICS_ENABLED', default=True, cast=bool)
+METRICS_SAMPLE_RATE = config('METRICS_SAMPLE_RATE', default=1.0, cast=float)  # share of requests with DB/template timing
+METRICS_SLOW_REQUEST_MS = config('METRICS_SLOW_REQUEST_MS', default=500, cast=int)  # 0 disables
+METRICS_SLOW_QUERY_MS = config('METRICS_SLOW_QUERY_MS', default=100, cast=int)  # 0 disables
+METRICS_TOKEN = config('METRICS_TOKEN', default='')  # Bearer token for Prometheus scrapes
+
+# Token-bucket throttling of POSTs (portfolio.throttle). Rates are
+# 'burst/period' with period s, m, h or d; buckets refill evenly over it.
+THROTTLE_ENABLED = config('THROTTLE_ENABLED', default=True, cast=bool)
+THROTTLE_RATES = {
+    'contact': config('THROTTLE_CONTACT_RATE', default='5/h'),  # contact form, per IP
+    'login_ip': config('THROTTLE_LOGIN_IP_RATE', default='20/h'),  # admin login, per IP
+    'login_user': config('THROTTLE_LOGIN_USER_RATE', default='10/h'),  # admin login, per username
+    'otp_ip': config('THROTTLE_OTP_IP_RATE', default='20/h'),
+    'otp_user': config('THROTTLE_OTP_USER_RATE', default='10/h'),
+}
+# Set behind a reverse proxy that overwrites X-Forwarded-For
+THROTTLE_TRUST_X_FORWARDED_FOR = config('THROTTLE_TRUST_X_FORWARDED_FOR', default=False, cast=bool)
+
+LOGGING = {
+    'version': 1,
+    'disable_existing_loggers': False,
+    'handlers': {
+        'console': {'class': 'logging.StreamHandler'},
+    },
+    'loggers': {
+        'portfolio.performance': {'handlers': ['console'], 'level': 'WARNING'},
+    },
+}
+
 # SEO / Site
 SITE_NAME = 'Botir Bakhtiyarov'
 SITE_DOMAIN = 'bbotir.xyz'
@@ -2,17 +2,22 @@
 URL configuration for bbotir.xyz portfolio.
 """
 from django.conf import settings
-from django.conf.urls.static import static
 from django.contrib import admin
-from django.urls import path, include
+from django.urls import path, include, re_path
+
+from portfolio.media import serve_media
+from portfolio.throttle import client_ip, posted_username, throttle
+
+# Throttle password attempts before Django hashes anything
+admin_login = throttle(('login_ip', client_ip), ('login_user', posted_username))(admin.site.login)
 
 urlpatterns = [
+    path('admin/login/', admin_login),
     path('admin/', admin.site.urls),
+    # Uploads, with immutable caching for hashed names (a front proxy may serve /media/ itself)
+    re_path(r'^%s(?P<path>.+)$' % settings.MEDIA_URL.lstrip('/'), serve_media, name='media'),
     path('', include('portfolio.urls')),
 ]
 
-if settings.DEBUG:
-    urlpatterns += static(settings.MEDIA_URL, document_root=settings.MEDIA_ROOT)
-
 admin.site.site_header = 'bbotir.xyz Admin'
 admin.site.site_title = 'Portfolio Admin'
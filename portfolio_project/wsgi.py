@@ -4,7 +4,12 @@ WSGI config for portfolio project.
 import os
 
 from django.core.wsgi import get_wsgi_application
+from django.urls import get_resolver
 
 os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'portfolio_project.settings')
 
 application = get_wsgi_application()
+
+# Load the URLconf (views, admin) now: gunicorn's preloaded master does it
+# once instead of every worker on its first request
+get_resolver().url_patterns